@@ -0,0 +1,250 @@
+"""
+Benchmark the test scenarios.
+
+Runs each scenario several times against the chosen storefront, after warmup runs
+that are not measured, and appends the statistics of every scenario and helper step to
+a JSON history file. Two runs of the history can then be compared:
+
+    python -m tests.benchmark --local-store --iterations 10
+    python -m tests.benchmark --diff -2 -1
+"""
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from secrets import token_hex
+from typing import Dict, List, Optional, Tuple
+
+from tests.helpers.benchmark import (
+    STATISTICS,
+    append_history,
+    diff_runs,
+    find_run,
+    load_history,
+    read_iteration,
+    summarise_scenario,
+)
+
+TESTS_DIR = Path(__file__).parent
+
+SCENARIOS = {
+    "signup_and_checkout": TESTS_DIR / "test_user_signup_and_checkout.py",
+    "existing_user_checkout": TESTS_DIR / "test_existing_user_login_and_checkout.py",
+    "payment_method_checkout": TESTS_DIR / "test_checkout_from_payment_method.py",
+    "cart_functionality": TESTS_DIR / "test_cart_functionality.py",
+    "invalid_signup": TESTS_DIR / "test_invalid_signup.py",
+}
+
+HISTORY_FILE = Path("benchmarks") / "history.json"
+
+
+def run_iteration(
+    scenario: str, directory: Path, pytest_args: List[str]
+) -> Optional[Tuple[float, Dict[str, float]]]:
+    """
+    Run a scenario once in its own pytest process.
+
+    Args:
+        scenario (str): The scenario name.
+        directory (Path): The reports directory of the iteration.
+        pytest_args (List[str]): The extra pytest arguments, e.g. the storefront.
+
+    Returns:
+        Optional[Tuple[float, Dict[str, float]]]: The scenario and step durations,
+            None if the scenario failed.
+    """
+    command = [
+        sys.executable,
+        "-m",
+        "pytest",
+        str(SCENARIOS[scenario]),
+        "-q",
+        "-p",
+        "no:cacheprovider",
+        "--reports-dir",
+        str(directory),
+        "--alluredir",
+        str(directory / "allure-results"),
+        "--junitxml",
+        str(directory / "junit.xml"),
+        # Time the test calls only, the setup and teardown launch the browser and
+        # the storefront and provision the accounts
+        "-o",
+        "junit_duration_report=call",
+        *pytest_args,
+    ]
+    completed = subprocess.run(command, stdout=subprocess.DEVNULL)
+    if completed.returncode != 0:
+        return None
+    return read_iteration(directory)
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def benchmark(args: argparse.Namespace, pytest_args: List[str]) -> Dict:
+    run = {
+        "id": f"{datetime.now(timezone.utc):%Y%m%dT%H%M%SZ}-{token_hex(2)}",
+        "label": args.label,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "revision": git_revision(),
+        "target": args.base_url or ("local-store" if args.local_store else "default"),
+        "iterations": args.iterations,
+        "warmup": args.warmup,
+        "scenarios": {},
+    }
+
+    with tempfile.TemporaryDirectory(prefix="benchmark-") as reports_dir:
+        for scenario in args.scenario or list(SCENARIOS):
+            iterations = []
+            failures = 0
+            for iteration in range(args.warmup + args.iterations):
+                warmup = iteration < args.warmup
+                started = time.monotonic()
+                result = run_iteration(
+                    scenario, Path(reports_dir) / f"{scenario}-{iteration}", pytest_args
+                )
+                print(
+                    f"{scenario} {'warmup' if warmup else 'iteration'}"
+                    f" {iteration - (0 if warmup else args.warmup) + 1}:"
+                    f" {'failed' if result is None else 'passed'}"
+                    f" in {time.monotonic() - started:.1f}s"
+                )
+                if warmup:
+                    continue
+                if result is None:
+                    failures += 1
+                else:
+                    iterations.append(result)
+            run["scenarios"][scenario] = summarise_scenario(iterations, failures)
+    return run
+
+
+def print_run(run: Dict):
+    print(f"\nBenchmark {run['id']} ({run['target']}, revision {run['revision']})")
+    print(f"{'':48}" + "".join(f"{name:>10}" for name in STATISTICS))
+    for scenario, result in run["scenarios"].items():
+        rows = [(scenario, result["summary"])] + [
+            (f"  {step}", step_result["summary"])
+            for step, step_result in result["steps"].items()
+        ]
+        for name, summary in rows:
+            values = (
+                "".join(f"{summary[key]:>10.3f}" for key in STATISTICS)
+                if summary
+                else f"{'all iterations failed':>50}"
+            )
+            print(f"{name:48}{values}")
+        if result["failures"]:
+            print(f"  {result['failures']} failed iterations not measured")
+
+
+def print_diff(base: Dict, head: Dict, statistic: str):
+    print(f"\n{statistic} of {head['id']} against {base['id']}")
+    for name, before, after in diff_runs(base, head, statistic):
+        if before is None or after is None:
+            change = "only in " + (head["id"] if before is None else base["id"])
+        else:
+            change = f"{(after - before) / before:+.1%}" if before else "n/a"
+        before_text = "-" if before is None else f"{before:.3f}"
+        after_text = "-" if after is None else f"{after:.3f}"
+        print(f"{name:48}{before_text:>10}{after_text:>10}  {change}")
+
+
+def parse_args(argv: List[str]) -> Tuple[argparse.Namespace, List[str]]:
+    parser = argparse.ArgumentParser(
+        description=__doc__.split("\n\n")[0].strip(),
+        epilog="Arguments after -- are passed to pytest.",
+    )
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=tuple(SCENARIOS),
+        help="Scenario to benchmark, repeatable (default: every scenario).",
+    )
+    parser.add_argument(
+        "--iterations",
+        type=int,
+        default=5,
+        help="Measured runs of each scenario (default: 5).",
+    )
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=1,
+        help="Unmeasured runs of each scenario before the measured ones (default: 1).",
+    )
+    parser.add_argument("--base-url", help="Base URL of the storefront under test.")
+    parser.add_argument(
+        "--local-store",
+        action="store_true",
+        help="Benchmark against the bundled stand-in storefront.",
+    )
+    parser.add_argument("--label", help="Name of the run in the history.")
+    parser.add_argument(
+        "--history",
+        type=Path,
+        default=HISTORY_FILE,
+        help=f"JSON history file of the runs (default: {HISTORY_FILE}).",
+    )
+    parser.add_argument(
+        "--diff",
+        nargs=2,
+        metavar=("BASE", "HEAD"),
+        help="Compare two runs of the history by id, label or index, e.g. -2 -1.",
+    )
+    parser.add_argument(
+        "--statistic",
+        choices=STATISTICS,
+        default="mean",
+        help="Statistic compared by --diff (default: mean).",
+    )
+
+    if "--" in argv:
+        split = argv.index("--")
+        argv, pytest_args = argv[:split], argv[split + 1 :]
+    else:
+        pytest_args = []
+    return parser.parse_args(argv), pytest_args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args, pytest_args = parse_args(sys.argv[1:] if argv is None else argv)
+
+    if args.diff:
+        runs = load_history(args.history)
+        try:
+            base, head = (find_run(runs, reference) for reference in args.diff)
+        except KeyError as error:
+            print(error.args[0], file=sys.stderr)
+            return 2
+        print_diff(base, head, args.statistic)
+        return 0
+
+    if args.base_url:
+        pytest_args = ["--base-url", args.base_url, *pytest_args]
+    if args.local_store:
+        pytest_args = ["--local-store", *pytest_args]
+
+    run = benchmark(args, pytest_args)
+    append_history(args.history, run)
+    print_run(run)
+    print(f"\nAppended to {args.history}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,58 +1,348 @@
-import allure
+from functools import partial
+from pathlib import Path
+from typing import List, Optional
+from urllib.parse import urlsplit
+
 import pytest
+from allure_commons.types import AttachmentType
 from faker import Faker
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.support.wait import WebDriverWait
+from requests import RequestException
 from structlog import get_logger
-from webdriver_manager.chrome import ChromeDriverManager
+from structlog.contextvars import bind_contextvars, unbind_contextvars
 
+from tests.helpers.accounts import AccountPool, pool_directory
+from tests.helpers.artifacts import Artifact, ArtifactWriter, capture_artifacts
+from tests.helpers.browser import (
+    RESOURCE_TYPE_PATTERNS,
+    THIRD_PARTY_PATTERNS,
+    BrowserPool,
+    BrowserProfile,
+    apply_profile,
+    launch_chrome,
+)
+from tests.helpers.budgets import (
+    Budget,
+    BudgetExceeded,
+    BudgetResult,
+    evaluate_budgets,
+    load_budgets,
+    report_budgets,
+)
+from tests.helpers.commands import command_listener
+from tests.helpers.conditions import ObserverWait
+from tests.helpers.config import get_base_url, set_base_url, url_for
+from tests.helpers.driver_resolver import resolve_chromedriver
+from tests.helpers.http_client import AUTH_COOKIES, StorefrontClient
+from tests.helpers.logs import LEVELS, LogSink, configure_logging, render_line
+from tests.helpers.network import (
+    STEP_TIMINGS,
+    NetworkUsage,
+    network_monitor,
+    summarise_step_timings,
+)
+from tests.helpers.page_metrics import (
+    PAGE_VISITS,
+    PageVisit,
+    page_metrics,
+    summarise_page_visits,
+    write_page_visits,
+)
+from tests.helpers.parallel import (
+    DURATIONS_CACHE_KEY,
+    DurationRecorder,
+    is_xdist_worker,
+    namespaced_email,
+    new_namespace,
+    order_by_duration,
+    worker_id,
+)
+from tests.helpers.profiler import (
+    CommandCountExceeded,
+    CommandProfiler,
+    load_baseline,
+    regression,
+    update_baseline,
+)
+from tests.helpers.regression import RegressionGate
+from tests.helpers.tracing import TRACER, step_durations, summarise_spans
 from tests.helpers.utils import register_user
+from tests.storefront.server import StorefrontServer
 
 LOGGER = get_logger(module=__name__)
 
+BROWSER_POOL_KEY = pytest.StashKey[BrowserPool]()
+ACCOUNT_POOL_KEY = pytest.StashKey[AccountPool]()
+BROWSER_PROFILE_KEY = pytest.StashKey[BrowserProfile]()
+NETWORK_USAGE_KEY = pytest.StashKey[NetworkUsage]()
+ARTIFACT_WRITER_KEY = pytest.StashKey[ArtifactWriter]()
+LOG_SINK_KEY = pytest.StashKey[LogSink]()
+PROFILER_KEY = pytest.StashKey[CommandProfiler]()
+BUDGETS_KEY = pytest.StashKey[List[Budget]]()
+BUDGET_RESULTS_KEY = pytest.StashKey[List[BudgetResult]]()
+BUDGETS_FILE = Path(__file__).parent / "budgets.json"
+LOCAL_STORE_ACCOUNTS = "local-store-accounts.jsonl"
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("storefront")
+    group.addoption(
+        "--base-url",
+        default=None,
+        help="Base URL of the storefront under test (default: the nopCommerce demo).",
+    )
+    group.addoption(
+        "--local-store",
+        action="store_true",
+        default=False,
+        help="Run against the bundled stand-in storefront instead of a remote one.",
+    )
+
+    group = parser.getgroup("reporting")
+    group.addoption(
+        "--reports-dir",
+        default="reports",
+        help="Directory of the suite's logs and reports (default: reports).",
+    )
+    group.addoption(
+        "--console-log-level",
+        default="warning",
+        choices=tuple(LEVELS),
+        help=(
+            "Minimum level of the log events also printed to the console, every"
+            " event is written to the worker's log file (default: warning)."
+        ),
+    )
+
+    group.addoption(
+        "--budgets",
+        default=str(BUDGETS_FILE),
+        help=(
+            "JSON file of the performance budgets checked by the tests marked"
+            " 'budgets' (default: tests/budgets.json)."
+        ),
+    )
+
+    group = parser.getgroup("profiling")
+    group.addoption(
+        "--profile-commands",
+        action="store_true",
+        default=False,
+        help=(
+            "Record every WebDriver command per test, written with flame graph stacks"
+            " to <reports-dir>/profiles."
+        ),
+    )
+    group.addoption(
+        "--command-baseline",
+        default=None,
+        help=(
+            "JSON file of the command count of each test, a test sending more"
+            " commands than its baseline fails (implies --profile-commands)."
+        ),
+    )
+    group.addoption(
+        "--command-tolerance",
+        type=float,
+        default=0.1,
+        help="Fraction of extra commands allowed over the baseline (default: 0.1).",
+    )
+    group.addoption(
+        "--update-command-baseline",
+        action="store_true",
+        default=False,
+        help="Store the command counts of this run as the new baseline.",
+    )
+
+    group.addoption(
+        "--duration-baseline",
+        default=None,
+        help=(
+            "JSON file of the duration samples of each test and step, the run fails"
+            " when a cart or checkout test or step is slower beyond the tolerance."
+        ),
+    )
+    group.addoption(
+        "--duration-tolerance",
+        type=float,
+        default=0.2,
+        help=(
+            "Slowdown allowed over the baseline median, the lower bound of its 95%%"
+            " confidence interval is compared (default: 0.2)."
+        ),
+    )
+    group.addoption(
+        "--update-duration-baseline",
+        action="store_true",
+        default=False,
+        help="Add the durations of this run to the baseline samples.",
+    )
+
+    group = parser.getgroup("browser")
+    group.addoption(
+        "--page-load-strategy",
+        default="eager",
+        choices=("normal", "eager", "none"),
+        help="Page load strategy of the test browser (default: eager).",
+    )
+    group.addoption(
+        "--block-resource-types",
+        default="image,font,media",
+        help=(
+            "Comma separated resource types the browser does not load, among"
+            f" {', '.join(RESOURCE_TYPE_PATTERNS)} (default: image,font,media)."
+        ),
+    )
+    group.addoption(
+        "--block-url",
+        action="append",
+        default=[],
+        help="URL pattern the browser does not load, e.g. '*.example.com/*'.",
+    )
+    group.addoption(
+        "--no-request-blocking",
+        action="store_true",
+        default=False,
+        help="Load every resource, third-party scripts included.",
+    )
+
+
+def pytest_configure(config):
+    # Every log call only queues its event, the JSON lines are written in the background
+    config.stash[LOG_SINK_KEY] = configure_logging(
+        Path(config.getoption("reports_dir")) / "logs" / f"{worker_id()}.jsonl",
+        console_level=LEVELS[config.getoption("console_log_level")],
+    )
+
+    if config.getoption("base_url"):
+        set_base_url(config.getoption("base_url"))
+
+    config.addinivalue_line(
+        "markers", "budgets: check the performance budgets of the pages and steps"
+    )
+    try:
+        config.stash[BUDGETS_KEY] = load_budgets(Path(config.getoption("budgets")))
+    except (OSError, ValueError) as error:
+        raise pytest.UsageError(f"Invalid performance budgets: {error}")
+    config.stash[BUDGET_RESULTS_KEY] = []
+
+    config.pluginmanager.register(DurationRecorder(config), "duration-recorder")
+    if config.getoption("duration_baseline"):
+        config.pluginmanager.register(
+            RegressionGate(
+                config,
+                Path(config.getoption("duration_baseline")),
+                config.getoption("duration_tolerance"),
+                config.getoption("update_duration_baseline"),
+            ),
+            "regression-gate",
+        )
+
+    if config.getoption("profile_commands") or config.getoption("command_baseline"):
+        config.stash[PROFILER_KEY] = CommandProfiler()
+
+    blocking = not config.getoption("no_request_blocking")
+    resource_types = config.getoption("block_resource_types").split(",")
+    unknown = {t.strip() for t in resource_types if t.strip()} - set(
+        RESOURCE_TYPE_PATTERNS
+    )
+    if unknown:
+        raise pytest.UsageError(
+            f"Unknown resource types to block: {', '.join(unknown)}"
+        )
+    config.stash[BROWSER_PROFILE_KEY] = BrowserProfile(
+        page_load_strategy=config.getoption("page_load_strategy"),
+        blocked_resource_types=tuple(
+            resource_type.strip()
+            for resource_type in resource_types
+            if blocking and resource_type.strip()
+        ),
+        blocked_urls=(
+            THIRD_PARTY_PATTERNS + tuple(config.getoption("block_url"))
+            if blocking
+            else ()
+        ),
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    # xdist hands tests out in collection order, so schedule the longest ones first
+    if is_xdist_worker(config) and getattr(config, "cache", None):
+        order_by_duration(items, config.cache.get(DURATIONS_CACHE_KEY, {}))
+
+
+@pytest.fixture(scope="session")
+def storefront(request):
+    """
+    Start the local stand-in storefront when running with --local-store
+    :param request: pytest FixtureRequest
+    :return: Base URL of the storefront under test
+    """
+    if not request.config.getoption("local_store"):
+        yield get_base_url()
+        return
+
+    # Accounts outlive the server so that the account pool can reuse them next run
+    server = StorefrontServer(
+        accounts_file=pool_directory(request.config) / LOCAL_STORE_ACCOUNTS
+    ).start()
+    set_base_url(server.base_url)
+
+    yield server.base_url
+
+    server.stop()
+
+
+@pytest.fixture(scope="session")
+def browser_pool(request):
+    """
+    Initialise the session-wide pool of warm browsers
+    :param request: pytest FixtureRequest
+    :return: BrowserPool instance
+    """
+    LOGGER.info("Initialising the browser pool")
+    pool = BrowserPool(
+        launcher=partial(launch_chrome, request.config.stash[BROWSER_PROFILE_KEY])
+    )
+    request.config.stash[BROWSER_POOL_KEY] = pool
+
+    yield pool
+
+    pool.close()
+
 
 @pytest.fixture(scope="module", name="driver")
-def webdriver_init():
-    LOGGER.info("Initialising WebDriver")
-    # Configure ChromeOptions
-    options = webdriver.ChromeOptions()
-    options.add_argument("--no-sandbox")
-    options.add_argument("--ignore-certificate-errors")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("--disable-autofill")
-    options.add_argument("--disable-extensions")
-    options.add_argument("--disable-popup-blocking")
-    options.add_argument("--allow-running-insecure-content")
-    options.add_argument("--headless")
-    options.add_argument("--start-maximized")
-
-    # Initialise the Service object for handling the browser driver
-    service = Service(ChromeDriverManager().install())
-
-    # Create a new instance of the driver
-    driver = webdriver.Chrome(service=service, options=options)
-    LOGGER.info("Chrome WebDriver initialised!")
-
-    LOGGER.info("Navigating to the homepage - https://demo.nopcommerce.com/")
-    driver.get("https://demo.nopcommerce.com/")
+def webdriver_init(request, storefront, browser_pool):
+    LOGGER.info("Acquiring a WebDriver from the browser pool")
+    driver = browser_pool.acquire()
+    apply_profile(driver, request.config.stash[BROWSER_PROFILE_KEY])
+    # Measures the pages loaded from now on
+    page_metrics(driver)
+
+    profiler = request.config.stash.get(PROFILER_KEY, None)
+    if profiler is not None:
+        command_listener(driver).observers.append(profiler.record)
+
+    LOGGER.info("Navigating to the homepage", url=url_for())
+    driver.get(url_for())
     LOGGER.info("Successfully navigated to the homepage!")
 
     yield driver
 
-    LOGGER.info("Quitting Chrome WebDriver")
-    driver.quit()
+    LOGGER.info("Returning WebDriver to the browser pool")
+    browser_pool.release(driver)
+    if profiler is not None:
+        command_listener(driver).observers.remove(profiler.record)
 
 
 @pytest.fixture(scope="module", name="wait")
 def webdriver_wait(driver):
     """
-    Initialise WebDriverWait
+    Initialise WebDriverWait, resolving the expected conditions inside the page
     :param driver: WebDriver instance
-    :return: WebDriverWait instance
+    :return: ObserverWait instance
     """
     LOGGER.info("Initialising WebDriverWait")
-    wait = WebDriverWait(driver, 5)
+    wait = ObserverWait(driver, 5)
     LOGGER.info("WebDriverWait initialised")
     return wait
 
@@ -62,38 +352,450 @@ def fake():
     return Faker()
 
 
+@pytest.fixture(scope="session")
+def namespace():
+    """
+    Data namespace isolating the data created by this worker from other workers
+    :return: Namespace string
+    """
+    namespace = new_namespace()
+    LOGGER.info("Using data namespace", namespace=namespace, worker=worker_id())
+    return namespace
+
+
+@pytest.fixture(autouse=True)
+def network_usage(request):
+    """
+    Report the requests made, bytes loaded and requests blocked by each test
+    :param request: pytest FixtureRequest
+    """
+    if "driver" not in request.fixturenames:
+        yield
+        return
+
+    monitor = network_monitor(request.getfixturevalue("driver"))
+    before = monitor.usage()
+
+    yield
+
+    usage = monitor.usage() - before
+    LOGGER.info(
+        "Network usage",
+        requests=usage.requests,
+        bytes_loaded=usage.bytes_loaded,
+        requests_blocked=usage.blocked,
+    )
+    request.node.user_properties.append(("requests", usage.requests))
+    request.node.user_properties.append(("bytes_loaded", usage.bytes_loaded))
+    request.node.user_properties.append(("requests_blocked", usage.blocked))
+
+    total = request.config.stash.get(NETWORK_USAGE_KEY, NetworkUsage(0, 0, 0))
+    request.config.stash[NETWORK_USAGE_KEY] = NetworkUsage(
+        requests=total.requests + usage.requests,
+        bytes_loaded=total.bytes_loaded + usage.bytes_loaded,
+        blocked=total.blocked + usage.blocked,
+    )
+
+
+def artifact_writer(config) -> Optional[ArtifactWriter]:
+    """
+    Get the writer of the failure artifacts, None when Allure results are not saved
+    :param config: pytest Config
+    :return: ArtifactWriter instance
+    """
+    if config.pluginmanager.get_plugin("allure_listener") is None:
+        return None
+    if ARTIFACT_WRITER_KEY not in config.stash:
+        config.stash[ARTIFACT_WRITER_KEY] = ArtifactWriter(
+            Path(config.option.allure_report_dir).absolute()
+        )
+    return config.stash[ARTIFACT_WRITER_KEY]
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    # Tag the events of the test and keep them for its failure report
+    sink = item.config.stash[LOG_SINK_KEY]
+    bind_contextvars(test=item.nodeid)
+    sink.start_slice()
+    profiler = item.config.stash.get(PROFILER_KEY, None)
+    if profiler is not None:
+        profiler.start(item.nodeid)
+
+    yield
+
+    if profiler is not None:
+        profiler.stop()
+    sink.end_slice()
+    unbind_contextvars("test")
+
+
+def check_command_count(item) -> Optional[CommandCountExceeded]:
+    """
+    Summarise the commands sent by a test and compare their number with the baseline
+    :param item: pytest Item
+    :return: The failure of a command count regressed past the baseline, None if
+        there is none
+    """
+    profiler = item.config.stash.get(PROFILER_KEY, None)
+    if profiler is None or profiler.current is None:
+        return None
+
+    profile = profiler.current
+    LOGGER.info(
+        "Command profile",
+        commands=profile.commands,
+        counted_commands=profile.counted_commands,
+        wait_time=round(profile.wait_time, 3),
+        action_time=round(profile.action_time, 3),
+    )
+    # Added before the teardown report is made, which copies the item properties
+    item.user_properties.append(("webdriver_commands", profile.commands))
+
+    baseline_path = item.config.getoption("command_baseline")
+    if not baseline_path or item.config.getoption("update_command_baseline"):
+        return None
+    message = regression(
+        profile,
+        load_baseline(Path(baseline_path)),
+        item.config.getoption("command_tolerance"),
+    )
+    return CommandCountExceeded(message) if message else None
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_teardown(item):
+    __tracebackhide__ = True
+    profiler = item.config.stash.get(PROFILER_KEY, None)
+    if profiler is not None:
+        profiler.phase = "teardown"
+    try:
+        result = yield
+    finally:
+        # Counted once the fixtures are torn down, with the commands they sent
+        failure = check_command_count(item)
+
+    # Failing the teardown itself, rather than its report, lets every reporter see
+    # the failure, Allure included
+    if failure is not None:
+        raise failure
+    return result
+
+
+def check_budgets(item, visits: List[PageVisit]) -> Optional[BudgetExceeded]:
+    """
+    Check the performance budgets against the pages and checkout steps of a test,
+    reporting every budget to Allure
+    :param item: pytest Item
+    :param visits: Page visits of the test
+    :return: The failure of the exceeded hard budgets, None if there are none
+    """
+    budgets = item.config.stash[BUDGETS_KEY]
+    results = evaluate_budgets(
+        budgets,
+        visits,
+        [timing for timing in STEP_TIMINGS if timing.test == item.nodeid],
+    )
+    item.config.stash[BUDGET_RESULTS_KEY].extend(results)
+
+    # A budget of a page or step the test never reaches is never enforced
+    measured = {result.budget for result in results}
+    for budget in budgets:
+        if budget not in measured:
+            LOGGER.warning("Performance budget not measured", budget=str(budget))
+    if not results:
+        return None
+    report_budgets(results)
+
+    exceeded = [result for result in results if result.exceeded]
+    for result in exceeded:
+        LOGGER.warning(
+            "Performance budget exceeded",
+            budget=str(result.budget),
+            severity=result.budget.severity,
+            value=round(result.value),
+            samples=len(result.samples),
+        )
+
+    hard = [result for result in exceeded if result.budget.severity == "hard"]
+    if not hard:
+        return None
+    return BudgetExceeded(
+        "Performance budgets exceeded:\n"
+        + "\n".join(result.describe() for result in hard)
+    )
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    __tracebackhide__ = True
+    profiler = item.config.stash.get(PROFILER_KEY, None)
+    if profiler is not None:
+        profiler.phase = "call"
+    try:
+        result = yield
+    finally:
+        failure = None
+        if "driver" in item.funcargs:
+            visits = page_metrics(item.funcargs["driver"]).drain(item.nodeid)
+            if item.get_closest_marker("budgets"):
+                failure = check_budgets(item, visits)
+
+    # Failing the call itself, rather than its report, lets every reporter see the
+    # failure, Allure included
+    if failure is not None:
+        raise failure
+    return result
+
+
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     outcome = yield
     rep = outcome.get_result()
+    if rep.when == "teardown" and item.config.pluginmanager.has_plugin(
+        "regression-gate"
+    ):
+        rep.user_properties.append(
+            ("step_durations", step_durations(TRACER.spans, item.nodeid))
+        )
 
-    # Check if the test has the "driver" fixture
-    if "driver" in item.fixturenames:
-        # Get the "driver" fixture
-        driver_fixture = item.funcargs["driver"]
-
-        if rep.when == "call" and not rep.passed:
-            # Attach screenshot to the Allure report
-            screenshot_name = f"{item.name}_failure.png"
-            allure.attach(
-                driver_fixture.get_screenshot_as_png(),
-                name=screenshot_name,
-                attachment_type=allure.attachment_type.PNG,
-            )
+    writer = artifact_writer(item.config)
+    if writer is None:
+        return
+    if rep.failed:
+        capture_failure(item, rep, writer)
+    # Referenced once the test ends, the artifacts are written while it tears down
+    if rep.when == "teardown":
+        reporter = item.config.pluginmanager.get_plugin("allure_listener").allure_logger
+        writer.attach(reporter, item.nodeid)
+
+
+def capture_failure(item, rep, writer: ArtifactWriter):
+    """
+    Capture the log lines of a failed test and, if the driver was created, the state
+    of its page, and queue them for writing
+    :param item: pytest Item
+    :param rep: pytest TestReport of the failed phase
+    :param writer: ArtifactWriter instance
+    """
+
+    # The log lines of the test are only rendered when it fails
+    name = f"{item.name}_{rep.when}_failure"
+    artifacts = [
+        Artifact(
+            f"{name}_log",
+            "\n".join(
+                render_line(event)
+                for event in item.config.stash[LOG_SINK_KEY].current_slice()
+            ).encode(),
+            AttachmentType.TEXT,
+        )
+    ]
+
+    # Setup and teardown failures are captured too, if the driver was created
+    driver = (item.funcargs or {}).get("driver")
+    if driver is not None:
+        artifacts += capture_artifacts(driver, name)
+
+    # Only the capture blocks the test, the artifacts are written in the background
+    for artifact in artifacts:
+        writer.queue(item.nodeid, artifact)
+
+
+def pytest_sessionfinish(session):
+    profiler = session.config.stash.get(PROFILER_KEY, None)
+    if profiler is not None:
+        profiler.write(
+            Path(session.config.getoption("reports_dir")) / "profiles", worker_id()
+        )
+        baseline_path = session.config.getoption("command_baseline")
+        if baseline_path and session.config.getoption("update_command_baseline"):
+            update_baseline(Path(baseline_path), list(profiler.profiles.values()))
+
+    write_page_visits(
+        Path(session.config.getoption("reports_dir"))
+        / "metrics"
+        / f"{worker_id()}.jsonl",
+        PAGE_VISITS,
+    )
+    TRACER.write(
+        Path(session.config.getoption("reports_dir"))
+        / "traces"
+        / f"{worker_id()}.json",
+        worker_id(),
+    )
+
+    writer = session.config.stash.get(ARTIFACT_WRITER_KEY, None)
+    if writer is not None:
+        writer.close()
+
+
+def pytest_unconfigure(config):
+    sink = config.stash.get(LOG_SINK_KEY, None)
+    if sink is not None:
+        sink.close()
+
+
+@pytest.fixture(scope="session")
+def http_client(storefront):
+    """
+    Initialise the HTTP client used to set up data without a browser
+    :param storefront: Base URL of the storefront under test
+    :return: StorefrontClient instance
+    """
+    client = StorefrontClient()
+
+    yield client
+
+    client.close()
+    AUTH_COOKIES.client.close()
+
+
+@pytest.fixture(scope="session")
+def account_pool(request, storefront, http_client, namespace):
+    """
+    Initialise the pool of pre-registered accounts shared by all workers and runs
+    :param request: pytest FixtureRequest
+    :param storefront: Base URL of the storefront under test
+    :param http_client: StorefrontClient instance
+    :param namespace: Data namespace of this worker
+    :return: AccountPool instance
+    """
+    key = "local-store" if request.config.getoption("local_store") else storefront
+    pool = AccountPool(
+        directory=pool_directory(request.config),
+        storefront=urlsplit(key).netloc or key,
+        namespace=namespace,
+        client=http_client,
+    )
+    request.config.stash[ACCOUNT_POOL_KEY] = pool
+
+    yield pool
+
+    pool.close()
 
 
 @pytest.fixture()
-def auth(driver, wait, fake):
-    # Register user for use in tests
-    email, password = fake.email(), fake.password()
-    register_user(
-        driver=driver,
-        wait=wait,
-        first_name=fake.first_name(),
-        last_name=fake.last_name(),
-        email=email,
-        password=password,
-        confirm_password=password,
-        date_of_birth=fake.date_of_birth(),
-    )
-    return email, password
+def auth(request, account_pool, fake, namespace):
+    # Lease an existing user for use in tests, the UI flow is only exercised by signup tests
+    try:
+        account = account_pool.lease()
+    except RequestException as error:
+        LOGGER.warning(
+            "Account pool unavailable, registering through the UI", error=error
+        )
+        email, password = namespaced_email(fake, namespace), fake.password()
+        register_user(
+            driver=request.getfixturevalue("driver"),
+            wait=request.getfixturevalue("wait"),
+            first_name=fake.first_name(),
+            last_name=fake.last_name(),
+            email=email,
+            password=password,
+            confirm_password=password,
+            date_of_birth=fake.date_of_birth(),
+        )
+        yield email, password
+        return
+
+    yield account.email, account.password
+
+    account_pool.release(account)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if AUTH_COOKIES.logins:
+        terminalreporter.write_sep("-", "session cookies")
+        terminalreporter.write_line(
+            f"{AUTH_COOKIES.logins} HTTP logins, {AUTH_COOKIES.hits} UI logins"
+            " skipped with a cached cookie"
+        )
+
+    usage = config.stash.get(NETWORK_USAGE_KEY, None)
+    if usage is not None:
+        terminalreporter.write_sep("-", "network")
+        terminalreporter.write_line(
+            f"{usage.requests} requests, {usage.bytes_loaded} bytes loaded,"
+            f" {usage.blocked} requests blocked"
+        )
+
+    if STEP_TIMINGS:
+        terminalreporter.write_sep("-", "checkout steps")
+        for name, step in summarise_step_timings(STEP_TIMINGS).items():
+            terminalreporter.write_line(
+                f"{name}: {step['runs']} runs, mean server time"
+                f" {step['server_time']:.3f}s, mean step time {step['duration']:.3f}s"
+            )
+
+    budget_results = config.stash.get(BUDGET_RESULTS_KEY, [])
+    if budget_results:
+        exceeded = [result for result in budget_results if result.exceeded]
+        terminalreporter.write_sep("-", "performance budgets")
+        terminalreporter.write_line(
+            f"{len(budget_results)} budgets checked, {len(exceeded)} exceeded"
+        )
+        for result in exceeded:
+            terminalreporter.write_line(
+                f"[{result.budget.severity}] {result.describe()}"
+            )
+
+    if PAGE_VISITS:
+        terminalreporter.write_sep("-", "page metrics")
+        for page, visits in summarise_page_visits(PAGE_VISITS).items():
+            terminalreporter.write_line(
+                f"{page}: {visits['visits']} visits, mean TTFB {visits['ttfb']:.0f}ms,"
+                f" mean load {visits['load']:.0f}ms, mean LCP"
+                f" {visits['largest_contentful_paint']:.0f}ms"
+            )
+
+    if TRACER.spans:
+        terminalreporter.write_sep("-", "helper spans")
+        for name, span in summarise_spans(TRACER.spans).items():
+            terminalreporter.write_line(
+                f"{name}: {span['calls']} calls, mean {span['mean']:.3f}s,"
+                f" total {span['total']:.3f}s"
+            )
+
+    writer = config.stash.get(ARTIFACT_WRITER_KEY, None)
+    if writer is not None and writer.captured:
+        terminalreporter.write_sep("-", "failure artifacts")
+        terminalreporter.write_line(
+            f"{writer.captured} artifacts captured, {writer.deduplicated} duplicates,"
+            f" {writer.bytes_captured} bytes captured, {writer.bytes_written} bytes"
+            " written"
+        )
+
+    profiler = config.stash.get(PROFILER_KEY, None)
+    if profiler is not None and profiler.profiles:
+        terminalreporter.write_sep("-", "webdriver commands")
+        for profile in profiler.profiles.values():
+            terminalreporter.write_line(
+                f"{profile.nodeid}: {profile.commands} commands,"
+                f" {profile.wait_time:.3f}s waiting, {profile.action_time:.3f}s acting"
+            )
+
+    account_pool = config.stash.get(ACCOUNT_POOL_KEY, None)
+    if account_pool is not None and account_pool.leases:
+        terminalreporter.write_sep("-", "account pool")
+        terminalreporter.write_line(
+            f"{account_pool.leases} accounts leased, {account_pool.registered}"
+            " registered"
+        )
+
+    pool = config.stash.get(BROWSER_POOL_KEY, None)
+    if pool is None:
+        return
+
+    terminalreporter.write_sep("-", "browser pool")
+    terminalreporter.write_line(
+        f"{pool.launches} Chrome launches for {pool.checkouts} module checkouts,"
+        f" {pool.launches_saved} launches saved, {pool.replaced} broken browsers"
+        " replaced"
+    )
+
+    if resolve_chromedriver.cache_info().currsize:
+        resolution = resolve_chromedriver()
+        terminalreporter.write_line(
+            f"chromedriver resolved from {resolution.source} in"
+            f" {resolution.duration:.3f}s (Chrome {resolution.chrome_version})"
+        )
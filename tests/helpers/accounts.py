@@ -0,0 +1,264 @@
+import json
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from time import time
+from typing import Dict, Optional, Tuple
+
+import pytest
+from faker import Faker
+from filelock import FileLock
+from requests import RequestException
+from structlog import get_logger
+
+from tests.helpers.driver_resolver import CACHE_DIR
+from tests.helpers.http_client import AUTH_COOKIES, StorefrontClient
+from tests.helpers.parallel import namespaced_email, worker_id
+
+LOGGER = get_logger(module=__name__)
+
+# Top the pool up in the background once fewer free accounts than this are left
+LOW_WATER_MARK = 2
+REFILL_BATCH = 4
+# Leases older than this were left behind by a crashed run and can be reclaimed
+LEASE_TIMEOUT = 3600
+# A refill started by another worker within this window is assumed to be running
+REFILL_TIMEOUT = 120
+
+
+def pool_directory(config: pytest.Config) -> Path:
+    """
+    Get the directory holding the account ledger, shared by every worker and run.
+
+    Args:
+        config (Config): The pytest Config instance.
+
+    Returns:
+        Path: The pytest cache directory of the pool, or the user cache directory
+            when the cache provider is disabled.
+    """
+    cache = getattr(config, "cache", None)
+    return cache.mkdir("accounts") if cache else CACHE_DIR / "accounts"
+
+
+@dataclass(frozen=True)
+class Account:
+    email: str
+    password: str
+
+
+class AccountPool:
+    """
+    Pool of pre-registered accounts shared by every worker and run through a
+    file-locked ledger on disk.
+
+    The ledger holds one section per storefront, mapping each account email to its
+    password and current lease. Accounts are leased by a single test at a time and
+    returned with an empty cart, so registration is off the critical path of tests.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        storefront: str,
+        namespace: str,
+        client: Optional[StorefrontClient] = None,
+    ):
+        directory.mkdir(parents=True, exist_ok=True)
+        self.ledger_path = directory / "ledger.json"
+        self.lock = FileLock(str(directory / "ledger.lock"))
+        self.storefront = storefront
+        self.namespace = namespace
+        self.client = client or StorefrontClient()
+        self.fake = Faker()
+        self.owner = f"{worker_id()}:{os.getpid()}"
+        self.refill_thread: Optional[threading.Thread] = None
+        self.leases = 0
+        self.registered = 0
+
+    def _read(self) -> Dict[str, dict]:
+        if not self.ledger_path.is_file():
+            return {}
+        return json.loads(self.ledger_path.read_text())
+
+    def _write(self, ledger: Dict[str, dict]):
+        tmp_path = self.ledger_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(ledger, indent=2, sort_keys=True))
+        tmp_path.replace(self.ledger_path)
+
+    def _section(self, ledger: Dict[str, dict]) -> dict:
+        return ledger.setdefault(
+            self.storefront, {"accounts": {}, "refilling_since": 0}
+        )
+
+    def _register(self) -> Account:
+        account = Account(
+            email=namespaced_email(self.fake, self.namespace),
+            password=self.fake.password(),
+        )
+        self.client.register(
+            first_name=self.fake.first_name(),
+            last_name=self.fake.last_name(),
+            email=account.email,
+            password=account.password,
+        )
+        self.registered += 1
+        return account
+
+    def _add(self, account: Account, leased: bool):
+        with self.lock:
+            ledger = self._read()
+            self._section(ledger)["accounts"][account.email] = {
+                "password": account.password,
+                "leased_by": self.owner if leased else None,
+                "leased_at": time() if leased else None,
+            }
+            self._write(ledger)
+
+    def _retire(self, account: Account):
+        LOGGER.warning("Retiring account from the pool", email=account.email)
+        AUTH_COOKIES.invalidate(account.email)
+        with self.lock:
+            ledger = self._read()
+            self._section(ledger)["accounts"].pop(account.email, None)
+            self._write(ledger)
+
+    def _unclaim(self, account: Account):
+        with self.lock:
+            ledger = self._read()
+            lease = self._section(ledger)["accounts"].get(account.email)
+            if lease and lease["leased_by"] == self.owner:
+                lease.update(leased_by=None, leased_at=None)
+                self._write(ledger)
+
+    def _claim(self) -> Optional[Tuple[Account, bool, int]]:
+        """
+        Mark the first free account of the ledger as leased by this process.
+
+        Returns:
+            Optional[Tuple[Account, bool, int]]: The account, whether its lease was
+                reclaimed and the number of free accounts left, or None if no
+                account is free.
+        """
+        with self.lock:
+            ledger = self._read()
+            accounts = self._section(ledger)["accounts"]
+            now = time()
+
+            def is_free(lease: dict) -> bool:
+                return (
+                    lease["leased_by"] is None
+                    or now - lease["leased_at"] > LEASE_TIMEOUT
+                )
+
+            free = [email for email, lease in accounts.items() if is_free(lease)]
+            if not free:
+                return None
+
+            email = free[0]
+            lease = accounts[email]
+            reclaimed = lease["leased_by"] is not None
+            lease.update(leased_by=self.owner, leased_at=now)
+            self._write(ledger)
+
+        return Account(email, lease["password"]), reclaimed, len(free) - 1
+
+    def lease(self) -> Account:
+        """
+        Lease a free account, registering a new one if the pool is empty.
+
+        The account is logged in over HTTP before being handed out, which both
+        checks that it still exists and warms the session cookie cache.
+
+        Returns:
+            Account: The leased account.
+
+        Raises:
+            RequestException: If the storefront cannot be reached.
+        """
+        while True:
+            claim = self._claim()
+            if claim is None:
+                LOGGER.info("Account pool is empty, registering a new account")
+                account = self._register()
+                self._add(account, leased=True)
+                reclaimed, free = False, 0
+            else:
+                account, reclaimed, free = claim
+
+            try:
+                cookie = AUTH_COOKIES.get(account.email, account.password)
+                if reclaimed:
+                    # The previous holder crashed before returning the account
+                    self.client.empty_cart(cookie)
+            except AssertionError:
+                # Unknown to the storefront, e.g. its accounts were reset
+                self._retire(account)
+                continue
+            except Exception:
+                # Hand the account back rather than leaving it leased until it times out
+                self._unclaim(account)
+                raise
+            break
+
+        self.leases += 1
+        LOGGER.info("Leased account", email=account.email, free_accounts=free)
+        if free < LOW_WATER_MARK:
+            self.refill()
+        return account
+
+    def release(self, account: Account):
+        """
+        Empty the cart of an account and return it to the pool.
+
+        Args:
+            account (Account): The leased account.
+        """
+        try:
+            self.client.empty_cart(AUTH_COOKIES.get(account.email, account.password))
+        except (AssertionError, RequestException) as error:
+            LOGGER.warning("Failed to reset account", email=account.email, error=error)
+            self._retire(account)
+            return
+
+        self._unclaim(account)
+        LOGGER.info("Returned account to the pool", email=account.email)
+
+    def refill(self):
+        """
+        Register a batch of accounts in a background thread, unless a refill is
+        already running in this or another worker.
+        """
+        if self.refill_thread and self.refill_thread.is_alive():
+            return
+
+        with self.lock:
+            ledger = self._read()
+            section = self._section(ledger)
+            if time() - section["refilling_since"] < REFILL_TIMEOUT:
+                return
+            section["refilling_since"] = time()
+            self._write(ledger)
+
+        self.refill_thread = threading.Thread(
+            target=self._refill, name="account-pool-refill", daemon=True
+        )
+        self.refill_thread.start()
+
+    def _refill(self):
+        LOGGER.info("Topping up the account pool", accounts=REFILL_BATCH)
+        try:
+            for _ in range(REFILL_BATCH):
+                self._add(self._register(), leased=False)
+        except (AssertionError, RequestException) as error:
+            LOGGER.warning("Failed to top up the account pool", error=error)
+        finally:
+            with self.lock:
+                ledger = self._read()
+                self._section(ledger)["refilling_since"] = 0
+                self._write(ledger)
+
+    def close(self):
+        if self.refill_thread:
+            self.refill_thread.join()
@@ -0,0 +1,215 @@
+"""
+Failure artifacts written to the Allure results in the background.
+
+The report hook only captures the raw artifacts. Re-encoding and writing happen on a
+writer thread while the test tears down, and the test result references the written
+files once the test ends. Identical artifacts are written once and shared by every
+test attaching them.
+"""
+
+import io
+import os
+from dataclasses import dataclass
+from hashlib import sha256
+from pathlib import Path
+from queue import Queue
+from threading import Event, Lock, Thread
+from typing import Dict, List, Optional, Tuple
+
+from allure_commons.model2 import Attachment
+from allure_commons.types import AttachmentType
+from selenium import webdriver
+from selenium.common import WebDriverException
+from structlog import get_logger
+
+try:
+    from PIL import Image
+except ImportError:  # Without Pillow, screenshots are kept as PNG
+    Image = None
+
+LOGGER = get_logger(module=__name__)
+
+# Screenshots wider than this are downscaled before being re-encoded as JPEG
+MAX_SCREENSHOT_WIDTH = 1280
+JPEG_QUALITY = 70
+
+
+@dataclass(frozen=True)
+class Artifact:
+    name: str
+    body: bytes
+    attachment_type: AttachmentType
+
+
+def capture_artifacts(driver: webdriver.Chrome, name: str) -> List[Artifact]:
+    """
+    Capture the screenshot, DOM, console log and URL of the page.
+
+    Each artifact is captured on its own, so a browser that cannot provide one still
+    provides the others.
+
+    Args:
+        driver (WebDriver): The WebDriver instance.
+        name (str): The prefix of the artifact names, e.g. the test name.
+
+    Returns:
+        List[Artifact]: The captured artifacts.
+    """
+    captures = (
+        ("screenshot", AttachmentType.PNG, lambda: driver.get_screenshot_as_png()),
+        ("dom", AttachmentType.HTML, lambda: driver.page_source.encode()),
+        (
+            "console",
+            AttachmentType.TEXT,
+            lambda: "\n".join(
+                f"{entry['level']} {entry['message']}"
+                for entry in driver.get_log("browser")
+            ).encode(),
+        ),
+        ("url", AttachmentType.URI_LIST, lambda: driver.current_url.encode()),
+    )
+
+    artifacts = []
+    for kind, attachment_type, capture in captures:
+        try:
+            body = capture()
+        except WebDriverException as error:
+            LOGGER.warning(
+                "Failed to capture artifact", artifact=f"{name}_{kind}", error=error.msg
+            )
+            continue
+        artifacts.append(Artifact(f"{name}_{kind}", body, attachment_type))
+    return artifacts
+
+
+def encode_screenshot(body: bytes) -> bytes:
+    """
+    Downscale a PNG screenshot and re-encode it as JPEG.
+
+    Args:
+        body (bytes): The PNG screenshot.
+
+    Returns:
+        bytes: The JPEG screenshot.
+    """
+    image = Image.open(io.BytesIO(body)).convert("RGB")
+    if image.width > MAX_SCREENSHOT_WIDTH:
+        height = round(image.height * MAX_SCREENSHOT_WIDTH / image.width)
+        image = image.resize((MAX_SCREENSHOT_WIDTH, height), Image.LANCZOS)
+
+    output = io.BytesIO()
+    image.save(output, format="JPEG", quality=JPEG_QUALITY, optimize=True)
+    return output.getvalue()
+
+
+class ArtifactWriter:
+    """
+    Writes artifacts to the Allure results directory on a background thread.
+
+    Artifacts are named after the hash of their content, so an artifact already
+    written or queued is only referenced again.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.captured = 0
+        self.deduplicated = 0
+        self.bytes_captured = 0
+        self.bytes_written = 0
+        # Set once the file is written, or its write failed
+        self._written: Dict[str, Event] = {}
+        self._attachments: Dict[str, List[Tuple[str, str, AttachmentType]]] = {}
+        self._queue: "Queue[Optional[Tuple[str, Artifact]]]" = Queue()
+        self._lock = Lock()
+        self._thread: Optional[Thread] = None
+
+    def queue(self, test: str, artifact: Artifact):
+        """
+        Queue an artifact for writing, to be attached to its test once it ends.
+
+        Args:
+            test (str): The node id of the test.
+            artifact (Artifact): The captured artifact.
+        """
+        attachment_type = artifact.attachment_type
+        if attachment_type == AttachmentType.PNG and Image is not None:
+            attachment_type = AttachmentType.JPG
+        file_name = f"{sha256(artifact.body).hexdigest()}-attachment.{attachment_type.extension}"
+
+        with self._lock:
+            self._attachments.setdefault(test, []).append(
+                (artifact.name, file_name, attachment_type)
+            )
+            self.captured += 1
+            self.bytes_captured += len(artifact.body)
+            if file_name in self._written:
+                self.deduplicated += 1
+                return
+            self._written[file_name] = Event()
+
+            if self._thread is None:
+                self._thread = Thread(
+                    target=self._run, name="artifact-writer", daemon=True
+                )
+                self._thread.start()
+        self._queue.put((file_name, artifact))
+
+    def attach(self, reporter, test: str):
+        """
+        Wait for the artifacts of a test to be written and record them on its Allure
+        result.
+
+        Args:
+            reporter (AllureReporter): The reporter of the Allure listener.
+            test (str): The node id of the test, while its Allure result is open.
+        """
+        with self._lock:
+            attachments = self._attachments.pop(test, [])
+        if not attachments:
+            return
+
+        test_result = reporter.get_test(None)
+        for name, file_name, attachment_type in attachments:
+            self._written[file_name].wait()
+            # Missing if its write failed, which is logged
+            if (self.directory / file_name).exists():
+                test_result.attachments.append(
+                    Attachment(
+                        name=name, source=file_name, type=attachment_type.mime_type
+                    )
+                )
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            file_name, artifact = item
+            try:
+                self._write(file_name, artifact)
+            except Exception as error:
+                LOGGER.warning(
+                    "Failed to write artifact", artifact=artifact.name, error=error
+                )
+            finally:
+                self._written[file_name].set()
+
+    def _write(self, file_name: str, artifact: Artifact):
+        body = artifact.body
+        if file_name.endswith(f".{AttachmentType.JPG.extension}"):
+            body = encode_screenshot(body)
+
+        temporary = self.directory / f"{file_name}.tmp"
+        temporary.write_bytes(body)
+        os.replace(temporary, self.directory / file_name)
+        self.bytes_written += len(body)
+
+    def close(self):
+        """
+        Write every queued artifact and stop the writer thread.
+        """
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
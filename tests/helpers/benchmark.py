@@ -0,0 +1,200 @@
+"""
+Statistics and history of the scenario benchmarks.
+
+A benchmark run executes every scenario several times, each iteration in its own
+pytest process. An iteration is measured from its JUnit report (the duration of the
+test call, without the browser launch, storefront start and account provisioning of
+its setup and teardown) and its trace file (the duration of each helper step).
+"""
+
+import json
+import statistics
+import xml.etree.ElementTree as ElementTree
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from filelock import FileLock
+
+STATISTICS = ("mean", "median", "p95", "p99", "stdev")
+
+
+def percentile(samples: List[float], rank: float) -> float:
+    """
+    Compute a percentile, interpolating between the closest samples.
+
+    Args:
+        samples (List[float]): The samples, at least one.
+        rank (float): The percentile rank, e.g. 95.
+
+    Returns:
+        float: The percentile.
+    """
+    ordered = sorted(samples)
+    position = (len(ordered) - 1) * rank / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarise(samples: List[float]) -> Dict[str, float]:
+    """
+    Describe the distribution of the samples.
+
+    Args:
+        samples (List[float]): The samples, at least one.
+
+    Returns:
+        Dict[str, float]: The number of samples, mean, median, 95th and 99th
+            percentiles and standard deviation.
+    """
+    return {
+        "runs": len(samples),
+        "mean": statistics.fmean(samples),
+        "median": statistics.median(samples),
+        "p95": percentile(samples, 95),
+        "p99": percentile(samples, 99),
+        "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+    }
+
+
+def read_iteration(directory: Path) -> Tuple[float, Dict[str, float]]:
+    """
+    Read the measurements of a benchmark iteration.
+
+    Args:
+        directory (Path): The reports directory of the iteration, with its junit.xml
+            report and traces.
+
+    Returns:
+        Tuple[float, Dict[str, float]]: The scenario duration, i.e. the duration of the
+            test calls the report was written with, and the total duration of each
+            helper step, in seconds.
+    """
+    report = ElementTree.parse(directory / "junit.xml")
+    duration = sum(
+        float(testcase.get("time", 0)) for testcase in report.iter("testcase")
+    )
+
+    steps: Dict[str, float] = defaultdict(float)
+    for trace in (directory / "traces").glob("*.json"):
+        for event in json.loads(trace.read_text())["traceEvents"]:
+            if event.get("cat") == "helper":
+                steps[event["name"]] += event["dur"] / 1_000_000
+    return duration, dict(steps)
+
+
+def summarise_scenario(
+    iterations: List[Tuple[float, Dict[str, float]]], failures: int
+) -> Dict:
+    """
+    Summarise the iterations of a scenario, keeping the samples for later analysis.
+
+    Args:
+        iterations (List[Tuple[float, Dict[str, float]]]): The measurements of the
+            passed iterations.
+        failures (int): The number of failed iterations.
+
+    Returns:
+        Dict: The scenario samples and summary, and those of each step.
+    """
+    durations = [duration for duration, _ in iterations]
+    step_samples: Dict[str, List[float]] = defaultdict(list)
+    for _, steps in iterations:
+        for name, duration in steps.items():
+            step_samples[name].append(duration)
+
+    return {
+        "failures": failures,
+        "samples": durations,
+        "summary": summarise(durations) if durations else None,
+        "steps": {
+            name: {"samples": samples, "summary": summarise(samples)}
+            for name, samples in step_samples.items()
+        },
+    }
+
+
+def load_history(path: Path) -> List[Dict]:
+    """
+    Load the benchmark runs of a history file.
+
+    Args:
+        path (Path): The history JSON file.
+
+    Returns:
+        List[Dict]: The runs, oldest first, empty if the file does not exist.
+    """
+    if not path.exists():
+        return []
+    return json.loads(path.read_text())["runs"]
+
+
+def append_history(path: Path, run: Dict):
+    """
+    Append a benchmark run to a history file.
+
+    Args:
+        path (Path): The history JSON file.
+        run (Dict): The benchmark run.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with FileLock(f"{path}.lock"):
+        runs = load_history(path)
+        runs.append(run)
+        path.write_text(json.dumps({"runs": runs}, indent=2) + "\n")
+
+
+def find_run(runs: List[Dict], reference: str) -> Dict:
+    """
+    Find a benchmark run by id, label or index, e.g. "-1" for the latest run.
+
+    Args:
+        runs (List[Dict]): The runs of the history.
+        reference (str): The run id, label or index.
+
+    Returns:
+        Dict: The run.
+
+    Raises:
+        KeyError: If no run matches the reference.
+    """
+    for run in reversed(runs):
+        if reference in (run["id"], run.get("label")):
+            return run
+    try:
+        return runs[int(reference)]
+    except (ValueError, IndexError):
+        raise KeyError(f"No benchmark run {reference}")
+
+
+def diff_runs(
+    base: Dict, head: Dict, statistic: str = "mean"
+) -> List[Tuple[str, Optional[float], Optional[float]]]:
+    """
+    Compare a statistic of every scenario and step of two runs.
+
+    Args:
+        base (Dict): The run compared against.
+        head (Dict): The run compared.
+        statistic (str, optional): The compared statistic. Default is "mean".
+
+    Returns:
+        List[Tuple[str, Optional[float], Optional[float]]]: Per scenario and
+            "scenario/step", the statistic in both runs, None if not measured.
+    """
+
+    def values(run: Dict) -> Dict[str, float]:
+        measured = {}
+        for scenario, result in run["scenarios"].items():
+            if result["summary"]:
+                measured[scenario] = result["summary"][statistic]
+            for step, step_result in result["steps"].items():
+                measured[f"{scenario}/{step}"] = step_result["summary"][statistic]
+        return measured
+
+    base_values, head_values = values(base), values(head)
+    names = list(base_values) + [
+        name for name in head_values if name not in base_values
+    ]
+    return [(name, base_values.get(name), head_values.get(name)) for name in names]
@@ -0,0 +1,244 @@
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+from selenium import webdriver
+from selenium.common import WebDriverException
+from selenium.webdriver.chrome.service import Service
+from structlog import get_logger
+
+from tests.helpers.driver_resolver import resolve_chromedriver
+from tests.helpers.network import LOGGING_PREFS, PERF_LOGGING_PREFS, network_monitor
+
+LOGGER = get_logger(module=__name__)
+
+# URL patterns blocked for each resource type, stylesheets are kept since the
+# visibility checks depend on the layout
+RESOURCE_TYPE_PATTERNS = {
+    "image": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico"],
+    "font": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    "media": ["*.mp4", "*.webm", "*.mp3", "*.ogg"],
+}
+
+THIRD_PARTY_PATTERNS = (
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*googlesyndication.com*",
+    "*doubleclick.net*",
+    "*facebook.net*",
+    "*hotjar.com*",
+)
+
+
+@dataclass(frozen=True)
+class BrowserProfile:
+    """
+    Launch profile trimming what the browser loads to what the assertions need.
+    """
+
+    page_load_strategy: str = "eager"
+    blocked_resource_types: Tuple[str, ...] = ("image", "font", "media")
+    blocked_urls: Tuple[str, ...] = THIRD_PARTY_PATTERNS
+
+    @property
+    def url_patterns(self) -> List[str]:
+        patterns = list(self.blocked_urls)
+        for resource_type in self.blocked_resource_types:
+            patterns += RESOURCE_TYPE_PATTERNS[resource_type]
+        return patterns
+
+
+def apply_profile(driver: webdriver.Chrome, profile: BrowserProfile):
+    """
+    Block the URL patterns of a profile through DevTools network interception.
+
+    Args:
+        driver (WebDriver): The WebDriver instance.
+        profile (BrowserProfile): The launch profile.
+    """
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": profile.url_patterns})
+
+
+def chrome_options(profile: Optional[BrowserProfile] = None) -> webdriver.ChromeOptions:
+    """
+    Build the ChromeOptions used by every browser launched for the suite.
+
+    Args:
+        profile (Optional[BrowserProfile], optional): The launch profile. Default is None.
+
+    Returns:
+        ChromeOptions: The configured ChromeOptions instance.
+    """
+    options = webdriver.ChromeOptions()
+    options.add_argument("--no-sandbox")
+    options.add_argument("--ignore-certificate-errors")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-autofill")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--disable-popup-blocking")
+    options.add_argument("--allow-running-insecure-content")
+    options.add_argument("--headless")
+    options.add_argument("--start-maximized")
+
+    # Expose the DevTools network events used to detect checkout step completion
+    options.set_capability("goog:loggingPrefs", LOGGING_PREFS)
+    options.add_experimental_option("perfLoggingPrefs", PERF_LOGGING_PREFS)
+
+    if profile:
+        options.page_load_strategy = profile.page_load_strategy
+    return options
+
+
+def launch_chrome(profile: Optional[BrowserProfile] = None) -> webdriver.Chrome:
+    """
+    Launch a new headless Chrome instance.
+
+    Args:
+        profile (Optional[BrowserProfile], optional): The launch profile. Default is None.
+
+    Returns:
+        WebDriver: The new Chrome WebDriver instance.
+    """
+    LOGGER.info("Launching a new Chrome WebDriver")
+
+    # Initialise the Service object for handling the browser driver
+    service = Service(resolve_chromedriver().path)
+
+    driver = webdriver.Chrome(service=service, options=chrome_options(profile))
+    LOGGER.info("Chrome WebDriver launched!")
+    return driver
+
+
+def is_alive(driver: webdriver.Chrome) -> bool:
+    """
+    Check whether the browser behind a WebDriver still responds.
+
+    Args:
+        driver (WebDriver): The WebDriver instance.
+
+    Returns:
+        bool: True if the browser answered, else False.
+    """
+    try:
+        driver.window_handles
+        driver.current_url
+    except WebDriverException:
+        return False
+    return True
+
+
+def reset_browser_state(driver: webdriver.Chrome):
+    """
+    Bring a browser back to a clean state so it can be handed out again.
+
+    Closes any extra windows, clears local/session storage of the current page,
+    deletes the cookies of every domain and navigates to a blank page.
+
+    Args:
+        driver (WebDriver): The WebDriver instance.
+
+    Raises:
+        WebDriverException: If the browser fails to reset.
+    """
+    # Keep a single window open
+    handles = driver.window_handles
+    for handle in handles[1:]:
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(handles[0])
+
+    # Storage is scoped to the origin of the page currently loaded
+    driver.execute_script(
+        "try { window.localStorage.clear(); window.sessionStorage.clear(); }"
+        " catch (e) {}"
+    )
+
+    # delete_all_cookies only covers the current domain, CDP clears all of them
+    driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+    driver.get("about:blank")
+
+    # Drop the network events of the previous module
+    network_monitor(driver).reset()
+
+
+class BrowserPool:
+    """
+    A pool of warm browsers shared by all test modules of a session.
+
+    Drivers are reset between checkouts instead of being quit, so a new Chrome is
+    only launched when the pool is empty or a pooled browser turns out to be broken.
+    """
+
+    def __init__(self, launcher: Callable[[], webdriver.Chrome] = launch_chrome):
+        self.launcher = launcher
+        self.idle: List[webdriver.Chrome] = []
+        self.launches = 0
+        self.checkouts = 0
+        self.replaced = 0
+
+    @property
+    def launches_saved(self) -> int:
+        return self.checkouts - self.launches
+
+    def _launch(self) -> webdriver.Chrome:
+        self.launches += 1
+        return self.launcher()
+
+    def acquire(self) -> webdriver.Chrome:
+        """
+        Hand out a warm browser, launching a new one if none is usable.
+
+        Returns:
+            WebDriver: A WebDriver instance in a clean state.
+        """
+        self.checkouts += 1
+        while self.idle:
+            driver = self.idle.pop()
+            if is_alive(driver):
+                LOGGER.info("Reusing a pooled Chrome WebDriver")
+                return driver
+
+            LOGGER.warning("Discarding a broken pooled Chrome WebDriver")
+            self.replaced += 1
+            self._quit(driver)
+
+        return self._launch()
+
+    def release(self, driver: webdriver.Chrome):
+        """
+        Reset a browser and return it to the pool.
+
+        Args:
+            driver (WebDriver): The WebDriver instance to return.
+        """
+        try:
+            reset_browser_state(driver)
+        except WebDriverException as error:
+            LOGGER.warning(
+                "Failed to reset Chrome WebDriver, discarding it", error=error
+            )
+            self.replaced += 1
+            self._quit(driver)
+            return
+
+        self.idle.append(driver)
+
+    def close(self):
+        """
+        Quit every pooled browser.
+        """
+        LOGGER.info(
+            "Closing the browser pool",
+            launches=self.launches,
+            checkouts=self.checkouts,
+            launches_saved=self.launches_saved,
+        )
+        while self.idle:
+            self._quit(self.idle.pop())
+
+    @staticmethod
+    def _quit(driver: webdriver.Chrome):
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
@@ -0,0 +1,186 @@
+"""
+Performance budgets of the storefront pages and checkout steps.
+
+Budgets are declared in a JSON file, in milliseconds, per page object and per checkout
+step:
+
+    {
+      "pages": {"ShoppingCartPage": {"dom_content_loaded": {"limit": 800}}},
+      "checkout_steps": {"payment method": {"server_time": {"limit": 300}}}
+    }
+
+A budget is exceeded when the statistic ("max" by default, or "median") of the
+samples measured during a test is above its limit. Soft budgets are only reported,
+hard budgets fail the test.
+"""
+
+import json
+import statistics
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import List
+
+import allure
+from allure_commons.types import AttachmentType
+
+from tests.helpers.network import StepTiming
+from tests.helpers.page_metrics import PageVisit
+
+SEVERITIES = ("soft", "hard")
+STATISTICS = {"max": max, "median": statistics.median}
+BUDGET_OPTIONS = {"limit", "severity", "statistic"}
+
+# Metrics a budget can limit, the step timings are recorded in seconds
+PAGE_METRICS = {
+    field.name
+    for field in fields(PageVisit)
+    if field.name not in ("url", "page", "test", "started")
+}
+STEP_METRICS = {"server_time", "request_time", "duration"}
+
+
+class BudgetExceeded(AssertionError):
+    pass
+
+
+@dataclass(frozen=True)
+class Budget:
+    scope: str
+    target: str
+    metric: str
+    limit: float
+    severity: str = "soft"
+    statistic: str = "max"
+
+    def __str__(self) -> str:
+        return f"{self.target} {self.metric} {self.statistic} < {self.limit:g}ms"
+
+
+@dataclass(frozen=True)
+class BudgetResult:
+    budget: Budget
+    samples: List[float]
+
+    @property
+    def value(self) -> float:
+        return STATISTICS[self.budget.statistic](self.samples)
+
+    @property
+    def exceeded(self) -> bool:
+        return self.value > self.budget.limit
+
+    def describe(self) -> str:
+        """
+        Describe the outcome and the measured distribution.
+
+        Returns:
+            str: The description, e.g. "ShoppingCartPage dom_content_loaded max < 800ms:
+                812ms (n=2, min 640ms, median 726ms, max 812ms)".
+        """
+        return (
+            f"{self.budget}: {self.value:.0f}ms (n={len(self.samples)},"
+            f" min {min(self.samples):.0f}ms,"
+            f" median {statistics.median(self.samples):.0f}ms,"
+            f" max {max(self.samples):.0f}ms)"
+        )
+
+
+def load_budgets(path: Path) -> List[Budget]:
+    """
+    Load the budgets of a budget file.
+
+    Args:
+        path (Path): The budget JSON file.
+
+    Returns:
+        List[Budget]: The declared budgets.
+
+    Raises:
+        ValueError: If a budget has an unknown metric, option, severity or statistic.
+    """
+    declared = json.loads(Path(path).read_text())
+    budgets = []
+    for scope, metrics in (("pages", PAGE_METRICS), ("checkout_steps", STEP_METRICS)):
+        for target, limits in declared.get(scope, {}).items():
+            for metric, options in limits.items():
+                if metric not in metrics:
+                    raise ValueError(f"Unknown {scope} budget metric: {metric}")
+                if "limit" not in options or set(options) - BUDGET_OPTIONS:
+                    raise ValueError(f"Invalid budget of {target} {metric}: {options}")
+                budget = Budget(scope=scope, target=target, metric=metric, **options)
+                if budget.severity not in SEVERITIES:
+                    raise ValueError(f"Unknown budget severity: {budget.severity}")
+                if budget.statistic not in STATISTICS:
+                    raise ValueError(f"Unknown budget statistic: {budget.statistic}")
+                budgets.append(budget)
+    return budgets
+
+
+def evaluate_budgets(
+    budgets: List[Budget], visits: List[PageVisit], timings: List[StepTiming]
+) -> List[BudgetResult]:
+    """
+    Measure the budgets against the page visits and checkout steps of a test.
+
+    Args:
+        budgets (List[Budget]): The declared budgets.
+        visits (List[PageVisit]): The page visits of the test.
+        timings (List[StepTiming]): The checkout step timings of the test.
+
+    Returns:
+        List[BudgetResult]: The result of every budget measured at least once.
+    """
+    results = []
+    for budget in budgets:
+        if budget.scope == "pages":
+            values = [
+                getattr(visit, budget.metric)
+                for visit in visits
+                if visit.page == budget.target
+            ]
+        else:
+            values = [
+                getattr(timing, budget.metric) * 1000
+                for timing in timings
+                if timing.name == budget.target
+                and getattr(timing, budget.metric) is not None
+            ]
+        samples = [value for value in values if value is not None]
+        if samples:
+            results.append(BudgetResult(budget, samples))
+    return results
+
+
+def report_budgets(results: List[BudgetResult]):
+    """
+    Report every budget as an Allure step of the running test, failed when exceeded,
+    and attach the measured samples.
+
+    Args:
+        results (List[BudgetResult]): The budget results of the test.
+    """
+    for result in results:
+        try:
+            with allure.step(f"[{result.budget.severity}] {result.describe()}"):
+                if result.exceeded:
+                    raise BudgetExceeded(result.describe())
+        except BudgetExceeded:
+            pass
+
+    allure.attach(
+        json.dumps(
+            [
+                {
+                    "budget": str(result.budget),
+                    "severity": result.budget.severity,
+                    "exceeded": result.exceeded,
+                    "value": result.value,
+                    "samples": result.samples,
+                }
+                for result in results
+            ],
+            indent=2,
+        ),
+        name="performance_budgets",
+        attachment_type=AttachmentType.JSON,
+    )
@@ -0,0 +1,168 @@
+from typing import Any, List, Optional, Tuple
+from weakref import WeakKeyDictionary
+
+from selenium import webdriver
+from structlog import get_logger
+
+from tests.helpers.catalog import CatalogProduct
+from tests.helpers.commands import CommandListener, command_listener
+from tests.helpers.config import get_base_url, url_for
+
+LOGGER = get_logger(module=__name__)
+
+# Posts every item to the AJAX add-to-cart endpoint in turn with the browser's own
+# session, using the anti-forgery token of the cart page
+ADD_TO_CART_SCRIPT = """
+const done = arguments[arguments.length - 1];
+const [cartUrl, items] = arguments;
+
+function addToCart(token, [url, productId, quantity]) {
+  const body = new URLSearchParams();
+  body.append('addtocart_' + productId + '.EnteredQuantity', quantity);
+  body.append('__RequestVerificationToken', token);
+  return fetch(url, {
+    method: 'POST',
+    body: body,
+    credentials: 'same-origin',
+    headers: { 'X-Requested-With': 'XMLHttpRequest' },
+  }).then(function (response) {
+    return response.json();
+  });
+}
+
+fetch(cartUrl, { credentials: 'same-origin' })
+  .then(function (response) {
+    return response.text();
+  })
+  .then(function (html) {
+    const page = new DOMParser().parseFromString(html, 'text/html');
+    const input = page.querySelector('input[name="__RequestVerificationToken"]');
+    const token = input ? input.value : '';
+    const results = [];
+    return items
+      .reduce(function (chain, item) {
+        return chain.then(function () {
+          return addToCart(token, item).then(function (result) {
+            results.push(result);
+          });
+        });
+      }, Promise.resolve())
+      .then(function () {
+        return results;
+      });
+  })
+  .then(
+    function (results) { done({ results: results }); },
+    function (error) { done({ error: String(error) }); }
+  );
+"""
+
+
+def post_add_to_cart(
+    driver: webdriver.Chrome, items: List[Tuple[CatalogProduct, int]]
+) -> List[dict]:
+    """
+    Add products to the cart through the AJAX endpoint in one script.
+
+    Args:
+        driver (WebDriver): The WebDriver instance.
+        items (List[Tuple[CatalogProduct, int]]): The products and quantities to add.
+
+    Returns:
+        List[dict]: The JSON response of the storefront for each item.
+
+    Raises:
+        AssertionError: If the requests could not be made.
+    """
+    # fetch() is bound to the origin of the page currently loaded
+    if not driver.current_url.startswith(get_base_url()):
+        driver.get(url_for())
+
+    cart_state(driver).invalidate()
+    result = driver.execute_async_script(
+        ADD_TO_CART_SCRIPT,
+        url_for("cart"),
+        [
+            [url_for(f"addproducttocart/details/{product.id}/1"), product.id, quantity]
+            for product, quantity in items
+        ],
+    )
+    assert "error" not in result, f"Failed to add products to cart: {result['error']}"
+    return result["results"]
+
+
+class CartStateCache:
+    """
+    The last cart page identity and table snapshot read from a browser.
+
+    Both are dropped as soon as the browser is sent a command that may navigate or
+    change the page, e.g. a navigation, a click or an add-to-cart script, so reading
+    them again never touches the browser while they are valid.
+    """
+
+    def __init__(self, listener: CommandListener):
+        self.listener = listener
+        self.generation = listener.generation
+        self.url: Optional[str] = None
+        self.rows: Optional[List[Any]] = None
+        self.hits = 0
+        self.misses = 0
+
+    def _sync(self):
+        if self.generation != self.listener.generation:
+            self.invalidate()
+
+    def invalidate(self):
+        self.generation = self.listener.generation
+        self.url = None
+        self.rows = None
+
+    def page(self) -> Optional[str]:
+        """
+        Get the URL of the cart page the browser is known to be on.
+
+        Returns:
+            Optional[str]: The cart page URL, None if unknown.
+        """
+        self._sync()
+        return self.url
+
+    def set_page(self, url: str):
+        self._sync()
+        self.url = url
+
+    def snapshot(self) -> Optional[List[Any]]:
+        """
+        Get the cached cart table snapshot.
+
+        Returns:
+            Optional[List[CartRow]]: The cart rows, None if they must be read again.
+        """
+        self._sync()
+        if self.rows is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return self.rows
+
+    def set_snapshot(self, rows: List[Any]):
+        self._sync()
+        self.rows = rows
+
+
+_caches: "WeakKeyDictionary[webdriver.Chrome, CartStateCache]" = WeakKeyDictionary()
+
+
+def cart_state(driver: webdriver.Chrome) -> CartStateCache:
+    """
+    Get the cart state cache of a browser.
+
+    Args:
+        driver (WebDriver): The WebDriver instance.
+
+    Returns:
+        CartStateCache: The cache of the browser.
+    """
+    if driver not in _caches:
+        _caches[driver] = CartStateCache(command_listener(driver))
+    return _caches[driver]
@@ -0,0 +1,164 @@
+import time
+from dataclasses import dataclass
+from random import choice
+from threading import Lock
+from typing import Dict, List, Optional
+
+from selenium import webdriver
+from structlog import get_logger
+
+from tests.helpers.config import get_base_url, url_for
+
+LOGGER = get_logger(module=__name__)
+
+CATEGORIES = ("books", "digital-downloads", "cell-phones")
+
+# Catalog entries older than this are crawled again
+CATALOG_TTL = 15 * 60
+
+# Fetches and parses every category listing inside the page in one round trip
+CRAWL_SCRIPT = """
+const done = arguments[arguments.length - 1];
+const categories = arguments[0];
+
+function crawl([category, url]) {
+  return fetch(url, { credentials: 'same-origin' })
+    .then(function (response) {
+      if (!response.ok) {
+        throw new Error(url + ' returned ' + response.status);
+      }
+      return response.text();
+    })
+    .then(function (html) {
+      const page = new DOMParser().parseFromString(html, 'text/html');
+      const items = Array.from(page.querySelectorAll('.product-item'));
+      return [category, items.map(function (item) {
+        const link = item.querySelector('.product-title a');
+        return {
+          id: item.getAttribute('data-productid'),
+          name: link.textContent.trim(),
+          url: new URL(link.getAttribute('href'), url).href,
+          addable: Boolean(
+            item.querySelector('.product-box-add-to-cart-button:not([disabled])')
+          ),
+        };
+      })];
+    });
+}
+
+Promise.all(categories.map(crawl)).then(
+  function (results) { done({ products: Object.fromEntries(results) }); },
+  function (error) { done({ error: String(error) }); }
+);
+"""
+
+
+@dataclass(frozen=True)
+class CatalogProduct:
+    id: str
+    name: str
+    url: str
+    category: str
+    addable: bool
+
+
+class CatalogIndex:
+    """
+    Products of each category, crawled once and reused until they expire.
+    """
+
+    def __init__(self, ttl: float = CATALOG_TTL):
+        self.ttl = ttl
+        self.products: Dict[str, List[CatalogProduct]] = {}
+        self.base_url: Optional[str] = None
+        self.crawled_at = 0.0
+        self.crawls = 0
+        self._lock = Lock()
+
+    @property
+    def expired(self) -> bool:
+        return (
+            self.base_url != get_base_url()
+            or time.monotonic() - self.crawled_at > self.ttl
+        )
+
+    def crawl(self, driver: webdriver.Chrome):
+        """
+        Crawl every category listing with a single in-page script.
+
+        Args:
+            driver (WebDriver): The WebDriver instance.
+
+        Raises:
+            AssertionError: If a category listing cannot be fetched.
+        """
+        LOGGER.info("Crawling the product catalog", storefront=get_base_url())
+
+        # fetch() is bound to the origin of the page currently loaded
+        if not driver.current_url.startswith(get_base_url()):
+            driver.get(url_for())
+
+        result = driver.execute_async_script(
+            CRAWL_SCRIPT, [[category, url_for(category)] for category in CATEGORIES]
+        )
+        assert "error" not in result, f"Failed to crawl the catalog: {result['error']}"
+
+        self.products = {
+            category: [
+                CatalogProduct(category=category, **product) for product in products
+            ]
+            for category, products in result["products"].items()
+        }
+        self.base_url = get_base_url()
+        self.crawled_at = time.monotonic()
+        self.crawls += 1
+
+        LOGGER.info(
+            "Catalog crawled",
+            products=sum(map(len, self.products.values())),
+            categories=len(self.products),
+        )
+
+    def products_in(
+        self, driver: webdriver.Chrome, category: str
+    ) -> List[CatalogProduct]:
+        """
+        Get the products of a category, crawling the catalog if it expired.
+
+        Args:
+            driver (WebDriver): The WebDriver instance.
+            category (str): The category path, e.g. "books".
+
+        Returns:
+            List[CatalogProduct]: The products listed in the category.
+        """
+        if category not in CATEGORIES:
+            raise ValueError(f"Unexpected value for category: {category}")
+
+        with self._lock:
+            if self.expired:
+                self.crawl(driver)
+            return self.products.get(category, [])
+
+    def random_product(self, driver: webdriver.Chrome, category: str) -> CatalogProduct:
+        """
+        Pick a random product of a category that can be added to the cart.
+
+        Args:
+            driver (WebDriver): The WebDriver instance.
+            category (str): The category path, e.g. "books".
+
+        Returns:
+            CatalogProduct: The selected product.
+
+        Raises:
+            AssertionError: If no product of the category can be added to the cart.
+        """
+        products = [
+            product for product in self.products_in(driver, category) if product.addable
+        ]
+        assert products, f"No product of the {category} category can be added to cart!"
+        return choice(products)
+
+
+CATALOG = CatalogIndex()
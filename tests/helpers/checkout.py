@@ -0,0 +1,262 @@
+from typing import Dict, List, Optional
+
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.wait import WebDriverWait
+from structlog import get_logger
+
+from tests.helpers import conditions as EC
+from tests.helpers.config import url_for
+from tests.helpers.tracing import traced
+from tests.pages.checkout import (
+    BillingAddress,
+    CheckoutPage,
+    ConfirmOrder,
+    PaymentMethod,
+    ShippingAddress,
+    ShippingMethod,
+)
+
+LOGGER = get_logger(module=__name__)
+
+# One page checkout sections in order, with the page object driving each of them
+CHECKOUT_STEPS = {
+    "billing": BillingAddress,
+    "shipping": ShippingAddress,
+    "shipping_method": ShippingMethod,
+    "payment_method": PaymentMethod,
+    "payment_info": PaymentMethod,
+    "confirm_order": ConfirmOrder,
+}
+
+# Save endpoint and form of each section, the section after it is the next step
+STEP_FORMS = {
+    "billing": ("checkout/OpcSaveBilling/", "co-billing-form"),
+    "shipping": ("checkout/OpcSaveShipping/", "co-shipping-form"),
+    "shipping_method": ("checkout/OpcSaveShippingMethod/", "co-shipping-method-form"),
+    "payment_method": ("checkout/OpcSavePaymentMethod/", "co-payment-method-form"),
+    "payment_info": ("checkout/OpcSavePaymentInfo/", "co-payment-info-form"),
+}
+
+# Address field names of the utils helpers mapped to the checkout form fields
+ADDRESS_FIELDS = {
+    "first_name": "FirstName",
+    "last_name": "LastName",
+    "email": "Email",
+    "company": "Company",
+    "country": "CountryId",
+    "state": "StateProvinceId",
+    "city": "City",
+    "address1": "Address1",
+    "address2": "Address2",
+    "zip_code": "ZipPostalCode",
+    "phone_number": "PhoneNumber",
+    "fax_number": "FaxNumber",
+}
+
+SHIPPING_METHOD_OPTIONS = {
+    "ground": "shippingoption_1",
+    "next day": "shippingoption_2",
+    "2nd day": "shippingoption_3",
+}
+
+PAYMENT_METHOD_OPTIONS = {
+    "card": "paymentmethod_1",
+    "cheque": "paymentmethod_0",
+    "cash": "paymentmethod_0",
+}
+
+# Posts each step's form to its save endpoint in turn and hands every response to
+# the page's own Checkout.setStepResponse, which renders the next section exactly
+# as clicking Continue would. Fields given by option text are resolved in the form.
+FAST_FORWARD_SCRIPT = """
+const done = arguments[arguments.length - 1];
+const steps = arguments[0];
+
+function tokenOf(form) {
+  const input = (form && form.querySelector('input[name="__RequestVerificationToken"]'))
+    || document.querySelector('input[name="__RequestVerificationToken"]');
+  return input ? input.value : '';
+}
+
+function formData(form, step) {
+  step.check.forEach(function (id) {
+    const element = document.getElementById(id);
+    if (element) {
+      element.checked = true;
+    }
+  });
+
+  const data = form ? new FormData(form) : new FormData();
+  Object.entries(step.values).forEach(function ([name, value]) {
+    if (value === null) {
+      data.delete(name);
+      return;
+    }
+    const field = form && form.elements.namedItem(name);
+    if (field && field.tagName === 'SELECT') {
+      const option = Array.from(field.options).find(function (option) {
+        return option.value === value || option.text.trim() === value;
+      });
+      value = option ? option.value : value;
+    }
+    data.set(name, value);
+  });
+  if (!data.has('__RequestVerificationToken')) {
+    data.set('__RequestVerificationToken', tokenOf(form));
+  }
+  return data;
+}
+
+function save(step) {
+  const form = document.getElementById(step.form);
+  return fetch(step.url, {
+    method: 'POST',
+    body: new URLSearchParams(formData(form, step)),
+    credentials: 'same-origin',
+    headers: { 'X-Requested-With': 'XMLHttpRequest' },
+  })
+    .then(function (response) {
+      return response.json();
+    })
+    .then(function (response) {
+      if (response.error || response.redirect) {
+        throw new Error(step.name + ': ' + JSON.stringify(response));
+      }
+      Checkout.setStepResponse(response);
+      return response.goto_section;
+    });
+}
+
+steps
+  .reduce(function (chain, step) {
+    return chain.then(function () {
+      return save(step);
+    });
+  }, Promise.resolve(null))
+  .then(
+    function (section) { done({ section: section }); },
+    function (error) { done({ error: String(error) }); }
+  );
+"""
+
+
+def _address_values(prefix: str, address: Dict[str, str]) -> Dict[str, str]:
+    return {
+        f"{prefix}.{ADDRESS_FIELDS[field]}": value
+        for field, value in address.items()
+        if value
+    }
+
+
+@traced
+def fast_forward_checkout(
+    driver: webdriver,
+    wait: WebDriverWait,
+    to: str,
+    billing_address: Dict[str, str],
+    shipping_address: Optional[Dict[str, str]] = None,
+    shipping_method: str = "ground",
+    payment_method: str = "cash",
+    payment_info: Optional[Dict[str, str]] = None,
+) -> CheckoutPage:
+    """
+    Open the one page checkout and complete every step before the given one through
+    its save endpoint, then hand the step over to its page object.
+
+    The steps are posted in a single script with the browser's session, and the page
+    renders each response, so the page is left as if the steps were completed in the
+    UI.
+
+    Args:
+        driver (WebDriver): The WebDriver instance.
+        wait (WebDriverWait): The WebDriverWait instance.
+        to (str): The step to stop at, one of "billing", "shipping", "shipping_method", "payment_method", "payment_info" or "confirm_order".
+        billing_address (Dict[str, str]): The billing address, keyed like the enter_billing_address arguments.
+        shipping_address (Optional[Dict[str, str]], optional): A new shipping address, shipped to the billing address if None. Default is None.
+        shipping_method (str, optional): The shipping method, "ground", "next day" or "2nd day". Default is "ground".
+        payment_method (str, optional): The payment method, "card", "cheque" or "cash". Default is "cash".
+        payment_info (Optional[Dict[str, str]], optional): The card details posted with the payment info, keyed like the payment info form fields. Default is None.
+
+    Returns:
+        CheckoutPage: The page object of the step stopped at.
+
+    Raises:
+        ValueError: If an unexpected step, shipping method or payment method is provided.
+        AssertionError: If a step is rejected or the checkout does not reach the step.
+    """
+    if to not in CHECKOUT_STEPS:
+        raise ValueError(f"Unexpected value for checkout step: {to}")
+    if shipping_method.lower() not in SHIPPING_METHOD_OPTIONS:
+        raise ValueError(f"Unexpected value for shipping method: {shipping_method}")
+    if payment_method.lower() not in PAYMENT_METHOD_OPTIONS:
+        raise ValueError(f"Unexpected value for payment method: {payment_method}")
+
+    # Stopping at the shipping address section requires not shipping to the billing
+    # address, the section is skipped otherwise
+    ship_to_same_address = shipping_address is None and to != "shipping"
+
+    # An empty address id posts a new address instead of a saved one
+    billing = {
+        "billing_address_id": "",
+        **_address_values("BillingNewAddress", billing_address),
+    }
+    billing["ShipToSameAddress"] = "true" if ship_to_same_address else None
+    shipping = (
+        {
+            "shipping_address_id": "",
+            **_address_values("ShippingNewAddress", shipping_address),
+        }
+        if shipping_address
+        else {}
+    )
+
+    steps: List[dict] = []
+    for name, values, check in (
+        ("billing", billing, []),
+        ("shipping", shipping, []),
+        (
+            "shipping_method",
+            {},
+            [SHIPPING_METHOD_OPTIONS[shipping_method.lower()]],
+        ),
+        (
+            "payment_method",
+            {},
+            [PAYMENT_METHOD_OPTIONS[payment_method.lower()]],
+        ),
+        ("payment_info", payment_info or {}, []),
+    ):
+        if name == to:
+            break
+        if name == "shipping" and ship_to_same_address:
+            continue
+        endpoint, form = STEP_FORMS[name]
+        steps.append(
+            dict(
+                name=name,
+                url=url_for(endpoint),
+                form=form,
+                values=values,
+                check=check,
+            )
+        )
+
+    checkout_url = url_for("onepagecheckout")
+    LOGGER.info("Fast-forward the checkout", step=to, url=checkout_url)
+    driver.get(checkout_url)
+    assert (
+        driver.current_url == checkout_url
+    ), f"User is not redirected to the checkout page! Current URL: {driver.current_url}"
+
+    result = driver.execute_async_script(FAST_FORWARD_SCRIPT, steps)
+    assert "error" not in result, f"Checkout step rejected: {result['error']}"
+    assert result["section"] == (
+        to if steps else None
+    ), f"Checkout stopped at the {result['section']} step instead of the {to} step!"
+
+    # The active section is rendered by the page before the script returns
+    wait.until(EC.visibility_of_element_located((By.CSS_SELECTOR, f"#opc-{to}.active")))
+
+    LOGGER.info("Checkout fast-forwarded", step=to)
+    return CHECKOUT_STEPS[to](driver, wait)
@@ -0,0 +1,106 @@
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Callable, Iterator, List, Optional
+from weakref import WeakKeyDictionary, ref
+
+from selenium import webdriver
+from selenium.webdriver.remote.command import Command
+
+# Commands that only read the state of the browser, any other command may navigate
+# or change the page
+READ_ONLY_COMMANDS = {
+    Command.GET_CURRENT_URL,
+    Command.GET_TITLE,
+    Command.GET_PAGE_SOURCE,
+    Command.FIND_ELEMENT,
+    Command.FIND_ELEMENTS,
+    Command.FIND_CHILD_ELEMENT,
+    Command.FIND_CHILD_ELEMENTS,
+    Command.GET_ELEMENT_TEXT,
+    Command.GET_ELEMENT_TAG_NAME,
+    Command.GET_ELEMENT_ATTRIBUTE,
+    Command.GET_ELEMENT_PROPERTY,
+    Command.GET_ELEMENT_VALUE_OF_CSS_PROPERTY,
+    Command.GET_ELEMENT_RECT,
+    Command.IS_ELEMENT_SELECTED,
+    Command.IS_ELEMENT_ENABLED,
+    Command.SCREENSHOT,
+    Command.ELEMENT_SCREENSHOT,
+    Command.GET_LOG,
+    Command.GET_AVAILABLE_LOG_TYPES,
+    Command.GET_ALL_COOKIES,
+    Command.GET_COOKIE,
+    Command.GET_TIMEOUTS,
+    Command.GET_WINDOW_RECT,
+    Command.W3C_GET_CURRENT_WINDOW_HANDLE,
+    Command.W3C_GET_WINDOW_HANDLES,
+}
+
+
+class CommandListener:
+    """
+    Sees every command sent to a browser, including the element commands, by
+    wrapping the driver's execute method.
+
+    The generation counts the commands that may have navigated or changed the page,
+    state read from the page is valid as long as the generation is unchanged.
+    Observers are called with the command, its parameters and its duration in
+    seconds once it returns.
+
+    The listener only keeps a weak reference to the driver, so its entry in the
+    listeners of every browser goes away with the driver.
+    """
+
+    def __init__(self, driver: webdriver.Chrome):
+        self.generation = 0
+        self.commands = 0
+        self.observers: List[Callable[[str, dict, float], None]] = []
+        self._read_only = 0
+        self._driver = ref(driver)
+        self._execute = type(driver).execute
+        driver.execute = self.execute
+
+    def execute(self, driver_command: str, params: Optional[dict] = None):
+        self.commands += 1
+        if driver_command not in READ_ONLY_COMMANDS and not self._read_only:
+            self.generation += 1
+        if not self.observers:
+            return self._execute(self._driver(), driver_command, params)
+
+        start = perf_counter()
+        try:
+            return self._execute(self._driver(), driver_command, params)
+        finally:
+            duration = perf_counter() - start
+            for observer in self.observers:
+                observer(driver_command, params or {}, duration)
+
+    @contextmanager
+    def read_only(self) -> Iterator[None]:
+        """
+        Treat the commands sent in the block as read-only, e.g. scripts that only
+        read the page.
+        """
+        self._read_only += 1
+        try:
+            yield
+        finally:
+            self._read_only -= 1
+
+
+_listeners: "WeakKeyDictionary[webdriver.Chrome, CommandListener]" = WeakKeyDictionary()
+
+
+def command_listener(driver: webdriver.Chrome) -> CommandListener:
+    """
+    Get the command listener of a browser, installing it on first use.
+
+    Args:
+        driver (WebDriver): The WebDriver instance.
+
+    Returns:
+        CommandListener: The listener of the browser.
+    """
+    if driver not in _listeners:
+        _listeners[driver] = CommandListener(driver)
+    return _listeners[driver]
@@ -0,0 +1,275 @@
+"""
+Expected conditions that can be evaluated inside the page.
+
+Each condition mirrors its selenium.webdriver.support.expected_conditions namesake
+and stays callable with a driver, so it works with any WebDriverWait. ObserverWait
+additionally runs its JavaScript predicate in a single async script, re-evaluated
+on every DOM mutation, instead of polling chromedriver every 500 ms.
+
+Conditions not defined here are looked up in selenium's expected_conditions, so the
+module can be imported as EC in place of it.
+"""
+
+import time
+from typing import Any, Callable, Optional, Tuple
+
+from selenium.common import JavascriptException, TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions
+from selenium.webdriver.support.wait import WebDriverWait
+
+Locator = Tuple[str, str]
+
+# Locator strategies the in-page finder supports, others fall back to polling
+OBSERVABLE_STRATEGIES = {
+    By.ID,
+    By.NAME,
+    By.CLASS_NAME,
+    By.TAG_NAME,
+    By.CSS_SELECTOR,
+    By.XPATH,
+}
+
+# Re-checks the condition on every DOM mutation and, for style and layout changes
+# that do not mutate the DOM, on a short in-page interval
+OBSERVER_SCRIPT = """
+const done = arguments[arguments.length - 1];
+const [locator, extra, negate, timeout] = arguments;
+
+function find([by, value]) {
+  if (by === 'xpath') {
+    const snapshot = document.evaluate(
+      value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+    );
+    const elements = [];
+    for (let i = 0; i < snapshot.snapshotLength; i++) {
+      elements.push(snapshot.snapshotItem(i));
+    }
+    return elements;
+  }
+  const selectors = {
+    'id': '[id="' + value + '"]',
+    'name': '[name="' + value + '"]',
+    'class name': '.' + value,
+    'tag name': value,
+    'css selector': value,
+  };
+  return Array.from(document.querySelectorAll(selectors[by]));
+}
+
+function isVisible(element) {
+  if (!element.isConnected || !element.getClientRects().length) {
+    return false;
+  }
+  const style = getComputedStyle(element);
+  if (style.visibility !== 'visible' || Number(style.opacity) === 0) {
+    return false;
+  }
+  return element.checkVisibility
+    ? element.checkVisibility({ checkOpacity: true, checkVisibilityCSS: true })
+    : true;
+}
+
+const predicate = function (elements, extra) {
+  %PREDICATE%
+};
+
+function check() {
+  let result = null;
+  try {
+    result = predicate(find(locator), extra);
+  } catch (error) {
+    result = null;
+  }
+  if (negate) {
+    return result ? null : { value: true };
+  }
+  return result ? { value: result } : null;
+}
+
+const settled = check();
+if (settled) {
+  done(settled);
+  return;
+}
+
+let observer, interval, timer;
+function finish(payload) {
+  observer.disconnect();
+  clearInterval(interval);
+  clearTimeout(timer);
+  done(payload);
+}
+function recheck() {
+  const result = check();
+  if (result) {
+    finish(result);
+  }
+}
+
+observer = new MutationObserver(recheck);
+observer.observe(document, {
+  subtree: true,
+  childList: true,
+  attributes: true,
+  characterData: true,
+});
+interval = setInterval(recheck, 100);
+timer = setTimeout(function () {
+  finish({ timeout: true });
+}, timeout);
+"""
+
+
+class ObservableCondition:
+    """
+    Expected condition carrying an equivalent JavaScript predicate.
+
+    The predicate is the body of a function receiving the located elements and the
+    extra argument, returning a truthy value (returned by the wait) once it holds.
+    """
+
+    def __init__(
+        self,
+        fallback: Callable,
+        locator: Locator,
+        predicate: str,
+        extra: Optional[Any] = None,
+    ):
+        self.fallback = fallback
+        self.locator = locator
+        self.predicate = predicate
+        self.extra = extra
+
+    @property
+    def observable(self) -> bool:
+        return self.locator[0] in OBSERVABLE_STRATEGIES
+
+    @property
+    def script(self) -> str:
+        return OBSERVER_SCRIPT.replace("%PREDICATE%", self.predicate)
+
+    def __call__(self, driver):
+        return self.fallback(driver)
+
+
+def _is_locator(mark) -> bool:
+    return isinstance(mark, tuple)
+
+
+def presence_of_element_located(locator: Locator) -> ObservableCondition:
+    return ObservableCondition(
+        expected_conditions.presence_of_element_located(locator),
+        locator,
+        "return elements[0] || null;",
+    )
+
+
+def presence_of_all_elements_located(locator: Locator) -> ObservableCondition:
+    return ObservableCondition(
+        expected_conditions.presence_of_all_elements_located(locator),
+        locator,
+        "return elements.length ? elements : null;",
+    )
+
+
+def visibility_of_element_located(locator: Locator) -> ObservableCondition:
+    return ObservableCondition(
+        expected_conditions.visibility_of_element_located(locator),
+        locator,
+        "return elements[0] && isVisible(elements[0]) ? elements[0] : null;",
+    )
+
+
+def visibility_of_all_elements_located(locator: Locator) -> ObservableCondition:
+    return ObservableCondition(
+        expected_conditions.visibility_of_all_elements_located(locator),
+        locator,
+        "return elements.length && elements.every(isVisible) ? elements : null;",
+    )
+
+
+def invisibility_of_element_located(locator):
+    if not _is_locator(locator):
+        return expected_conditions.invisibility_of_element_located(locator)
+    return ObservableCondition(
+        expected_conditions.invisibility_of_element_located(locator),
+        locator,
+        "return !elements[0] || !isVisible(elements[0]);",
+    )
+
+
+def element_to_be_clickable(mark):
+    if not _is_locator(mark):
+        return expected_conditions.element_to_be_clickable(mark)
+    return ObservableCondition(
+        expected_conditions.element_to_be_clickable(mark),
+        mark,
+        (
+            "const element = elements[0]; return element && isVisible(element) &&"
+            " !element.disabled ? element : null;"
+        ),
+    )
+
+
+def text_to_be_present_in_element(locator: Locator, text: str) -> ObservableCondition:
+    return ObservableCondition(
+        expected_conditions.text_to_be_present_in_element(locator, text),
+        locator,
+        "return Boolean(elements[0] && elements[0].innerText.includes(extra));",
+        extra=text,
+    )
+
+
+def __getattr__(name: str):
+    return getattr(expected_conditions, name)
+
+
+class ObserverWait(WebDriverWait):
+    """
+    WebDriverWait resolving observable conditions in the page.
+
+    A condition defined in this module blocks in one async script until it holds, so
+    the wait returns as soon as the DOM changes instead of on the next poll, with a
+    single round trip to chromedriver. Any other callable is polled as usual.
+    """
+
+    def __init__(self, driver, timeout: float, *args, **kwargs):
+        super().__init__(driver, timeout, *args, **kwargs)
+
+        # The in-page timer ends the script, the driver's limit must not come first
+        if timeout + 1 > 30:
+            driver.set_script_timeout(timeout + 1)
+
+    def until(self, method, message: str = ""):
+        if not isinstance(method, ObservableCondition) or not method.observable:
+            return super().until(method, message)
+        return self._observe(method, False, message)
+
+    def until_not(self, method, message: str = ""):
+        if not isinstance(method, ObservableCondition) or not method.observable:
+            return super().until_not(method, message)
+        return self._observe(method, True, message)
+
+    def _observe(self, condition: ObservableCondition, negate: bool, message: str):
+        end_time = time.monotonic() + self._timeout
+        while True:
+            remaining = end_time - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutException(message)
+
+            try:
+                result = self._driver.execute_async_script(
+                    condition.script,
+                    list(condition.locator),
+                    condition.extra,
+                    negate,
+                    int(remaining * 1000),
+                )
+            except JavascriptException:
+                # The page navigated away while observing, observe the new one
+                continue
+
+            if result and "value" in result:
+                return result["value"]
+            raise TimeoutException(message)
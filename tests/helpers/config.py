@@ -0,0 +1,34 @@
+import os
+
+DEMO_BASE_URL = "https://demo.nopcommerce.com"
+
+# The storefront every page object points at, switchable with --base-url / --local-store
+_base_url = os.environ.get("STOREFRONT_BASE_URL", DEMO_BASE_URL).rstrip("/")
+
+
+def get_base_url() -> str:
+    return _base_url
+
+
+def set_base_url(base_url: str):
+    """
+    Point every page object at another storefront.
+
+    Args:
+        base_url (str): The storefront base URL, e.g. "http://127.0.0.1:8080".
+    """
+    global _base_url
+    _base_url = base_url.rstrip("/")
+
+
+def url_for(path: str = "") -> str:
+    """
+    Build an absolute storefront URL.
+
+    Args:
+        path (str, optional): The path relative to the storefront root. Default is "".
+
+    Returns:
+        str: The absolute URL, e.g. "https://demo.nopcommerce.com/cart".
+    """
+    return f"{_base_url}/{path.lstrip('/')}"
@@ -0,0 +1,147 @@
+import json
+import os
+import re
+import shutil
+import subprocess
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from time import perf_counter
+from typing import Optional
+
+from filelock import FileLock
+from structlog import get_logger
+from webdriver_manager.chrome import ChromeDriverManager
+
+LOGGER = get_logger(module=__name__)
+
+# Machine-wide cache shared by every worker and every run
+CACHE_DIR = Path(
+    os.environ.get(
+        "CHROMEDRIVER_CACHE_DIR",
+        Path.home() / ".cache" / "aviv-web-technical-test",
+    )
+)
+
+# Set to skip the webdriver-manager download entirely on a cache miss
+OFFLINE = os.environ.get("CHROMEDRIVER_OFFLINE", "").lower() in ("1", "true", "yes")
+
+CHROME_BINARIES = (
+    "google-chrome",
+    "google-chrome-stable",
+    "chromium",
+    "chromium-browser",
+    "chrome",
+)
+
+
+@dataclass(frozen=True)
+class DriverResolution:
+    path: str
+    chrome_version: Optional[str]
+    source: str
+    duration: float
+
+
+def installed_chrome_version() -> Optional[str]:
+    """
+    Detect the version of the Chrome browser installed on this machine.
+
+    Returns:
+        Optional[str]: The Chrome version, e.g. "123.0.6312.86", or None if not found.
+    """
+    for binary in CHROME_BINARIES:
+        executable = shutil.which(binary)
+        if not executable:
+            continue
+        try:
+            output = subprocess.run(
+                [executable, "--version"],
+                capture_output=True,
+                text=True,
+                timeout=10,
+            ).stdout
+        except (OSError, subprocess.SubprocessError):
+            continue
+
+        match = re.search(r"\d+(\.\d+)+", output)
+        if match:
+            return match.group(0)
+
+    return None
+
+
+def _read_index(index_path: Path) -> dict:
+    try:
+        return json.loads(index_path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _download_chromedriver() -> Optional[str]:
+    if OFFLINE:
+        return None
+    try:
+        return ChromeDriverManager().install()
+    except Exception as error:  # webdriver-manager raises a variety of errors
+        LOGGER.warning("Failed to download chromedriver", error=error)
+        return None
+
+
+@lru_cache(maxsize=None)
+def resolve_chromedriver() -> DriverResolution:
+    """
+    Resolve the chromedriver binary matching the installed Chrome.
+
+    The binary path is cached on disk keyed by the Chrome version, so the network is
+    only hit the first time a Chrome version is seen on this machine. The cache is
+    protected by a file lock so concurrent workers resolve the driver only once.
+    When the Chrome version cannot be detected, the disk cache is bypassed since a
+    cached binary could not be matched against the browser.
+    A chromedriver already on PATH is used when the download is not possible.
+
+    Returns:
+        DriverResolution: The chromedriver path and how long it took to resolve it.
+
+    Raises:
+        RuntimeError: If no chromedriver could be found.
+    """
+    start = perf_counter()
+    chrome_version = installed_chrome_version()
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    index_path = CACHE_DIR / "chromedriver.json"
+
+    with FileLock(str(CACHE_DIR / "chromedriver.lock")):
+        index = _read_index(index_path) if chrome_version else {}
+        path, source = index.get(chrome_version), "cache"
+
+        if not path or not os.path.isfile(path):
+            path, source = _download_chromedriver(), "download"
+
+            if path and chrome_version:
+                index[chrome_version] = path
+                index_path.write_text(json.dumps(index, indent=2))
+
+        if not path:
+            path, source = shutil.which("chromedriver"), "path"
+
+    if not path:
+        raise RuntimeError(
+            f"Unable to resolve a chromedriver for Chrome {chrome_version}: not cached,"
+            " not downloadable and not on PATH"
+        )
+
+    resolution = DriverResolution(
+        path=path,
+        chrome_version=chrome_version,
+        source=source,
+        duration=perf_counter() - start,
+    )
+    LOGGER.info(
+        "Resolved chromedriver",
+        source=source,
+        duration=round(resolution.duration, 3),
+        path=path,
+    )
+    return resolution
@@ -0,0 +1,365 @@
+import re
+from dataclasses import dataclass, field
+from datetime import date
+from threading import Lock
+from time import time
+from typing import Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from structlog import get_logger
+
+from tests.helpers.config import url_for
+
+LOGGER = get_logger(module=__name__)
+
+TOKEN_INPUT_PATTERN = re.compile(
+    r"<input[^>]*name=\"__RequestVerificationToken\"[^>]*>", re.IGNORECASE
+)
+VALUE_PATTERN = re.compile(r"value=\"([^\"]*)\"")
+VALIDATION_ERROR_PATTERN = re.compile(
+    r"class=\"field-validation-error\"[^>]*>\s*<span[^>]*>([^<]*)", re.IGNORECASE
+)
+SUMMARY_ERROR_PATTERN = re.compile(r"<li>([^<]*)</li>")
+CART_ITEM_PATTERN = re.compile(r"name=\"removefromcart\"[^>]*value=\"(\d+)\"")
+
+AUTHENTICATION_COOKIE = ".Nop.Authentication"
+# Refresh cookies slightly before they expire so they cannot lapse mid-test
+EXPIRY_MARGIN = 60
+# Session cookies carry no expiry, so they are only reused for the default session
+# timeout of ASP.NET after the login
+SESSION_COOKIE_MAX_AGE = 20 * 60
+
+USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko)"
+    " Chrome/123.0.0.0 Safari/537.36"
+)
+
+
+def extract_token(html: str) -> str:
+    """
+    Extract the anti-forgery token from a storefront page.
+
+    Args:
+        html (str): The page HTML.
+
+    Returns:
+        str: The __RequestVerificationToken value.
+
+    Raises:
+        AssertionError: If the page has no anti-forgery token.
+    """
+    token_input = TOKEN_INPUT_PATTERN.search(html)
+    value = VALUE_PATTERN.search(token_input.group(0)) if token_input else None
+    assert value, "No anti-forgery token found on the page!"
+    return value.group(1)
+
+
+@dataclass(frozen=True)
+class AuthCookie:
+    """
+    Authentication cookie of a logged in storefront customer.
+    """
+
+    name: str
+    value: str
+    path: str
+    secure: bool
+    expires: Optional[int]
+    logged_in_at: float = field(default_factory=time)
+
+    def expired(self, margin: float = EXPIRY_MARGIN) -> bool:
+        """
+        Check whether the cookie expires within the given margin.
+
+        Session cookies, without an expiry, are considered to expire
+        SESSION_COOKIE_MAX_AGE seconds after the login.
+
+        Args:
+            margin (float, optional): Seconds of validity required. Default is EXPIRY_MARGIN.
+
+        Returns:
+            bool: True if the cookie has to be refreshed.
+        """
+        expires = self.expires
+        if expires is None:
+            expires = self.logged_in_at + SESSION_COOKIE_MAX_AGE
+        return expires - margin <= time()
+
+    def as_selenium(self) -> dict:
+        """
+        Convert the cookie to the format accepted by WebDriver.add_cookie.
+
+        Returns:
+            dict: The cookie dictionary, scoped to the current host of the driver.
+        """
+        cookie = dict(
+            name=self.name,
+            value=self.value,
+            path=self.path,
+            secure=self.secure,
+            httpOnly=True,
+        )
+        if self.expires is not None:
+            cookie["expiry"] = self.expires
+        return cookie
+
+
+class StorefrontClient:
+    """
+    HTTP client talking to the storefront without a browser.
+
+    Every session created by the client shares the same connection pool, so
+    provisioning many accounts reuses keep-alive connections instead of opening new
+    ones for each account.
+    """
+
+    def __init__(self, pool_size: int = 10, timeout: float = 30):
+        self.timeout = timeout
+        self.adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+
+    def new_session(self) -> requests.Session:
+        """
+        Create a session with its own cookie jar on the shared connection pool.
+
+        Returns:
+            Session: The requests Session instance.
+        """
+        session = requests.Session()
+        session.mount("http://", self.adapter)
+        session.mount("https://", self.adapter)
+        session.headers["User-Agent"] = USER_AGENT
+        return session
+
+    def get_token(self, session: requests.Session, path: str) -> str:
+        """
+        Open a page and return its anti-forgery token.
+
+        Args:
+            session (Session): The requests Session instance.
+            path (str): The page path, e.g. "register".
+
+        Returns:
+            str: The __RequestVerificationToken value.
+        """
+        response = session.get(url_for(path), timeout=self.timeout)
+        response.raise_for_status()
+        return extract_token(response.text)
+
+    def register(
+        self,
+        first_name: str,
+        last_name: str,
+        email: str,
+        password: str,
+        gender: Optional[str] = None,
+        date_of_birth: Optional[date] = None,
+        company_name: Optional[str] = None,
+        subscribe_newsletter: Optional[bool] = False,
+    ) -> Tuple[str, str]:
+        """
+        Register a new user by posting the registration form directly.
+
+        Args:
+            first_name (str): User's first name.
+            last_name (str): User's last name.
+            email (str): User's email address.
+            password (str): User's password.
+            gender (Optional[str], optional): User's gender. Default is None.
+            date_of_birth (Optional[date], optional): User's date of birth. Default is None.
+            company_name (Optional[str], optional): User's company name. Default is None.
+            subscribe_newsletter (Optional[bool], optional): Subscribe to newsletter. Default is False.
+
+        Returns:
+            Tuple[str, str]: The email and password of the registered user.
+
+        Raises:
+            AssertionError: If the storefront rejects the registration.
+            RequestException: If the storefront cannot be reached.
+        """
+        LOGGER.info("Register a new user over HTTP", email=email)
+
+        with self.new_session() as session:
+            form = {
+                "FirstName": first_name,
+                "LastName": last_name,
+                "Email": email,
+                "Company": company_name or "",
+                "Password": password,
+                "ConfirmPassword": password,
+                "register-button": "",
+                "__RequestVerificationToken": self.get_token(session, "register"),
+            }
+            if gender:
+                form["Gender"] = "M" if gender.lower() == "male" else "F"
+            if date_of_birth:
+                form["DateOfBirthDay"] = str(date_of_birth.day)
+                form["DateOfBirthMonth"] = str(date_of_birth.month)
+                form["DateOfBirthYear"] = str(date_of_birth.year)
+            if subscribe_newsletter:
+                form["Newsletter"] = "true"
+
+            response = session.post(
+                url_for("register?returnUrl=%2F"), data=form, timeout=self.timeout
+            )
+            response.raise_for_status()
+
+        assert "/registerresult/" in response.url, (
+            "User registration over HTTP failed! Errors:"
+            f" {VALIDATION_ERROR_PATTERN.findall(response.text)}"
+        )
+
+        LOGGER.info("New user registered successfully over HTTP!", email=email)
+        return email, password
+
+    def login(
+        self, email: str, password: str, remember_me: Optional[bool] = False
+    ) -> AuthCookie:
+        """
+        Log in a user by posting the login form directly.
+
+        Args:
+            email (str): User's email address.
+            password (str): User's password.
+            remember_me (Optional[bool], optional): Remember the user. Default is False.
+
+        Returns:
+            AuthCookie: The authentication cookie issued by the storefront.
+
+        Raises:
+            AssertionError: If the storefront rejects the credentials.
+            RequestException: If the storefront cannot be reached.
+        """
+        LOGGER.info("Log in user over HTTP", email=email)
+
+        with self.new_session() as session:
+            form = {
+                "Email": email,
+                "Password": password,
+                "__RequestVerificationToken": self.get_token(session, "login"),
+            }
+            if remember_me:
+                form["RememberMe"] = "true"
+
+            response = session.post(
+                url_for("login?returnUrl=%2F"), data=form, timeout=self.timeout
+            )
+            response.raise_for_status()
+
+            cookie = next(
+                (c for c in session.cookies if c.name == AUTHENTICATION_COOKIE), None
+            )
+
+        assert cookie, (
+            "User login over HTTP failed! Errors:"
+            f" {SUMMARY_ERROR_PATTERN.findall(response.text)}"
+        )
+
+        LOGGER.info("User logged in successfully over HTTP!", email=email)
+        return AuthCookie(
+            name=cookie.name,
+            value=cookie.value,
+            path=cookie.path or "/",
+            secure=cookie.secure,
+            expires=cookie.expires,
+        )
+
+    def empty_cart(self, cookie: AuthCookie) -> int:
+        """
+        Remove every item from the shopping cart of a logged in user.
+
+        Args:
+            cookie (AuthCookie): The authentication cookie of the user.
+
+        Returns:
+            int: The number of cart items removed.
+
+        Raises:
+            AssertionError: If the cart still has items afterwards.
+            RequestException: If the storefront cannot be reached.
+        """
+        with self.new_session() as session:
+            session.cookies.set(cookie.name, cookie.value, path=cookie.path)
+
+            response = session.get(url_for("cart"), timeout=self.timeout)
+            response.raise_for_status()
+            item_ids = CART_ITEM_PATTERN.findall(response.text)
+            if not item_ids:
+                return 0
+
+            form = {
+                "removefromcart": item_ids,
+                "updatecart": "",
+                "__RequestVerificationToken": extract_token(response.text),
+            }
+            response = session.post(url_for("cart"), data=form, timeout=self.timeout)
+            response.raise_for_status()
+
+        assert not CART_ITEM_PATTERN.findall(
+            response.text
+        ), "Failed to empty the shopping cart over HTTP!"
+
+        LOGGER.info("Emptied the shopping cart over HTTP", items=len(item_ids))
+        return len(item_ids)
+
+    def close(self):
+        self.adapter.close()
+
+
+class AuthCookieCache:
+    """
+    Authentication cookies per account, logged in over HTTP once and reused until
+    they expire.
+    """
+
+    def __init__(self, client: Optional[StorefrontClient] = None):
+        self._client = client
+        self._cookies: Dict[str, AuthCookie] = {}
+        self._lock = Lock()
+        self.logins = 0
+        self.hits = 0
+
+    @property
+    def client(self) -> StorefrontClient:
+        if self._client is None:
+            self._client = StorefrontClient()
+        return self._client
+
+    def get(
+        self, email: str, password: str, remember_me: Optional[bool] = False
+    ) -> AuthCookie:
+        """
+        Return a valid authentication cookie for the account, logging in when the
+        cached one is missing or expired.
+
+        Args:
+            email (str): User's email address.
+            password (str): User's password.
+            remember_me (Optional[bool], optional): Remember the user. Default is False.
+
+        Returns:
+            AuthCookie: The authentication cookie.
+        """
+        with self._lock:
+            cookie = self._cookies.get(email)
+            if cookie is not None and not cookie.expired():
+                self.hits += 1
+                return cookie
+
+            cookie = self.client.login(email, password, remember_me)
+            self._cookies[email] = cookie
+            self.logins += 1
+            return cookie
+
+    def invalidate(self, email: str):
+        """
+        Drop the cached cookie of an account, e.g. after the storefront revoked it.
+
+        Args:
+            email (str): User's email address.
+        """
+        with self._lock:
+            self._cookies.pop(email, None)
+
+
+AUTH_COOKIES = AuthCookieCache()
@@ -0,0 +1,181 @@
+"""
+Structured logging backend of the suite.
+
+Log calls only build an event dict and put it on a queue; a writer thread renders the
+events as JSON lines to one file per worker. Warnings and errors are also printed to
+the console, and the events of the running test are kept so they can be attached to
+its report when it fails.
+"""
+
+import json
+import logging
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from queue import Empty, Queue
+from threading import Thread
+from typing import Dict, List, Optional, TextIO
+
+import structlog
+
+LEVELS = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warning": logging.WARNING,
+    "error": logging.ERROR,
+    "critical": logging.CRITICAL,
+}
+
+# Keys rendered before the others in the console and test log lines
+HEADER_KEYS = ("timestamp", "level", "event")
+
+
+def add_timestamp(logger, method_name: str, event_dict: Dict) -> Dict:
+    # Formatted by the writer, only the clock is read when logging
+    event_dict["timestamp"] = time.time()
+    return event_dict
+
+
+def render_line(event_dict: Dict) -> str:
+    """
+    Render an event as a key-value line.
+
+    Args:
+        event_dict (Dict): The logged event.
+
+    Returns:
+        str: The line, e.g. "12:00:00.000 [info] Add to cart category=books".
+    """
+    timestamp = datetime.fromtimestamp(event_dict.get("timestamp", 0))
+    fields = " ".join(
+        f"{key}={value}" for key, value in event_dict.items() if key not in HEADER_KEYS
+    )
+    return (
+        f"{timestamp:%H:%M:%S}.{timestamp.microsecond // 1000:03d}"
+        f" [{event_dict.get('level', 'info')}] {event_dict.get('event', '')} {fields}"
+    ).rstrip()
+
+
+def render_json(event_dict: Dict) -> str:
+    event_dict = dict(
+        event_dict,
+        timestamp=datetime.fromtimestamp(event_dict.get("timestamp", 0)).isoformat(),
+    )
+    return json.dumps(event_dict, default=str)
+
+
+class LogSink:
+    """
+    Receives the events of every logger and writes them on a background thread.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        console_level: int = logging.WARNING,
+        console: TextIO = sys.stderr,
+    ):
+        self.path = Path(path)
+        self.console_level = console_level
+        self.console = console
+        self.events = 0
+        self._queue: "Queue[Optional[Dict]]" = Queue()
+        self._slice: Optional[List[Dict]] = None
+        self._thread = Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def put(self, event_dict: Dict):
+        self.events += 1
+        if self._slice is not None:
+            self._slice.append(event_dict)
+        self._queue.put(event_dict)
+
+        if LEVELS.get(event_dict.get("level"), logging.INFO) >= self.console_level:
+            self.console.write(render_line(event_dict) + "\n")
+
+    def start_slice(self):
+        """
+        Start keeping the events logged from now on, e.g. when a test starts.
+        """
+        self._slice = []
+
+    def end_slice(self) -> List[Dict]:
+        """
+        Stop keeping the events.
+
+        Returns:
+            List[Dict]: The events logged since the slice started.
+        """
+        events, self._slice = self._slice or [], None
+        return events
+
+    def current_slice(self) -> List[Dict]:
+        return list(self._slice or [])
+
+    def _run(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("w", encoding="utf-8") as file:
+            while True:
+                event_dict = self._queue.get()
+                # Write everything already queued before flushing
+                while event_dict is not None:
+                    file.write(render_json(event_dict) + "\n")
+                    try:
+                        event_dict = self._queue.get_nowait()
+                    except Empty:
+                        break
+                file.flush()
+                if event_dict is None:
+                    return
+
+    def close(self):
+        """
+        Write every queued event and stop the writer thread.
+        """
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+
+class QueueLogger:
+    """
+    structlog logger handing the event dicts, unrendered, to the sink.
+    """
+
+    def __init__(self, sink: LogSink):
+        self._sink = sink
+
+    def msg(self, **event_dict):
+        self._sink.put(event_dict)
+
+    debug = info = warning = warn = error = critical = exception = fatal = log = msg
+
+
+def configure_logging(
+    path: Path, level: int = logging.INFO, console_level: int = logging.WARNING
+) -> LogSink:
+    """
+    Route every structlog logger to a new sink.
+
+    Args:
+        path (Path): The JSON lines file the events are written to.
+        level (int, optional): The minimum level logged. Default is INFO.
+        console_level (int, optional): The minimum level also printed to the console. Default is WARNING.
+
+    Returns:
+        LogSink: The sink, to be closed at the end of the session.
+    """
+    sink = LogSink(path, console_level)
+    structlog.configure(
+        processors=[
+            structlog.contextvars.merge_contextvars,
+            structlog.processors.add_log_level,
+            add_timestamp,
+            structlog.processors.format_exc_info,
+        ],
+        wrapper_class=structlog.make_filtering_bound_logger(level),
+        logger_factory=lambda *args: QueueLogger(sink),
+        cache_logger_on_first_use=True,
+    )
+    return sink
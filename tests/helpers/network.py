@@ -0,0 +1,311 @@
+import json
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import urlsplit
+from weakref import WeakKeyDictionary, ref
+
+from selenium import webdriver
+from selenium.common import TimeoutException, WebDriverException
+from selenium.webdriver.support.wait import WebDriverWait
+from structlog import get_logger
+from structlog.contextvars import get_contextvars
+
+LOGGER = get_logger(module=__name__)
+
+# Chrome capability enabling the DevTools network events in the performance log
+LOGGING_PREFS = {"performance": "ALL"}
+PERF_LOGGING_PREFS = {"enableNetwork": True, "enablePage": False}
+
+# Reading the performance log is a cheap chromedriver call, unlike a page poll
+POLL_INTERVAL = 0.05
+
+AJAX_RESOURCE_TYPES = ("XHR", "Fetch")
+
+
+@dataclass
+class NetworkRequest:
+    request_id: str
+    url: str
+    method: str
+    started: float
+    status: Optional[int] = None
+    server_time: Optional[float] = None
+    finished: Optional[float] = None
+    failed: bool = False
+
+    @property
+    def path(self) -> str:
+        return urlsplit(self.url).path.rstrip("/")
+
+    @property
+    def duration(self) -> Optional[float]:
+        return None if self.finished is None else self.finished - self.started
+
+
+@dataclass(frozen=True)
+class NetworkUsage:
+    requests: int
+    bytes_loaded: int
+    blocked: int
+
+    def __sub__(self, other: "NetworkUsage") -> "NetworkUsage":
+        return NetworkUsage(
+            requests=self.requests - other.requests,
+            bytes_loaded=self.bytes_loaded - other.bytes_loaded,
+            blocked=self.blocked - other.blocked,
+        )
+
+
+@dataclass(frozen=True)
+class StepTiming:
+    name: str
+    server_time: Optional[float]
+    request_time: Optional[float]
+    duration: float
+    test: Optional[str] = None
+
+
+# Timings of every checkout step of the session, summarised at the end of the run
+STEP_TIMINGS: List[StepTiming] = []
+
+
+class NetworkMonitor:
+    """
+    Tracks the XHR/fetch requests of a browser from the DevTools network events
+    Chrome writes to its performance log.
+    """
+
+    def __init__(self, driver: webdriver.Chrome):
+        # Weak, the driver is the key of this instance in the per-browser registry
+        self._driver = ref(driver)
+        self.requests: Dict[str, NetworkRequest] = {}
+        self.resource_types: Dict[str, str] = {}
+        self.available = True
+
+        # Running totals over every request of the browser, never reset
+        self.request_count = 0
+        self.bytes_loaded = 0
+        self.blocked: Counter = Counter()
+
+    @property
+    def driver(self) -> webdriver.Chrome:
+        return self._driver()
+
+    def drain(self):
+        """
+        Read the pending DevTools events and update the tracked requests.
+        """
+        if not self.available:
+            return
+        try:
+            entries = self.driver.get_log("performance")
+        except WebDriverException as error:
+            LOGGER.warning(
+                "Performance log unavailable, network events ignored", error=error
+            )
+            self.available = False
+            return
+
+        for entry in entries:
+            self._handle(json.loads(entry["message"])["message"])
+
+    def _handle(self, message: dict):
+        method = message["method"]
+        params = message.get("params", {})
+
+        if method == "Network.requestWillBeSent":
+            self.request_count += 1
+            self.resource_types[params["requestId"]] = params.get("type", "Other")
+            if params.get("type") in AJAX_RESOURCE_TYPES:
+                self.requests[params["requestId"]] = NetworkRequest(
+                    request_id=params["requestId"],
+                    url=params["request"]["url"],
+                    method=params["request"]["method"],
+                    started=params["timestamp"],
+                )
+            return
+
+        if method == "Network.loadingFinished":
+            self.bytes_loaded += int(params.get("encodedDataLength", 0))
+        elif method == "Network.loadingFailed" and params.get("blockedReason"):
+            resource_type = self.resource_types.get(params["requestId"], "Other")
+            self.blocked[resource_type] += 1
+
+        request = self.requests.get(params.get("requestId"))
+        if request is None:
+            return
+
+        if method == "Network.responseReceived":
+            response = params["response"]
+            request.status = response.get("status")
+            timing = response.get("timing")
+            if timing:
+                # Time between the request being sent and the response headers
+                request.server_time = (
+                    timing["receiveHeadersEnd"] - timing["sendEnd"]
+                ) / 1000
+        elif method == "Network.loadingFinished":
+            request.finished = params["timestamp"]
+        elif method == "Network.loadingFailed":
+            request.finished = params["timestamp"]
+            request.failed = True
+
+    def reset(self):
+        """
+        Forget every request seen so far, including the pending events.
+        """
+        self.drain()
+        self.requests.clear()
+        self.resource_types.clear()
+
+    def usage(self) -> NetworkUsage:
+        """
+        Get the running totals of the requests made by the browser.
+
+        Returns:
+            NetworkUsage: The number of requests, bytes loaded and requests blocked.
+        """
+        self.drain()
+        return NetworkUsage(
+            requests=self.request_count,
+            bytes_loaded=self.bytes_loaded,
+            blocked=sum(self.blocked.values()),
+        )
+
+    def wait_for_request(
+        self, endpoint: str, timeout: float
+    ) -> Optional[NetworkRequest]:
+        """
+        Wait for a request to the given endpoint to complete.
+
+        Args:
+            endpoint (str): The end of the request path, e.g. "OpcSaveBilling".
+            timeout (float): Seconds to wait for.
+
+        Returns:
+            Optional[NetworkRequest]: The completed request, or None when the
+                performance log is unavailable.
+
+        Raises:
+            TimeoutException: If the request did not complete in time.
+        """
+        end_time = time.monotonic() + timeout
+        while True:
+            self.drain()
+            if not self.available:
+                return None
+
+            for request in self.requests.values():
+                if request.finished is not None and request.path.endswith(endpoint):
+                    return request
+
+            if time.monotonic() > end_time:
+                raise TimeoutException(
+                    f"Request to {endpoint} did not complete within {timeout}s"
+                )
+            time.sleep(POLL_INTERVAL)
+
+
+_monitors: "WeakKeyDictionary[webdriver.Chrome, NetworkMonitor]" = WeakKeyDictionary()
+
+
+def network_monitor(driver: webdriver.Chrome) -> NetworkMonitor:
+    """
+    Get the network monitor of a browser, the performance log can only have one
+    reader since reading it drains it.
+
+    Args:
+        driver (WebDriver): The WebDriver instance.
+
+    Returns:
+        NetworkMonitor: The monitor of the browser.
+    """
+    if driver not in _monitors:
+        _monitors[driver] = NetworkMonitor(driver)
+    return _monitors[driver]
+
+
+@contextmanager
+def checkout_step(
+    driver: webdriver.Chrome,
+    wait: WebDriverWait,
+    name: str,
+    endpoint: str,
+    rendered,
+    timeout: float = 10,
+) -> Iterator[None]:
+    """
+    Wait for the one-page-checkout step triggered in the block to complete.
+
+    The step is complete once its AJAX request has finished and the next section
+    is rendered. Its timing is logged and recorded in STEP_TIMINGS.
+
+    Args:
+        driver (WebDriver): The WebDriver instance.
+        wait (WebDriverWait): The WebDriverWait instance.
+        name (str): The step name used in the report.
+        endpoint (str): The end of the step request path, e.g. "OpcSaveBilling".
+        rendered: Expected condition holding once the next section is rendered.
+        timeout (float, optional): Seconds to wait for the request. Default is 10.
+
+    Raises:
+        AssertionError: If the step request failed.
+        TimeoutException: If the step did not complete in time.
+    """
+    monitor = network_monitor(driver)
+    monitor.reset()
+    started = time.monotonic()
+
+    yield
+
+    request = monitor.wait_for_request(endpoint, timeout)
+    assert request is None or not (request.failed or (request.status or 0) >= 400), (
+        f"Checkout step {name} failed! Request {request.method} {request.url}"
+        f" returned status {request.status}"
+    )
+    wait.until(rendered)
+
+    timing = StepTiming(
+        name=name,
+        server_time=request.server_time if request else None,
+        request_time=request.duration if request else None,
+        duration=time.monotonic() - started,
+        test=get_contextvars().get("test"),
+    )
+    STEP_TIMINGS.append(timing)
+
+    LOGGER.info(
+        "Checkout step completed",
+        step=name,
+        duration=timing.duration,
+        server_time=timing.server_time,
+    )
+
+
+def summarise_step_timings(timings: List[StepTiming]) -> Dict[str, Dict[str, float]]:
+    """
+    Average the timings of each checkout step.
+
+    Args:
+        timings (List[StepTiming]): The recorded step timings.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Per step name, the number of runs and the mean
+            server time and step duration in seconds.
+    """
+    grouped: Dict[str, List[StepTiming]] = defaultdict(list)
+    for timing in timings:
+        grouped[timing.name].append(timing)
+
+    summary = {}
+    for name, runs in grouped.items():
+        server_times = [run.server_time for run in runs if run.server_time is not None]
+        summary[name] = {
+            "runs": len(runs),
+            "server_time": sum(server_times) / len(server_times) if server_times else 0,
+            "duration": sum(run.duration for run in runs) / len(runs),
+        }
+    return summary
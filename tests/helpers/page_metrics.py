@@ -0,0 +1,259 @@
+"""
+Navigation timing and Web Vitals of every storefront page the suite loads.
+
+A script added to every new document observes the paint and layout shift entries of
+the page and, when the page is left, stores its metrics in the session storage of
+the storefront. The stored visits are drained after each test and tagged with the
+page object registered for their URL.
+"""
+
+import json
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+from weakref import WeakKeyDictionary, ref
+
+from selenium import webdriver
+from selenium.common import WebDriverException
+from structlog import get_logger
+
+from tests.helpers.commands import command_listener
+
+LOGGER = get_logger(module=__name__)
+
+# Runs before any script of the page. The metrics are read when the page is hidden,
+# the last moment the entries of a page that navigates away are available.
+PAGE_METRICS_SCRIPT = """
+(function () {
+  if (window.__pageMetrics) {
+    return;
+  }
+  const KEY = '__pageMetrics';
+  const state = { lcp: null, cls: 0, collected: false };
+  window.__pageMetrics = state;
+
+  try {
+    new PerformanceObserver(function (list) {
+      const entries = list.getEntries();
+      state.lcp = entries[entries.length - 1].startTime;
+    }).observe({ type: 'largest-contentful-paint', buffered: true });
+    new PerformanceObserver(function (list) {
+      list.getEntries().forEach(function (entry) {
+        if (!entry.hadRecentInput) {
+          state.cls += entry.value;
+        }
+      });
+    }).observe({ type: 'layout-shift', buffered: true });
+  } catch (error) {}
+
+  window.__collectPageMetrics = function () {
+    state.collected = true;
+    const navigation = performance.getEntriesByType('navigation')[0];
+    const paints = {};
+    performance.getEntriesByType('paint').forEach(function (entry) {
+      paints[entry.name] = entry.startTime;
+    });
+    const resources = performance.getEntriesByType('resource');
+    return {
+      url: location.href,
+      started: performance.timeOrigin / 1000,
+      ttfb: navigation ? navigation.responseStart : null,
+      dom_content_loaded: navigation ? navigation.domContentLoadedEventEnd : null,
+      load: navigation && navigation.loadEventEnd ? navigation.loadEventEnd : null,
+      transfer_size: navigation ? navigation.transferSize : null,
+      first_contentful_paint: paints['first-contentful-paint'] || null,
+      largest_contentful_paint: state.lcp,
+      cumulative_layout_shift: state.cls,
+      resources: resources.length,
+      resource_bytes: resources.reduce(function (total, entry) {
+        return total + (entry.transferSize || 0);
+      }, 0),
+      resources_end: resources.reduce(function (end, entry) {
+        return Math.max(end, entry.responseEnd);
+      }, 0),
+    };
+  };
+
+  window.addEventListener('pagehide', function () {
+    if (state.collected || location.protocol.indexOf('http') !== 0) {
+      return;
+    }
+    const visits = JSON.parse(sessionStorage.getItem(KEY) || '[]');
+    visits.push(window.__collectPageMetrics());
+    sessionStorage.setItem(KEY, JSON.stringify(visits));
+  });
+})();
+"""
+
+# Returns the visits stored by the previous pages and the metrics of the current one
+DRAIN_PAGE_METRICS_SCRIPT = """
+let visits = [];
+try {
+  visits = JSON.parse(sessionStorage.getItem('__pageMetrics') || '[]');
+  sessionStorage.removeItem('__pageMetrics');
+} catch (error) {}
+if (
+  window.__collectPageMetrics
+  && !window.__pageMetrics.collected
+  && location.protocol.indexOf('http') === 0
+) {
+  visits.push(window.__collectPageMetrics());
+}
+return visits;
+"""
+
+
+@dataclass(frozen=True)
+class PageVisit:
+    url: str
+    page: Optional[str]
+    test: Optional[str]
+    started: float
+    ttfb: Optional[float]
+    dom_content_loaded: Optional[float]
+    load: Optional[float]
+    transfer_size: Optional[int]
+    first_contentful_paint: Optional[float]
+    largest_contentful_paint: Optional[float]
+    cumulative_layout_shift: float
+    resources: int
+    resource_bytes: int
+    resources_end: float
+
+
+# Page object class of each storefront path, registered by the page objects
+PAGE_CLASSES: Dict[str, str] = {}
+
+# Visits of every page of the session, written at the end of the run
+PAGE_VISITS: List[PageVisit] = []
+
+
+def _path(url: str) -> str:
+    return urlsplit(url).path.rstrip("/") or "/"
+
+
+def register_page(url: str, page: str):
+    """
+    Tag the visits of a URL with a page object class.
+
+    Args:
+        url (str): The page URL.
+        page (str): The page object class name, e.g. "ShoppingCartPage".
+    """
+    PAGE_CLASSES[_path(url)] = page
+
+
+class PageMetricsCollector:
+    """
+    Collects the page visits of a browser.
+    """
+
+    def __init__(self, driver: webdriver.Chrome):
+        # Collectors are looked up by their driver, which they must not keep alive
+        self._driver = ref(driver)
+        self.available = True
+        try:
+            driver.execute_cdp_cmd(
+                "Page.addScriptToEvaluateOnNewDocument", {"source": PAGE_METRICS_SCRIPT}
+            )
+        except WebDriverException as error:
+            LOGGER.warning("Page metrics unavailable, visits ignored", error=error.msg)
+            self.available = False
+
+    @property
+    def driver(self) -> webdriver.Chrome:
+        return self._driver()
+
+    def drain(self, test: Optional[str] = None) -> List[PageVisit]:
+        """
+        Read the visits since the last drain, including the page currently loaded.
+
+        Args:
+            test (Optional[str], optional): The node id of the test the visits belong to. Default is None.
+
+        Returns:
+            List[PageVisit]: The visits, also recorded in PAGE_VISITS.
+        """
+        if not self.available:
+            return []
+        try:
+            with command_listener(self.driver).read_only():
+                records = self.driver.execute_script(DRAIN_PAGE_METRICS_SCRIPT)
+        except WebDriverException as error:
+            LOGGER.warning("Failed to read the page metrics", error=error.msg)
+            return []
+
+        visits = [
+            PageVisit(page=PAGE_CLASSES.get(_path(record["url"])), test=test, **record)
+            for record in records or []
+        ]
+        PAGE_VISITS.extend(visits)
+        return visits
+
+
+_collectors: "WeakKeyDictionary[webdriver.Chrome, PageMetricsCollector]" = (
+    WeakKeyDictionary()
+)
+
+
+def page_metrics(driver: webdriver.Chrome) -> PageMetricsCollector:
+    """
+    Get the page metrics collector of a browser, installing it on first use.
+
+    Only the documents loaded after the installation are measured.
+
+    Args:
+        driver (WebDriver): The WebDriver instance.
+
+    Returns:
+        PageMetricsCollector: The collector of the browser.
+    """
+    if driver not in _collectors:
+        _collectors[driver] = PageMetricsCollector(driver)
+    return _collectors[driver]
+
+
+def write_page_visits(path: Path, visits: List[PageVisit]):
+    """
+    Write the page visits as JSON lines.
+
+    Args:
+        path (Path): The metrics file.
+        visits (List[PageVisit]): The recorded visits.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("".join(json.dumps(asdict(visit)) + "\n" for visit in visits))
+
+
+def summarise_page_visits(visits: List[PageVisit]) -> Dict[str, Dict[str, float]]:
+    """
+    Average the timings of the visits of each page object.
+
+    Args:
+        visits (List[PageVisit]): The recorded visits.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Per page object, the number of visits and the
+            mean time to first byte, load and largest contentful paint in milliseconds.
+    """
+    grouped: Dict[str, List[PageVisit]] = defaultdict(list)
+    for visit in visits:
+        grouped[visit.page or _path(visit.url)].append(visit)
+
+    def mean(values: List[Optional[float]]) -> float:
+        values = [value for value in values if value is not None]
+        return sum(values) / len(values) if values else 0
+
+    return {
+        page: {
+            "visits": len(runs),
+            "ttfb": mean([run.ttfb for run in runs]),
+            "load": mean([run.load for run in runs]),
+            "largest_contentful_paint": mean(
+                [run.largest_contentful_paint for run in runs]
+            ),
+        }
+        for page, runs in grouped.items()
+    }
@@ -0,0 +1,91 @@
+import os
+from secrets import token_hex
+from typing import Dict, List
+
+import pytest
+from faker import Faker
+
+# pytest cache key holding the durations recorded by previous runs
+DURATIONS_CACHE_KEY = "parallel/durations"
+
+
+def worker_id() -> str:
+    """
+    Get the id of the pytest-xdist worker running this process.
+
+    Returns:
+        str: The worker id, e.g. "gw0", or "master" when not running in parallel.
+    """
+    return os.environ.get("PYTEST_XDIST_WORKER", "master")
+
+
+def is_xdist_worker(config: pytest.Config) -> bool:
+    return hasattr(config, "workerinput")
+
+
+def new_namespace() -> str:
+    """
+    Create a data namespace unique to this worker and run.
+
+    Returns:
+        str: The namespace, e.g. "gw0-1a2b3c".
+    """
+    return f"{worker_id()}-{token_hex(3)}"
+
+
+def namespaced_email(fake: Faker, namespace: str) -> str:
+    """
+    Generate an email address that cannot collide with the ones of other workers.
+
+    Args:
+        fake (Faker): The Faker instance.
+        namespace (str): The data namespace of the worker.
+
+    Returns:
+        str: The email address.
+    """
+    return f"{namespace}.{fake.user_name()}@{fake.free_email_domain()}"
+
+
+def order_by_duration(items: List[pytest.Item], durations: Dict[str, float]):
+    """
+    Order test items longest first using the durations of previous runs.
+
+    Tests without a recorded duration are considered the longest so that new tests
+    are never left to the end of the run.
+
+    Args:
+        items (List[Item]): The collected test items, sorted in place.
+        durations (Dict[str, float]): Durations in seconds keyed by node id.
+    """
+    longest = max(durations.values(), default=0.0)
+    items.sort(
+        key=lambda item: durations.get(item.nodeid, longest + 1),
+        reverse=True,
+    )
+
+
+class DurationRecorder:
+    """
+    pytest plugin recording per-test durations (setup, call and teardown) of the run
+    into the pytest cache, where the next parallel run picks them up for scheduling.
+    """
+
+    def __init__(self, config: pytest.Config):
+        self.config = config
+        self.durations: Dict[str, float] = {}
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport):
+        if report.when in ("setup", "call", "teardown"):
+            self.durations[report.nodeid] = (
+                self.durations.get(report.nodeid, 0.0) + report.duration
+            )
+
+    def pytest_sessionfinish(self):
+        # Only the controller sees the reports of every worker
+        if is_xdist_worker(self.config) or getattr(self.config, "cache", None) is None:
+            return
+
+        durations = self.config.cache.get(DURATIONS_CACHE_KEY, {})
+        durations.update(self.durations)
+        self.config.cache.set(DURATIONS_CACHE_KEY, durations)
@@ -0,0 +1,281 @@
+"""
+WebDriver command profiler.
+
+Every command sent to the browser is recorded against the running test with its
+duration, its locator and the suite code that sent it, read from the call stack.
+Commands sent from inside a wait count as waiting, any other as acting on the page.
+Only the commands whose number does not depend on timing are compared with the
+baseline: those the test itself sends, without the retries of a wait, the log polls
+and the commands of the fixtures set up or torn down around it.
+"""
+
+import json
+import sys
+from collections import Counter, defaultdict
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from types import FrameType
+from typing import Dict, List, Optional, Tuple
+
+from filelock import FileLock
+
+TESTS_DIR = Path(__file__).resolve().parent.parent
+
+# Suite modules that only relay commands, left out of the recorded call stacks
+RELAY_MODULES = {
+    str(Path(__file__).resolve()),
+    str(TESTS_DIR / "helpers" / "commands.py"),
+    str(TESTS_DIR / "helpers" / "tracing.py"),
+}
+
+WAIT_FUNCTIONS = {"until", "until_not"}
+
+# Slowest commands listed in the summary of each test
+TOP_SLOWEST = 5
+
+FIND_COMMANDS = {"findElement", "findElements", "findChildElement", "findChildElements"}
+
+# Commands polled on a timer, e.g. the DevTools log reads of the network monitor
+POLLED_COMMANDS = {"getLog"}
+
+
+class CommandCountExceeded(AssertionError):
+    pass
+
+
+@dataclass(frozen=True)
+class CommandRecord:
+    command: str
+    locator: Optional[str]
+    duration: float
+    caller: str
+    stack: Tuple[str, ...]
+    waiting: bool
+    phase: str = "call"
+
+    @property
+    def counted(self) -> bool:
+        # The number of polls, of retries of a wait and of the commands of module
+        # fixtures set up before or torn down after the test depends on timing and
+        # test order
+        return (
+            self.phase == "call"
+            and not self.waiting
+            and self.command not in POLLED_COMMANDS
+        )
+
+
+@dataclass
+class TestProfile:
+    nodeid: str
+    records: List[CommandRecord] = field(default_factory=list)
+
+    @property
+    def commands(self) -> int:
+        return len(self.records)
+
+    @property
+    def counted_commands(self) -> int:
+        return sum(1 for record in self.records if record.counted)
+
+    @property
+    def wait_time(self) -> float:
+        return sum(record.duration for record in self.records if record.waiting)
+
+    @property
+    def action_time(self) -> float:
+        return sum(record.duration for record in self.records if not record.waiting)
+
+    def summary(self) -> Dict:
+        """
+        Summarise the commands of the test.
+
+        Returns:
+            Dict: The command counts, the time spent waiting and acting, and the
+                slowest commands.
+        """
+        slowest = sorted(self.records, key=lambda record: record.duration, reverse=True)
+        return {
+            "nodeid": self.nodeid,
+            "commands": self.commands,
+            "counted_commands": self.counted_commands,
+            "wait_time": round(self.wait_time, 3),
+            "action_time": round(self.action_time, 3),
+            "by_command": dict(
+                Counter(record.command for record in self.records).most_common()
+            ),
+            "slowest": [
+                {key: value for key, value in asdict(record).items() if key != "stack"}
+                for record in slowest[:TOP_SLOWEST]
+            ],
+        }
+
+    def folded(self) -> List[str]:
+        """
+        Export the commands as folded stacks, the input of flamegraph.pl and
+        speedscope.
+
+        Returns:
+            List[str]: One "test;caller;...;command microseconds" line per stack.
+        """
+        durations: Dict[str, float] = defaultdict(float)
+        for record in self.records:
+            frames = (self.nodeid.split("::")[-1],) + record.stack + (record.command,)
+            durations[";".join(frames)] += record.duration
+        return [
+            f"{stack} {round(duration * 1_000_000)}"
+            for stack, duration in durations.items()
+        ]
+
+
+@lru_cache(maxsize=None)
+def is_suite_file(filename: str) -> bool:
+    path = str(Path(filename).resolve())
+    return path.startswith(str(TESTS_DIR)) and path not in RELAY_MODULES
+
+
+def frame_name(frame: FrameType) -> str:
+    code = frame.f_code
+    qualname = getattr(code, "co_qualname", None)
+    if qualname:
+        return qualname
+    owner = frame.f_locals.get("self")
+    return f"{type(owner).__name__}.{code.co_name}" if owner else code.co_name
+
+
+def locator_of(command: str, params: Dict) -> Optional[str]:
+    if command in FIND_COMMANDS:
+        return f"{params.get('using')}={params.get('value')}"
+    # The in-page waits pass their locator as the first script argument
+    args = params.get("args") or []
+    if args and isinstance(args[0], list) and len(args[0]) == 2:
+        if all(isinstance(part, str) for part in args[0]):
+            return f"{args[0][0]}={args[0][1]}"
+    return None
+
+
+class CommandProfiler:
+    """
+    Records the commands of every browser it observes against the running test.
+    """
+
+    def __init__(self):
+        self.profiles: Dict[str, TestProfile] = {}
+        self.current: Optional[TestProfile] = None
+        # The pytest phase of the running test, "setup", "call" or "teardown"
+        self.phase = "setup"
+
+    def start(self, nodeid: str):
+        self.current = self.profiles.setdefault(nodeid, TestProfile(nodeid))
+        self.phase = "setup"
+
+    def stop(self) -> Optional[TestProfile]:
+        profile, self.current = self.current, None
+        return profile
+
+    def record(self, command: str, params: Dict, duration: float):
+        if self.current is None:
+            return
+
+        stack: List[str] = []
+        waiting = False
+        frame = sys._getframe(1)
+        while frame is not None:
+            code = frame.f_code
+            if code.co_name in WAIT_FUNCTIONS:
+                waiting = True
+            if is_suite_file(code.co_filename):
+                stack.append(frame_name(frame))
+            frame = frame.f_back
+
+        # The test function itself is the root of every folded stack
+        stack.reverse()
+        if stack and stack[0] == self.current.nodeid.split("::")[-1].split("[")[0]:
+            stack = stack[1:]
+
+        self.current.records.append(
+            CommandRecord(
+                command=command,
+                locator=locator_of(command, params),
+                duration=duration,
+                caller=stack[-1] if stack else "<fixture>",
+                stack=tuple(stack),
+                waiting=waiting,
+                phase=self.phase,
+            )
+        )
+
+    def write(self, directory: Path, name: str):
+        """
+        Write the test summaries as JSON and the folded stacks of every test.
+
+        Args:
+            directory (Path): The profiles directory.
+            name (str): The file name stem, e.g. the worker id.
+        """
+        directory.mkdir(parents=True, exist_ok=True)
+        profiles = list(self.profiles.values())
+        (directory / f"{name}.json").write_text(
+            json.dumps([profile.summary() for profile in profiles], indent=2)
+        )
+        (directory / f"{name}.folded").write_text(
+            "".join(f"{line}\n" for profile in profiles for line in profile.folded())
+        )
+
+
+def load_baseline(path: Path) -> Dict[str, int]:
+    """
+    Load the command count baseline of each test.
+
+    Args:
+        path (Path): The baseline JSON file.
+
+    Returns:
+        Dict[str, int]: Test node ids mapped to their baseline command count, empty if
+            the file does not exist.
+    """
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def update_baseline(path: Path, profiles: List[TestProfile]):
+    """
+    Store the counted commands of the tests as their new baseline, keeping the
+    counts of the tests that did not run.
+
+    Args:
+        path (Path): The baseline JSON file, shared by every worker.
+        profiles (List[TestProfile]): The profiles of the tests that ran.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with FileLock(f"{path}.lock"):
+        baseline = load_baseline(path)
+        baseline.update(
+            {profile.nodeid: profile.counted_commands for profile in profiles}
+        )
+        path.write_text(json.dumps(dict(sorted(baseline.items())), indent=2) + "\n")
+
+
+def regression(
+    profile: TestProfile, baseline: Dict[str, int], tolerance: float
+) -> Optional[str]:
+    """
+    Compare the counted commands of a test with its baseline.
+
+    Args:
+        profile (TestProfile): The profile of the test.
+        baseline (Dict[str, int]): The baseline command counts.
+        tolerance (float): The fraction of extra commands allowed, e.g. 0.1.
+
+    Returns:
+        Optional[str]: The regression message, None if within the baseline.
+    """
+    expected = baseline.get(profile.nodeid)
+    if expected is None or profile.counted_commands <= expected * (1 + tolerance):
+        return None
+    return (
+        f"{profile.nodeid} sent {profile.counted_commands} counted WebDriver"
+        f" commands, above its baseline of {expected} (+{tolerance:.0%} tolerance)"
+    )
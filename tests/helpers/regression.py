@@ -0,0 +1,310 @@
+"""
+Performance regression gate.
+
+Compares the durations of tests and of their helper steps with a baseline. The change
+of the median is bracketed by a bootstrap confidence interval, and a test or step only
+regresses when the whole interval is above the tolerance, so a noisy sample does not
+fail the gate. A series with too few samples to bracket the change is reported but not
+gated. Only the cart and checkout scenarios are gated, the others are reported.
+"""
+
+import json
+import random
+import statistics
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pytest
+from filelock import FileLock
+
+from tests.helpers.benchmark import percentile
+from tests.helpers.parallel import is_xdist_worker
+
+# Test, or test and step, with its samples
+Series = Tuple[str, Optional[str]]
+
+GATED_PATTERNS = ("cart_functionality", "checkout")
+BOOTSTRAP_RESAMPLES = 2000
+
+# Samples of each series kept in the baseline, the oldest are dropped first
+BASELINE_SAMPLES = 20
+
+# Samples needed before a series is gated, a single sample has no interval to speak of
+MIN_BASELINE_SAMPLES = 5
+MIN_HEAD_SAMPLES = 3
+
+TABLE_ROWS = 15
+
+
+@dataclass(frozen=True)
+class Delta:
+    test: str
+    step: Optional[str]
+    base: float
+    head: float
+    change: float
+    low: float
+    high: float
+    regressed: bool
+    insufficient: bool = False
+
+    @property
+    def gated(self) -> bool:
+        return any(pattern in self.test for pattern in GATED_PATTERNS)
+
+
+def bootstrap_change(
+    base: List[float],
+    head: List[float],
+    confidence: float = 0.95,
+    resamples: int = BOOTSTRAP_RESAMPLES,
+) -> Tuple[float, float, float]:
+    """
+    Estimate the relative change of the median between two sets of samples.
+
+    Args:
+        base (List[float]): The baseline samples.
+        head (List[float]): The samples compared.
+        confidence (float, optional): The confidence level of the interval. Default is 0.95.
+        resamples (int, optional): The number of bootstrap resamples. Default is 2000.
+
+    Returns:
+        Tuple[float, float, float]: The change, e.g. 0.1 for 10% slower, and the low
+            and high bounds of its confidence interval.
+    """
+    # Seeded so that the same samples always give the same verdict
+    generator = random.Random(0)
+    changes = [
+        statistics.median(generator.choices(head, k=len(head)))
+        / statistics.median(generator.choices(base, k=len(base)))
+        - 1
+        for _ in range(resamples)
+    ]
+    tail = (1 - confidence) / 2 * 100
+    return (
+        statistics.median(head) / statistics.median(base) - 1,
+        percentile(changes, tail),
+        percentile(changes, 100 - tail),
+    )
+
+
+def compare(
+    base: Dict[Series, List[float]],
+    head: Dict[Series, List[float]],
+    tolerance: float,
+    confidence: float = 0.95,
+    min_base: int = MIN_BASELINE_SAMPLES,
+    min_head: int = 1,
+) -> List[Delta]:
+    """
+    Compare every series measured in both the baseline and the head.
+
+    Args:
+        base (Dict[Series, List[float]]): The baseline samples.
+        head (Dict[Series, List[float]]): The samples compared.
+        tolerance (float): The relative slowdown allowed, e.g. 0.1.
+        confidence (float, optional): The confidence level of the intervals. Default is 0.95.
+        min_base (int, optional): The baseline samples needed to gate a series. Default is 5.
+        min_head (int, optional): The compared samples needed to gate a series. Default is 1.
+
+    Returns:
+        List[Delta]: The changes, regressions first, then the fastest growing, the
+            series with insufficient samples last.
+    """
+    deltas = []
+    for series, samples in head.items():
+        baseline = base.get(series)
+        if not samples or not baseline or statistics.median(baseline) <= 0:
+            continue
+        change, low, high = bootstrap_change(baseline, samples, confidence)
+        insufficient = len(baseline) < min_base or len(samples) < min_head
+        deltas.append(
+            Delta(
+                test=series[0],
+                step=series[1],
+                base=statistics.median(baseline),
+                head=statistics.median(samples),
+                change=change,
+                low=low,
+                high=high,
+                regressed=not insufficient and low > tolerance,
+                insufficient=insufficient,
+            )
+        )
+    return sorted(
+        deltas,
+        key=lambda delta: (delta.insufficient, not delta.regressed, -delta.change),
+    )
+
+
+def format_table(deltas: List[Delta], rows: int = TABLE_ROWS) -> List[str]:
+    """
+    Format the changes as a compact table.
+
+    Args:
+        deltas (List[Delta]): The changes, in display order.
+        rows (int, optional): The maximum number of rows. Default is 15.
+
+    Returns:
+        List[str]: The table lines.
+    """
+    lines = [f"{'test':44} {'step':28} {'base':>8} {'head':>8} {'change':>8}  interval"]
+    for delta in deltas[:rows]:
+        verdict = "REGRESSED" if delta.regressed else ""
+        if delta.regressed and not delta.gated:
+            verdict += " (not gated)"
+        if delta.insufficient:
+            verdict = "insufficient samples"
+        lines.append(
+            f"{delta.test[-44:]:44} {(delta.step or '-')[:28]:28}"
+            f" {delta.base:>8.3f} {delta.head:>8.3f} {delta.change:>+8.1%}"
+            f"  [{delta.low:+.1%}, {delta.high:+.1%}] {verdict}".rstrip()
+        )
+    if len(deltas) > rows:
+        lines.append(f"... {len(deltas) - rows} more")
+    return lines
+
+
+def run_series(run: Dict) -> Dict[Series, List[float]]:
+    """
+    Get the samples of a benchmark run.
+
+    Args:
+        run (Dict): The benchmark run of the history.
+
+    Returns:
+        Dict[Series, List[float]]: The samples of every scenario and step.
+    """
+    series: Dict[Series, List[float]] = {}
+    for scenario, result in run["scenarios"].items():
+        series[(scenario, None)] = result["samples"]
+        for step, step_result in result["steps"].items():
+            series[(scenario, step)] = step_result["samples"]
+    return series
+
+
+def load_duration_baseline(path: Path) -> Dict[Series, List[float]]:
+    """
+    Load the duration samples of each test and step.
+
+    Args:
+        path (Path): The baseline JSON file.
+
+    Returns:
+        Dict[Series, List[float]]: The samples, empty if the file does not exist.
+    """
+    if not path.exists():
+        return {}
+    series: Dict[Series, List[float]] = {}
+    for test, recorded in json.loads(path.read_text()).items():
+        series[(test, None)] = recorded["duration"]
+        for step, samples in recorded["steps"].items():
+            series[(test, step)] = samples
+    return series
+
+
+def update_duration_baseline(path: Path, series: Dict[Series, List[float]]):
+    """
+    Add the samples of a run to the baseline, keeping the latest ones of each series.
+
+    Args:
+        path (Path): The baseline JSON file.
+        series (Dict[Series, List[float]]): The samples of the run.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with FileLock(f"{path}.lock"):
+        baseline = load_duration_baseline(path)
+        for key, samples in series.items():
+            baseline[key] = (baseline.get(key, []) + samples)[-BASELINE_SAMPLES:]
+
+        recorded: Dict[str, Dict] = defaultdict(lambda: {"duration": [], "steps": {}})
+        for (test, step), samples in sorted(
+            baseline.items(), key=lambda item: (item[0][0], item[0][1] or "")
+        ):
+            if step is None:
+                recorded[test]["duration"] = samples
+            else:
+                recorded[test]["steps"][step] = samples
+        path.write_text(json.dumps(recorded, indent=2) + "\n")
+
+
+class RegressionGate:
+    """
+    pytest plugin comparing the call durations of the passed tests, and of their steps,
+    with a baseline and failing the run on a regression of a gated test.
+    """
+
+    def __init__(
+        self, config: pytest.Config, path: Path, tolerance: float, update: bool
+    ):
+        self.config = config
+        self.path = path
+        self.tolerance = tolerance
+        self.update = update
+        self.series: Dict[Series, List[float]] = defaultdict(list)
+        self.durations: Dict[str, float] = {}
+        self.failed = set()
+        self.deltas: List[Delta] = []
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport):
+        if report.failed:
+            self.failed.add(report.nodeid)
+        # Only the call is timed, the setup and teardown acquire the browser and the
+        # account and start the module fixtures, which depends on the test order
+        if report.when == "call" and report.passed:
+            self.durations[report.nodeid] = report.duration
+        # Tests skipped or failed are not sampled
+        if (
+            report.when != "teardown"
+            or report.nodeid in self.failed
+            or report.nodeid not in self.durations
+        ):
+            return
+
+        self.series[(report.nodeid, None)].append(self.durations.pop(report.nodeid))
+        # Recorded by the worker that ran the test, the reports carry them over
+        for key, value in report.user_properties:
+            if key == "step_durations":
+                for step, duration in value.items():
+                    self.series[(report.nodeid, step)].append(duration)
+
+    def pytest_sessionfinish(self, session: pytest.Session):
+        # Only the controller sees the reports of every worker
+        if is_xdist_worker(self.config) or not self.series:
+            return
+
+        if self.update:
+            update_duration_baseline(self.path, self.series)
+            return
+
+        self.deltas = compare(
+            load_duration_baseline(self.path), self.series, self.tolerance
+        )
+        if any(delta.regressed and delta.gated for delta in self.deltas):
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.deltas:
+            return
+        terminalreporter.write_sep("-", "performance regressions")
+        for line in format_table(self.deltas):
+            terminalreporter.write_line(line)
+        insufficient = sum(delta.insufficient for delta in self.deltas)
+        if insufficient:
+            terminalreporter.write_line(
+                f"{insufficient} series with fewer than {MIN_BASELINE_SAMPLES} baseline"
+                " samples, not gated"
+            )
+        regressions = [
+            delta for delta in self.deltas if delta.regressed and delta.gated
+        ]
+        if regressions:
+            terminalreporter.write_line(
+                (
+                    f"{len(regressions)} gated regressions beyond {self.tolerance:.0%},"
+                    " failing the run"
+                ),
+                red=True,
+            )
@@ -0,0 +1,217 @@
+"""
+Timing spans of the helper flows and page object actions.
+
+Every traced helper and action opens a span, nested in the span of its caller, which
+is also reported as an Allure step. The spans of the session are exported in the
+Chrome trace event format, which chrome://tracing, Perfetto and speedscope open.
+"""
+
+import inspect
+import json
+import os
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import wraps
+from pathlib import Path
+from threading import get_ident
+from typing import Dict, Iterator, List, Optional
+
+import allure
+from structlog.contextvars import get_contextvars
+
+
+@dataclass(frozen=True)
+class Span:
+    name: str
+    kind: str
+    start: float
+    duration: float
+    depth: int
+    test: Optional[str]
+    thread: int
+    error: Optional[str] = None
+
+
+class Tracer:
+    """
+    Records the spans of the session.
+    """
+
+    def __init__(self):
+        self.spans: List[Span] = []
+        self._depth = 0
+
+    @contextmanager
+    def span(self, name: str, kind: str = "action") -> Iterator[None]:
+        """
+        Time the block as a span, reported as an Allure step of the running test.
+
+        Args:
+            name (str): The span and step name.
+            kind (str, optional): "helper" or "action". Default is "action".
+        """
+        depth = self._depth
+        self._depth += 1
+        start = time.time()
+        started = time.perf_counter()
+        error = None
+        try:
+            with allure.step(name):
+                yield
+        except BaseException as exception:
+            error = type(exception).__name__
+            raise
+        finally:
+            self._depth = depth
+            self.spans.append(
+                Span(
+                    name=name,
+                    kind=kind,
+                    start=start,
+                    duration=time.perf_counter() - started,
+                    depth=depth,
+                    test=get_contextvars().get("test"),
+                    thread=get_ident(),
+                    error=error,
+                )
+            )
+
+    def trace_events(self, process_name: str) -> List[Dict]:
+        """
+        Convert the spans to Chrome trace events.
+
+        Args:
+            process_name (str): The name of the process in the viewer, e.g. the worker id.
+
+        Returns:
+            List[Dict]: One complete ("X") event per span, timed in microseconds.
+        """
+        pid = os.getpid()
+        events = [
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": pid,
+                "args": {"name": process_name},
+            }
+        ]
+        for span in self.spans:
+            args = {"test": span.test}
+            if span.error:
+                args["error"] = span.error
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": span.kind,
+                    "ph": "X",
+                    "ts": round(span.start * 1_000_000),
+                    "dur": round(span.duration * 1_000_000),
+                    "pid": pid,
+                    "tid": span.thread,
+                    "args": args,
+                }
+            )
+        return events
+
+    def write(self, path: Path, process_name: str):
+        """
+        Write the spans as a Chrome trace file.
+
+        Args:
+            path (Path): The trace JSON file.
+            process_name (str): The name of the process in the viewer, e.g. the worker id.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            json.dumps(
+                {
+                    "traceEvents": self.trace_events(process_name),
+                    "displayTimeUnit": "ms",
+                }
+            )
+        )
+
+
+# Spans of every traced helper and action of the session
+TRACER = Tracer()
+
+
+def traced(func):
+    """
+    Record every call of a helper as a span named after it.
+    """
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with TRACER.span(func.__name__, kind="helper"):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def _traced_action(name: str, method):
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with TRACER.span(f"{type(self).__name__}.{name}"):
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+def traced_actions(cls):
+    """
+    Record every call of the public methods a page object class defines as a span
+    named after the page and the method.
+    """
+    for name, member in list(vars(cls).items()):
+        if not name.startswith("_") and inspect.isfunction(member):
+            setattr(cls, name, _traced_action(name, member))
+    return cls
+
+
+def summarise_spans(spans: List[Span], kind: str = "helper") -> Dict[str, Dict]:
+    """
+    Average the duration of the spans of each name.
+
+    Args:
+        spans (List[Span]): The recorded spans.
+        kind (str, optional): The kind of spans summarised. Default is "helper".
+
+    Returns:
+        Dict[str, Dict]: Per span name, the number of calls and their mean and total
+            duration in seconds, slowest total first.
+    """
+    grouped: Dict[str, List[float]] = defaultdict(list)
+    for span in spans:
+        if span.kind == kind:
+            grouped[span.name].append(span.duration)
+
+    summary = {
+        name: {
+            "calls": len(durations),
+            "mean": sum(durations) / len(durations),
+            "total": sum(durations),
+        }
+        for name, durations in grouped.items()
+    }
+    return dict(sorted(summary.items(), key=lambda item: -item[1]["total"]))
+
+
+def step_durations(spans: List[Span], test: str) -> Dict[str, float]:
+    """
+    Total the duration of each helper of a test.
+
+    Args:
+        spans (List[Span]): The recorded spans.
+        test (str): The node id of the test.
+
+    Returns:
+        Dict[str, float]: The total duration in seconds of each helper the test called.
+    """
+    durations: Dict[str, float] = defaultdict(float)
+    for span in spans:
+        if span.kind == "helper" and span.test == test:
+            durations[span.name] += span.duration
+    return dict(durations)
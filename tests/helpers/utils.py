@@ -1,14 +1,20 @@
 from datetime import date
-from random import randint
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple, Union
 
+from requests import RequestException
 from selenium import webdriver
 from selenium.common import TimeoutException
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.wait import WebDriverWait
 from structlog import get_logger
 
-from tests.pages.cart import ShoppingCartPage
+from tests.helpers import conditions as EC
+from tests.helpers.cart import cart_state, post_add_to_cart
+from tests.helpers.catalog import CATALOG, CatalogProduct
+from tests.helpers.config import get_base_url, url_for
+from tests.helpers.http_client import AUTH_COOKIES
+from tests.helpers.network import checkout_step
+from tests.helpers.tracing import traced
+from tests.pages.cart import CartRow, ShoppingCartPage
 from tests.pages.checkout import (
     BillingAddress,
     ConfirmOrder,
@@ -17,16 +23,13 @@ from tests.pages.checkout import (
     ShippingMethod,
 )
 from tests.pages.login import LoginPage
-from tests.pages.products import (
-    BooksProductCategoryPage,
-    CellPhonesProductCategoryPage,
-    DigitalDownloadsProductCategoryPage,
-)
+from tests.pages.products import ProductPage
 from tests.pages.register import RegisterPage
 
 LOGGER = get_logger(module=__name__)
 
 
+@traced
 def register_user(
     driver: webdriver,
     wait: WebDriverWait,
@@ -65,23 +68,32 @@ def register_user(
     register_page = RegisterPage(driver, wait)
     register_page.click_register_page()
     LOGGER.info(
-        f"Successfully navigated to the user registration page - {driver.current_url}"
+        "Successfully navigated to the user registration page", url=register_page.url
     )
 
     LOGGER.info("Fill in the user registration form")
-    register_page.enter_first_name(first_name)
-    register_page.enter_last_name(last_name)
-    register_page.enter_email(email)
-    register_page.enter_password(password)
-    register_page.enter_confirm_password(confirm_password)
+    form = dict(
+        first_name=first_name,
+        last_name=last_name,
+        email=email,
+        password=password,
+        confirm_password=confirm_password,
+    )
     if gender:
-        register_page.select_gender(gender)
+        if gender.lower() not in ("male", "female"):
+            raise ValueError("Unexpected value for gender!")
+        form[f"gender_{gender.lower()}"] = True
     if date_of_birth:
-        register_page.enter_date_of_birth(date_of_birth)
+        form.update(
+            day_of_birth=str(date_of_birth.day),
+            month_of_birth=str(date_of_birth.month),
+            year_of_birth=str(date_of_birth.year),
+        )
     if company_name:
-        register_page.enter_company_name(company_name)
+        form["company_name"] = company_name
     if subscribe_newsletter:
-        register_page.click_newsletter()
+        form["newsletter"] = True
+    register_page.fill(form)
 
     LOGGER.info("Filled in the user registration form")
 
@@ -102,36 +114,50 @@ def register_user(
             f" {driver.current_url}"
         )
 
-        LOGGER.info(f"New user with email: {email} registered successfully!")
+        LOGGER.info("New user registered successfully!", email=email)
         register_page.click_continue()
     except TimeoutException:
         LOGGER.error("User registration failed!")
 
 
+@traced
 def login_user(
     driver: webdriver,
     wait: WebDriverWait,
     email: str,
     password: str,
     remember_me: Optional[bool] = False,
+    via_ui: Optional[bool] = False,
 ):
     """
     Log in a user with the provided credentials.
 
+    By default the authentication cookie is obtained over HTTP (once per account,
+    until it expires) and injected into the browser. Tests about the login flow
+    itself should pass via_ui=True to go through the login page.
+
     Args:
         driver (WebDriver): The WebDriver instance.
         wait (WebDriverWait): The WebDriverWait instance.
         email (str): User's email address.
         password (str): User's password.
         remember_me (Optional[bool], optional): Remember the user. Default is False.
+        via_ui (Optional[bool], optional): Log in through the login page. Default is False.
 
     Raises:
         AssertionError: If the user login fails.
     """
-    LOGGER.info(f"Perform user login with email {email}")
+    if not via_ui:
+        try:
+            if inject_login_cookie(driver, wait, email, password, remember_me):
+                return
+        except RequestException as error:
+            LOGGER.warning("HTTP login failed, falling back to the UI", error=error)
+
+    LOGGER.info("Perform user login", email=email)
     login_page = LoginPage(driver, wait)
 
-    LOGGER.info(f"Navigate to the login page - {login_page.url}")
+    LOGGER.info("Navigate to the login page", url=login_page.url)
     login_page.open()
 
     LOGGER.info("Successfully navigated to the login page!")
@@ -153,6 +179,54 @@ def login_user(
     LOGGER.info("User logged in successfully!")
 
 
+@traced
+def inject_login_cookie(
+    driver: webdriver,
+    wait: WebDriverWait,
+    email: str,
+    password: str,
+    remember_me: Optional[bool] = False,
+) -> bool:
+    """
+    Log in a user by injecting a cached authentication cookie into the browser.
+
+    Args:
+        driver (WebDriver): The WebDriver instance.
+        wait (WebDriverWait): The WebDriverWait instance.
+        email (str): User's email address.
+        password (str): User's password.
+        remember_me (Optional[bool], optional): Remember the user. Default is False.
+
+    Returns:
+        bool: True if the user is logged in, False if the storefront rejected the cookie.
+
+    Raises:
+        AssertionError: If the storefront rejects the credentials.
+        RequestException: If the storefront cannot be reached.
+    """
+    LOGGER.info("Perform user login using a session cookie", email=email)
+    cookie = AUTH_COOKIES.get(email, password, remember_me)
+
+    # Cookies can only be added for the domain the browser is currently on
+    if not driver.current_url.startswith(get_base_url()):
+        driver.get(url_for())
+    driver.add_cookie(cookie.as_selenium())
+    driver.get(url_for())
+
+    try:
+        wait.until(
+            EC.visibility_of_element_located(LoginPage(driver, wait).logout_button)
+        )
+    except TimeoutException:
+        LOGGER.warning("Session cookie was rejected by the storefront", email=email)
+        AUTH_COOKIES.invalidate(email)
+        return False
+
+    LOGGER.info("User logged in successfully with the session cookie!")
+    return True
+
+
+@traced
 def enter_billing_address(
     driver: webdriver,
     wait: WebDriverWait,
@@ -191,44 +265,51 @@ def enter_billing_address(
         ship_to_same_address (Optional[bool], optional): Ship to the same address. Default is False.
 
     Raises:
-        TimeoutException: If the continue button is still clickable after the form submission.
+        TimeoutException: If the next checkout section does not load in time.
     """
     LOGGER.info("Enter billing address")
     billing_address = BillingAddress(driver, wait)
 
+    # Enter a new address even if the customer saved some on earlier checkouts
+    billing_address.select_new_billing_address()
+
     # Choose whether to ship to the same address
     if ship_to_same_address:
         billing_address.click_ship_to_same_address()
     else:
         billing_address.uncheck_ship_to_same_address()
 
-    # Fill in the billing address details
-    billing_address.enter_first_name(first_name)
-    billing_address.enter_last_name(last_name)
-    billing_address.enter_email(email)
-    billing_address.select_country(country)
-    billing_address.enter_city(city)
-    billing_address.enter_address1(address1)
-    billing_address.enter_zip_postal_code(zip_code)
-    billing_address.enter_phone_number(phone_number)
-
-    # Fill in optional details
-    if company:
-        billing_address.enter_company(company)
-    if state:
-        billing_address.select_state(state)
-    if address2:
-        billing_address.enter_address2(address2)
-    if fax_number:
-        billing_address.enter_fax_number(fax_number)
-
-    # Click Continue button and wait for it to become unclickable
-    billing_address.click_continue()
-    wait.until_not(EC.element_to_be_clickable(billing_address.continue_button))
+    # Fill in the billing address details, skipping the optional ones not provided
+    address = dict(
+        first_name=first_name,
+        last_name=last_name,
+        email=email,
+        country=country,
+        city=city,
+        address1=address1,
+        zip_code=zip_code,
+        phone_number=phone_number,
+        company=company,
+        state=state,
+        address2=address2,
+        fax_number=fax_number,
+    )
+    billing_address.fill({field: value for field, value in address.items() if value})
+
+    # Click Continue button and wait for the next section to load
+    with checkout_step(
+        driver,
+        wait,
+        "billing address",
+        "OpcSaveBilling",
+        EC.invisibility_of_element_located(billing_address.please_wait),
+    ):
+        billing_address.click_continue()
 
     LOGGER.info("Billing address entered successfully")
 
 
+@traced
 def enter_shipping_address(
     driver: webdriver,
     wait: WebDriverWait,
@@ -267,7 +348,7 @@ def enter_shipping_address(
         fax_number (Optional[str], optional): User's fax number. Default is None.
 
     Raises:
-        TimeoutException: If the continue button is still clickable after the form submission.
+        TimeoutException: If the next checkout section does not load in time.
     """
 
     LOGGER.info("Enter shipping address")
@@ -276,35 +357,43 @@ def enter_shipping_address(
     if add_new_address:
         # Select to add a new shipping address
         shipping_address.select_new_shipping_address()
-        shipping_address.enter_first_name(first_name)
-        shipping_address.enter_last_name(last_name)
-        shipping_address.enter_email(email)
-        shipping_address.select_country(country)
-        shipping_address.enter_city(city)
-        shipping_address.enter_address1(address1)
-        shipping_address.enter_zip_postal_code(zip_code)
-        shipping_address.enter_phone_number(phone_number)
-
-        # Fill in optional details for a new shipping address
-        if company:
-            shipping_address.enter_company(company)
-        if state:
-            shipping_address.select_state(state)
-        if address2:
-            shipping_address.enter_address2(address2)
-        if fax_number:
-            shipping_address.enter_fax_number(fax_number)
+
+        # Fill in the new shipping address, skipping the optional details not provided
+        address = dict(
+            first_name=first_name,
+            last_name=last_name,
+            email=email,
+            country=country,
+            city=city,
+            address1=address1,
+            zip_code=zip_code,
+            phone_number=phone_number,
+            company=company,
+            state=state,
+            address2=address2,
+            fax_number=fax_number,
+        )
+        shipping_address.fill(
+            {field: value for field, value in address.items() if value}
+        )
     else:
         # Select an existing billing address
         shipping_address.select_billing_address()
 
-    # Click Continue button and wait for it to become unclickable
-    shipping_address.click_continue()
-    wait.until_not(EC.element_to_be_clickable(shipping_address.continue_button))
+    # Click Continue button and wait for the next section to load
+    with checkout_step(
+        driver,
+        wait,
+        "shipping address",
+        "OpcSaveShipping",
+        EC.invisibility_of_element_located(shipping_address.please_wait),
+    ):
+        shipping_address.click_continue()
 
     LOGGER.info("Shipping address entered successfully")
 
 
+@traced
 def select_shipping_method(
     driver: webdriver,
     wait: WebDriverWait,
@@ -320,7 +409,7 @@ def select_shipping_method(
 
     Raises:
         ValueError: If an unexpected value for shipping_method is provided.
-        TimeoutException: If the continue button is still clickable after the form submission.
+        TimeoutException: If the next checkout section does not load in time.
     """
     LOGGER.info("Select shipping method")
     shipping_method_page = ShippingMethod(driver, wait)
@@ -339,15 +428,20 @@ def select_shipping_method(
     else:
         raise ValueError(f"Unexpected value for shipping method: {shipping_method}")
 
-    # Click Continue button and wait for it to become unclickable
-    shipping_method_page.click_continue()
-    wait.until_not(
-        EC.element_to_be_clickable(shipping_method_page.shipping_method_continue_button)
-    )
+    # Click Continue button and wait for the next section to load
+    with checkout_step(
+        driver,
+        wait,
+        "shipping method",
+        "OpcSaveShippingMethod",
+        EC.invisibility_of_element_located(shipping_method_page.please_wait),
+    ):
+        shipping_method_page.click_continue()
 
     LOGGER.info("Shipping method selected successfully")
 
 
+@traced
 def select_payment_method(
     driver: webdriver,
     wait: WebDriverWait,
@@ -375,7 +469,7 @@ def select_payment_method(
 
     Raises:
         ValueError: If an unexpected value for payment_method is provided.
-        TimeoutException: If the continue button is still clickable after the form submission.
+        TimeoutException: If the next checkout section does not load in time.
     """
     LOGGER.info("Select payment method")
     payment_method_page = PaymentMethod(driver, wait)
@@ -396,23 +490,46 @@ def select_payment_method(
         card_code = card_code.ljust(3, "0")[:3]
         payment_method_page.enter_card_code(card_code)
 
-        payment_method_page.click_continue()
+        with checkout_step(
+            driver,
+            wait,
+            "payment method",
+            "OpcSavePaymentMethod",
+            EC.invisibility_of_element_located(
+                payment_method_page.payment_method_please_wait
+            ),
+        ):
+            payment_method_page.click_continue()
 
     elif payment_method.lower() in ("cheque", "cash"):
         payment_method_page.select_cheque_or_cash_on_payment_method()
-        payment_method_page.click_continue()
-        payment_method_page.click_continue_for_cheque_or_cash()
+        with checkout_step(
+            driver,
+            wait,
+            "payment method",
+            "OpcSavePaymentMethod",
+            EC.invisibility_of_element_located(
+                payment_method_page.payment_method_please_wait
+            ),
+        ):
+            payment_method_page.click_continue()
+        with checkout_step(
+            driver,
+            wait,
+            "payment info",
+            "OpcSavePaymentInfo",
+            EC.invisibility_of_element_located(
+                payment_method_page.payment_info_please_wait
+            ),
+        ):
+            payment_method_page.click_continue_for_cheque_or_cash()
     else:
         raise ValueError(f"Unexpected value for payment method: {payment_method}")
 
-    # Wait for the continue button to become unclickable after the form submission
-    wait.until_not(
-        EC.element_to_be_clickable(payment_method_page.payment_method_continue_button)
-    )
-
     LOGGER.info("Payment method selected successfully")
 
 
+@traced
 def confirm_order(driver: webdriver, wait: WebDriverWait):
     """
     Confirm the order on the confirmation order page.
@@ -423,11 +540,18 @@ def confirm_order(driver: webdriver, wait: WebDriverWait):
 
     Raises:
         AssertionError: If the order confirmation fails or the success message is not as expected.
-        TimeoutException: If the continue button is still clickable after the form submission.
+        TimeoutException: If the next checkout section does not load in time.
     """
     LOGGER.info("Confirm order")
     confirm_order_page = ConfirmOrder(driver, wait)
-    confirm_order_page.click_confirm_order()
+    with checkout_step(
+        driver,
+        wait,
+        "confirm order",
+        "OpcConfirmOrder",
+        EC.visibility_of_element_located(confirm_order_page.success_message_text),
+    ):
+        confirm_order_page.click_confirm_order()
 
     # Verify the order success message
     order_success_message = confirm_order_page.get_success_message_text()
@@ -438,200 +562,167 @@ def confirm_order(driver: webdriver, wait: WebDriverWait):
         f"Actual success message: {order_success_message}"
     )
 
-    # Click continue button and wait for it to become unclickable
+    # Click continue button and wait for the order completed page to be left
     confirm_order_page.click_order_completed_continue()
-    wait.until_not(
-        EC.element_to_be_clickable(confirm_order_page.order_completed_continue_button)
+    wait.until(
+        EC.invisibility_of_element_located(
+            confirm_order_page.order_completed_continue_button
+        )
     )
 
     LOGGER.info("Order confirmed successfully")
 
 
-def add_book_to_cart(
+@traced
+def add_product_to_cart(
     driver: webdriver,
     wait: WebDriverWait,
-    return_product_name: bool = False,
-) -> Optional[str]:
+    product: CatalogProduct,
+    quantity: int = 1,
+) -> str:
     """
-    Navigate to the book product category page, select a random product,
-    add it to the shopping cart, and optionally return the product name.
+    Open a product page and add the product to the shopping cart through the UI.
 
     Args:
         driver (WebDriver): The WebDriver instance.
         wait (WebDriverWait): The WebDriverWait instance.
-        return_product_name (bool, optional): Whether to return the added product's name. Default is False.
+        product (CatalogProduct): The product from the catalog index.
+        quantity (int, optional): The quantity to add. Default is 1.
 
     Returns:
-        Optional[str]: The product name if return_product_name is True, else None.
+        str: The name of the added product.
 
     Raises:
-        AssertionError: If the user is not redirected to the cell phone product category page,
+        AssertionError: If the user is not redirected to the product page,
         or if the product is not added to the shopping cart.
     """
+    product_page = ProductPage(driver, wait, product.url)
 
-    books_page = BooksProductCategoryPage(driver, wait)
-
-    LOGGER.info(f"Navigate to the Books product category page - {books_page.url}")
-    books_page.open()
-    assert driver.current_url == books_page.url, (
-        "User is not redirected to the Books product category page!"
+    LOGGER.info(
+        "Navigate to the product page",
+        category=product.category,
+        url=product_page.url,
+    )
+    product_page.open()
+    assert driver.current_url == product_page.url, (
+        f"User is not redirected to the {product.category} product page!"
         f" Current URL: {driver.current_url}"
     )
 
-    LOGGER.info("Successfully navigated to the Books product category page")
-
-    # Click on a random product and add to cart
-    products_elm = wait.until(
-        EC.visibility_of_all_elements_located(books_page.product_item_button)
+    LOGGER.info(
+        "Add the product to the shopping cart",
+        category=product.category,
+        quantity=quantity,
     )
-    product_index = randint(0, len(products_elm) - 1)
-    products_elm[product_index].click()
-    books_page.click_add_to_cart_button()
+    if quantity != 1:
+        product_page.enter_quantity(quantity)
+    product_page.click_add_to_cart_button()
 
     # Verify the product is added to the shopping cart
     assert (
-        books_page.product_added_to_cart_message
-        in books_page.get_product_added_to_cart_message()
+        product_page.product_added_to_cart_message
+        in product_page.get_product_added_to_cart_message()
     ), "Product was not added to the shopping cart!"
-    books_page.click_product_add_to_cart_message_close_button()
+    product_page.click_product_add_to_cart_message_close_button()
 
     # Get the product name
-    product_name = books_page.get_product_name()
-
-    LOGGER.info(
-        f"Product titled '{product_name}' successfully added to the shopping cart"
-    )
+    product_name = product_page.get_product_name()
 
-    if return_product_name:
-        return product_name
+    LOGGER.info("Product successfully added to the shopping cart", product=product_name)
+    return product_name
 
 
-def add_digital_download_item_to_cart(
+@traced
+def add_item_to_cart(
     driver: webdriver,
     wait: WebDriverWait,
+    category: str,
     return_product_name: bool = False,
 ) -> Optional[str]:
     """
-    Navigate to the digital download product category page, select a random product,
-    add it to the shopping cart, and optionally return the product name.
+    Open a random product of a category straight from the catalog index, add it to
+    the shopping cart, and optionally return the product name.
 
     Args:
         driver (WebDriver): The WebDriver instance.
         wait (WebDriverWait): The WebDriverWait instance.
+        category (str): The product category path, e.g. "books", "digital-downloads" or "cell-phones".
         return_product_name (bool, optional): Whether to return the added product's name. Default is False.
 
     Returns:
         Optional[str]: The product name if return_product_name is True, else None.
 
     Raises:
-        AssertionError: If the user is not redirected to the cell phone product category page,
+        AssertionError: If the user is not redirected to the product page,
         or if the product is not added to the shopping cart.
     """
-    digital_download_product_page = DigitalDownloadsProductCategoryPage(driver, wait)
-
-    LOGGER.info(
-        "Navigate to the digital downloads product category page -"
-        f" {digital_download_product_page.url}"
-    )
-    digital_download_product_page.open()
-    assert driver.current_url == digital_download_product_page.url, (
-        "User is not redirected to the digital downloads product category page!"
-        f" Current URL: {driver.current_url}"
-    )
-
-    LOGGER.info("Navigated to the digital downloads product category page")
-
-    LOGGER.info("Add a digital download item to the shopping cart")
-
-    # Click on a random product and add to cart
-    products_elm = wait.until(
-        EC.visibility_of_all_elements_located(
-            digital_download_product_page.product_item_button
-        )
-    )
-    product_index = randint(0, len(products_elm) - 1)
-    products_elm[product_index].click()
-    digital_download_product_page.click_add_to_cart_button()
-
-    # Verify the product is added to the shopping cart
-    assert (
-        digital_download_product_page.product_added_to_cart_message
-        in digital_download_product_page.get_product_added_to_cart_message()
-    ), "Product was not added to the shopping cart!"
-    digital_download_product_page.click_product_add_to_cart_message_close_button()
-
-    # Get the product name
-    product_name = digital_download_product_page.get_product_name()
-
-    LOGGER.info(
-        f"Product titled '{product_name}' successfully added to the shopping cart"
-    )
+    product = CATALOG.random_product(driver, category)
+    product_name = add_product_to_cart(driver, wait, product)
 
     if return_product_name:
         return product_name
 
 
-def add_cellphone_item_to_cart(
-    driver: webdriver, wait: WebDriverWait, return_product_name: bool = False
-) -> Optional[str]:
+@traced
+def seed_cart(
+    driver: webdriver,
+    wait: WebDriverWait,
+    items: List[Tuple[Union[str, CatalogProduct], int]],
+    via_ui: Optional[bool] = False,
+) -> List[str]:
     """
-    Navigate to the cell phone product category page, select a random product,
-    add it to the shopping cart, and optionally return the product name.
+    Add several products to the shopping cart in one batch.
+
+    By default the items are posted straight to the AJAX add-to-cart endpoint with
+    the browser's session, without opening any product page. Tests about adding
+    products to the cart should pass via_ui=True.
 
     Args:
         driver (WebDriver): The WebDriver instance.
         wait (WebDriverWait): The WebDriverWait instance.
-        return_product_name (bool, optional): Whether to return the added product's name. Default is False.
+        items (List[Tuple[Union[str, CatalogProduct], int]]): Products, or category paths to pick a random product from, with the quantity to add.
+        via_ui (Optional[bool], optional): Add the products through their product pages. Default is False.
 
     Returns:
-        Optional[str]: The product name if return_product_name is True, else None.
+        List[str]: The names of the added products, in the order of the items.
 
     Raises:
-        AssertionError: If the user is not redirected to the cell phone product category page,
-        or if the product is not added to the shopping cart.
-    """
-
-    cellphone_product_page = CellPhonesProductCategoryPage(driver, wait)
+        AssertionError: If a product is not added to the shopping cart.
+    """
+    products = [
+        (
+            (
+                CATALOG.random_product(driver, product)
+                if isinstance(product, str)
+                else product
+            ),
+            quantity,
+        )
+        for product, quantity in items
+    ]
+
+    if via_ui:
+        return [
+            add_product_to_cart(driver, wait, product, quantity)
+            for product, quantity in products
+        ]
+
+    LOGGER.info("Seed the shopping cart", products=len(products))
+    results = post_add_to_cart(driver, products)
+    for (product, quantity), result in zip(products, results):
+        assert result.get("success"), (
+            f"Product '{product.name}' was not added to the shopping cart!"
+            f" Response: {result}"
+        )
 
+    product_names = [product.name for product, _ in products]
     LOGGER.info(
-        "Navigate to the cell phone product category page -"
-        f" {cellphone_product_page.url}"
+        "Products successfully added to the shopping cart", products=product_names
     )
-    cellphone_product_page.open()
-    assert driver.current_url == cellphone_product_page.url, (
-        "User is not redirected to the cell phone product category page!"
-        f" Current URL: {driver.current_url}"
-    )
-    LOGGER.info("Successfully navigated to the cell phone product category page")
-
-    LOGGER.info("Add a cell phone item to the shopping cart")
-
-    # Click on a random product and add to cart
-    products_elm = wait.until(
-        EC.visibility_of_all_elements_located(
-            cellphone_product_page.product_item_button
-        )
-    )
-    product_index = randint(0, len(products_elm) - 1)
-    products_elm[product_index].click()
-    cellphone_product_page.click_add_to_cart_button()
-
-    # Verify the product is added to the shopping cart
-    assert (
-        cellphone_product_page.product_added_to_cart_message
-        in cellphone_product_page.get_product_added_to_cart_message()
-    ), "Product was not added to the shopping cart!"
-    cellphone_product_page.click_product_add_to_cart_message_close_button()
-
-    # Get the product name
-    product_name = cellphone_product_page.get_product_name()
-
-    LOGGER.info(f"Product titled '{product_name}' added to the shopping cart")
-
-    if return_product_name:
-        return product_name
+    return product_names
 
 
+@traced
 def open_cart(driver: webdriver, wait: WebDriverWait) -> ShoppingCartPage:
     """
     Open the shopping cart page and verify the navigation.
@@ -648,11 +739,15 @@ def open_cart(driver: webdriver, wait: WebDriverWait) -> ShoppingCartPage:
     """
 
     shopping_cart_page = ShoppingCartPage(driver, wait)
-    shopping_cart_url = "https://demo.nopcommerce.com/cart"
+
+    # Nothing was sent to the browser since it was last seen on the cart page
+    cache = cart_state(driver)
+    if cache.page() == shopping_cart_page.url:
+        return shopping_cart_page
 
     # Open the shopping cart page if the current URL is different
-    if driver.current_url != shopping_cart_url:
-        LOGGER.info(f"Navigate to the shopping cart page - {shopping_cart_page.url}")
+    if driver.current_url != shopping_cart_page.url:
+        LOGGER.info("Navigate to the shopping cart page", url=shopping_cart_page.url)
         shopping_cart_page.open()
 
         assert driver.current_url == shopping_cart_page.url, (
@@ -668,9 +763,11 @@ def open_cart(driver: webdriver, wait: WebDriverWait) -> ShoppingCartPage:
             f" Current URL: {driver.current_url}"
         )
 
+    cache.set_page(shopping_cart_page.url)
     return shopping_cart_page
 
 
+@traced
 def list_products_in_cart(driver: webdriver, wait: WebDriverWait) -> List[str]:
     """
     List the products in the shopping cart.
@@ -686,7 +783,10 @@ def list_products_in_cart(driver: webdriver, wait: WebDriverWait) -> List[str]:
     return shopping_cart_page.list_products_in_cart()
 
 
-def get_product_quantity(driver: webdriver, wait: WebDriverWait, product_name: str):
+@traced
+def get_product_quantity(
+    driver: webdriver, wait: WebDriverWait, product_name: str
+) -> Optional[int]:
     """
     Get the quantity of a product in the shopping cart.
 
@@ -696,12 +796,70 @@ def get_product_quantity(driver: webdriver, wait: WebDriverWait, product_name: s
         product_name (str): The name of the product to get the quantity of.
 
     Returns:
-        int: The quantity of the product.
+        Optional[int]: The quantity of the product, None if it is not in the cart.
     """
     shopping_cart_page = open_cart(driver, wait)
     return shopping_cart_page.get_product_quantity(product_name)
 
 
+@traced
+def edit_cart(
+    driver: webdriver,
+    wait: WebDriverWait,
+    quantities: Optional[Dict[str, int]] = None,
+    removals: Optional[List[str]] = None,
+) -> List[CartRow]:
+    """
+    Update the quantities of and remove several products of the shopping cart with
+    a single cart update, then verify the resulting cart.
+
+    Args:
+        driver (WebDriver): The WebDriver instance.
+        wait (WebDriverWait): The WebDriverWait instance.
+        quantities (Optional[Dict[str, int]], optional): Product names mapped to their new quantity, a quantity of 0 removes the product.
+        removals (Optional[List[str]], optional): Names of the products to remove.
+
+    Returns:
+        List[CartRow]: The rows of the shopping cart after the update.
+
+    Raises:
+        AssertionError: If a product is not in the shopping cart, or if the cart
+        does not match the expected state after the update.
+    """
+    quantities = quantities or {}
+    removals = removals or []
+
+    LOGGER.info(
+        "Edit the shopping cart",
+        quantity_changes=len(quantities),
+        removals=len(removals),
+    )
+    shopping_cart_page = open_cart(driver, wait)
+
+    expected = {row.name: row.quantity for row in shopping_cart_page.snapshot()}
+    expected.update(quantities)
+    expected = {
+        name: quantity
+        for name, quantity in expected.items()
+        if quantity > 0 and name not in removals
+    }
+
+    shopping_cart_page.apply_changes(quantities, removals)
+
+    # Verify the shopping cart matches the expected state
+    rows = shopping_cart_page.snapshot()
+    actual = {row.name: row.quantity for row in rows}
+    assert actual == expected, (
+        "Shopping cart does not match the expected state!\n"
+        f"Expected: {expected}\n"
+        f"Actual: {actual}"
+    )
+
+    LOGGER.info("Shopping cart edited successfully")
+    return rows
+
+
+@traced
 def update_product_quantity_in_cart(
     driver: webdriver, wait: WebDriverWait, product_name: str, quantity: int
 ):
@@ -715,20 +873,17 @@ def update_product_quantity_in_cart(
         quantity (int): The desired quantity of the product.
 
     Raises:
-        TimeoutException: If the update cart button is still clickable after the form submission.
+        AssertionError: If the product quantity is not updated.
     """
-    LOGGER.info(f"Update the quantity of product '{product_name}' in the shopping cart")
-    shopping_cart_page = open_cart(driver, wait)
-    shopping_cart_page.modify_product_quantity(product_name, quantity)
-
-    # Verify the product quantity is updated
-    assert shopping_cart_page.get_product_quantity(product_name) == str(
-        quantity
-    ), f"Product quantity was not updated to {quantity}!"
-
-    LOGGER.info("Product quantity updated successfully")
+    LOGGER.info(
+        "Update the quantity of the product in the shopping cart",
+        product=product_name,
+        quantity=quantity,
+    )
+    edit_cart(driver, wait, quantities={product_name: quantity})
 
 
+@traced
 def remove_product_from_cart(driver: webdriver, wait: WebDriverWait, product_name: str):
     """
     Remove a product from the shopping cart.
@@ -739,21 +894,13 @@ def remove_product_from_cart(driver: webdriver, wait: WebDriverWait, product_nam
         product_name (str): The name of the product to remove.
 
     Raises:
-        TimeoutException: If the update cart button is still clickable after the form submission.
+        AssertionError: If the product is not removed from the shopping cart.
     """
-    LOGGER.info(f"Remove product '{product_name}' from the shopping cart")
-    shopping_cart_page = open_cart(driver, wait)
-
-    shopping_cart_page.remove_product_from_cart(product_name)
-
-    # Verify the product is no longer in the shopping cart
-    assert (
-        product_name not in shopping_cart_page.list_products_in_cart()
-    ), f"Product '{product_name}' was not removed from the shopping cart!"
-
-    LOGGER.info("Product removed successfully")
+    LOGGER.info("Remove the product from the shopping cart", product=product_name)
+    edit_cart(driver, wait, removals=[product_name])
 
 
+@traced
 def checkout_from_cart(driver: webdriver, wait: WebDriverWait):
     """
     Proceed to the checkout process from the shopping cart.
@@ -1,24 +1,121 @@
+import re
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional
+
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.remote.webelement import WebElement
+
+from tests.helpers import conditions as EC
+from tests.helpers.cart import cart_state
+from tests.helpers.config import url_for
+from tests.helpers.page_metrics import register_page
+from tests.helpers.tracing import traced_actions
+
+# Reads every row of the cart table in one round trip, the row elements are
+# returned as WebElement handles
+CART_SNAPSHOT_SCRIPT = """
+const table = document.querySelector(arguments[0]);
+if (!table) {
+  return [];
+}
+
+function text(row, selector) {
+  const element = row.querySelector(selector);
+  return element ? element.textContent.trim() : '';
+}
+
+return Array.from(table.querySelectorAll('tbody tr')).map(function (row) {
+  const quantity = row.querySelector('.quantity input');
+  return {
+    name: text(row, '.product-name'),
+    sku: text(row, '.sku-number'),
+    unit_price: text(row, '.product-unit-price'),
+    quantity: quantity ? quantity.value : '0',
+    subtotal: text(row, '.product-subtotal'),
+    row: row,
+    quantity_input: quantity,
+    remove_button: row.querySelector('.remove-from-cart button'),
+  };
+});
+"""
+
+# Stages every row change of a cart edit in the form without submitting it: sets
+# the quantity inputs and ticks the hidden remove checkboxes
+STAGE_CART_CHANGES_SCRIPT = """
+const changes = arguments[0];
+const rejected = [];
+
+changes.forEach(function (change, index) {
+  const [row, quantity, remove] = change;
+  if (remove) {
+    const checkbox = row.querySelector('input[name="removefromcart"]');
+    if (!checkbox) {
+      rejected.push(index);
+      return;
+    }
+    checkbox.checked = true;
+    return;
+  }
+  const input = row.querySelector('.quantity input');
+  if (!input || input.disabled) {
+    rejected.push(index);
+    return;
+  }
+  input.value = String(quantity);
+  input.dispatchEvent(new Event('input', { bubbles: true }));
+  input.dispatchEvent(new Event('change', { bubbles: true }));
+});
+
+return rejected;
+"""
 
 
+def parse_price(text: str) -> Decimal:
+    """
+    Parse a price as displayed by the storefront, e.g. "$1,200.00".
+
+    Args:
+        text (str): The displayed price.
+
+    Returns:
+        Decimal: The amount, 0 if the text holds no amount.
+    """
+    amount = re.sub(r"[^\d.]", "", text)
+    return Decimal(amount) if amount else Decimal(0)
+
+
+@dataclass(frozen=True)
+class CartRow:
+    name: str
+    sku: str
+    unit_price: Decimal
+    quantity: int
+    subtotal: Decimal
+    row: WebElement
+    quantity_input: Optional[WebElement]
+    remove_button: Optional[WebElement]
+
+
+@traced_actions
 class ShoppingCartPage:
     def __init__(self, driver, wait):
         self.driver = driver
         self.wait = wait
 
         # Define the page's URL
-        self.url = "https://demo.nopcommerce.com/cart"
+        self.url = url_for("cart")
+        register_page(self.url, type(self).__name__)
 
         # Define web elements on the page
         self.shopping_cart_page_button = (By.CSS_SELECTOR, ".ico-cart")
         self.checkout_button = (By.CSS_SELECTOR, ".checkout-button")
         self.terms_of_service_checkbox = (By.ID, "termsofservice")
+        self.order_summary_content = (By.CSS_SELECTOR, ".order-summary-content")
+        self.cart_table = (By.CSS_SELECTOR, "table.cart")
         self.product_name = (By.CSS_SELECTOR, ".product-name")
         self.update_cart_button = (By.CSS_SELECTOR, ".update-cart-button")
         self.loading_image = (By.CSS_SELECTOR, ".loading-image")
-        self.quantity_by_name_input = (By.XPATH, "..//..//..//td[5]//input")
-        self.remove_product_by_name_button = (By.XPATH, "..//..//..//td[7]//button")
 
     def open(self):
         self.driver.get(self.url)
@@ -39,45 +136,93 @@ class ShoppingCartPage:
         )
         self.wait.until(EC.element_to_be_clickable(self.checkout_button)).click()
 
-    def list_products_in_cart(self):
-        products = self.wait.until(
-            EC.presence_of_all_elements_located(self.product_name)
-        )
-        return [product.text for product in products]
+    def snapshot(self) -> List[CartRow]:
+        """
+        Read the whole cart table in a single scripted call.
 
-    def get_product_quantity(self, product_name):
-        products = self.wait.until(
-            EC.presence_of_all_elements_located(self.product_name)
-        )
-        for product in products:
-            if product.text == product_name:
-                return product.find_element(*self.quantity_by_name_input).get_attribute(
-                    "value"
-                )
-
-    def remove_product_from_cart(self, product_name):
-        products = self.wait.until(
-            EC.presence_of_all_elements_located(self.product_name)
-        )
-        for product in products:
-            if product.text == product_name:
-                product.find_element(*self.remove_product_by_name_button).click()
-                self.wait.until(
-                    EC.element_to_be_clickable(self.update_cart_button)
-                ).click()
-                self.wait.until(EC.invisibility_of_element_located(self.loading_image))
-                break
-
-    def modify_product_quantity(self, product_name, quantity):
-        products = self.wait.until(
-            EC.presence_of_all_elements_located(self.product_name)
-        )
-        for product in products:
-            if product.text == product_name:
-                product.find_element(*self.quantity_by_name_input).clear()
-                product.find_element(*self.quantity_by_name_input).send_keys(quantity)
-                self.wait.until(
-                    EC.element_to_be_clickable(self.update_cart_button)
-                ).click()
-                self.wait.until(EC.invisibility_of_element_located(self.loading_image))
-                break
+        Returns:
+            List[CartRow]: The cart rows in display order, empty if the cart is empty.
+        """
+        cache = cart_state(self.driver)
+        rows = cache.snapshot()
+        if rows is not None:
+            return rows
+
+        # Reading the table leaves the page as it is, the cache stays valid
+        with cache.listener.read_only():
+            self.wait.until(EC.presence_of_element_located(self.order_summary_content))
+            rows = self.driver.execute_script(CART_SNAPSHOT_SCRIPT, self.cart_table[1])
+        rows = [
+            CartRow(
+                name=row["name"],
+                sku=row["sku"],
+                unit_price=parse_price(row["unit_price"]),
+                quantity=int(row["quantity"] or 0),
+                subtotal=parse_price(row["subtotal"]),
+                row=row["row"],
+                quantity_input=row["quantity_input"],
+                remove_button=row["remove_button"],
+            )
+            for row in rows
+        ]
+        cache.set_snapshot(rows)
+        return rows
+
+    def find_row(self, product_name: str) -> Optional[CartRow]:
+        return next((row for row in self.snapshot() if row.name == product_name), None)
+
+    def list_products_in_cart(self) -> List[str]:
+        return [row.name for row in self.snapshot()]
+
+    def get_product_quantity(self, product_name: str) -> Optional[int]:
+        row = self.find_row(product_name)
+        return row.quantity if row else None
+
+    def submit_cart_update(self):
+        self.wait.until(EC.element_to_be_clickable(self.update_cart_button)).click()
+        self.wait.until(EC.invisibility_of_element_located(self.loading_image))
+
+    def apply_changes(
+        self,
+        quantities: Optional[Dict[str, int]] = None,
+        removals: Iterable[str] = (),
+    ):
+        """
+        Change the quantity of and remove any number of rows, submitted in a single
+        cart update.
+
+        Args:
+            quantities (Dict[str, int], optional): Product names mapped to their new
+                quantity, a quantity of 0 removes the product.
+            removals (Iterable[str], optional): Names of the products to remove.
+
+        Raises:
+            AssertionError: If a product is not in the cart or its row rejects the
+                change.
+        """
+        quantities = quantities or {}
+        removals = set(removals)
+        rows = {row.name: row for row in self.snapshot()}
+
+        missing = (set(quantities) | removals) - set(rows)
+        assert not missing, f"Products not in the shopping cart: {sorted(missing)}"
+
+        updated = [name for name in quantities if name not in removals]
+        names = updated + sorted(removals)
+        if not names:
+            return
+
+        changes = [[rows[name].row, quantities[name], False] for name in updated]
+        changes += [[rows[name].row, 0, True] for name in sorted(removals)]
+        cart_state(self.driver).invalidate()
+        rejected = self.driver.execute_script(STAGE_CART_CHANGES_SCRIPT, changes)
+        assert (
+            not rejected
+        ), f"Cart rows rejected the change: {[names[index] for index in rejected]}"
+        self.submit_cart_update()
+
+    def remove_product_from_cart(self, product_name: str):
+        self.apply_changes(removals=[product_name])
+
+    def modify_product_quantity(self, product_name: str, quantity: int):
+        self.apply_changes(quantities={product_name: quantity})
@@ -1,14 +1,23 @@
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.select import Select
 
+from tests.helpers import conditions as EC
+from tests.helpers.config import url_for
+from tests.helpers.page_metrics import register_page
+from tests.helpers.tracing import traced_actions
+from tests.pages.forms import FormPage
 
-class CheckoutPage:
+
+class CheckoutPage(FormPage):
     def __init__(self, driver, wait):
-        self.driver = driver
-        self.wait = wait
+        super().__init__(driver, wait)
+
+        # Every section of the one page checkout shares the page's URL
+        self.url = url_for("onepagecheckout")
+        register_page(self.url, "CheckoutPage")
 
 
+@traced_actions
 class BillingAddress(CheckoutPage):
     def __init__(self, driver, wait):
         super().__init__(driver, wait)
@@ -18,6 +27,8 @@ class BillingAddress(CheckoutPage):
             By.CSS_SELECTOR,
             ".section.ship-to-same-address",
         )
+        self.billing_address_select = (By.ID, "billing-address-select")
+        self.new_address_form = (By.ID, "billing-new-address-form")
         self.first_name_input = (By.ID, "BillingNewAddress_FirstName")
         self.last_name_input = (By.ID, "BillingNewAddress_LastName")
         self.email_input = (By.ID, "BillingNewAddress_Email")
@@ -34,6 +45,32 @@ class BillingAddress(CheckoutPage):
             By.CSS_SELECTOR,
             ".new-address-next-step-button:not([disabled])",
         )
+        self.please_wait = (By.ID, "billing-please-wait")
+
+        # Define the form fields that can be filled in bulk
+        self.fields = {
+            "first_name": self.first_name_input,
+            "last_name": self.last_name_input,
+            "email": self.email_input,
+            "company": self.company_input,
+            "country": self.country_select,
+            "state": self.state_select,
+            "city": self.city_input,
+            "address1": self.address1_input,
+            "address2": self.address2_input,
+            "zip_code": self.zip_input,
+            "phone_number": self.phone_input,
+            "fax_number": self.fax_input,
+        }
+
+    def select_new_billing_address(self):
+        # Customers with saved addresses pick one, the new address form stays hidden
+        # until "New Address" is selected
+        selects = self.driver.find_elements(*self.billing_address_select)
+        if not selects:
+            return
+        Select(selects[0]).select_by_visible_text("New Address")
+        self.wait.until(EC.visibility_of_element_located(self.new_address_form))
 
     def click_ship_to_same_address(self):
         elm = self.wait.until(
@@ -126,6 +163,7 @@ class BillingAddress(CheckoutPage):
         self.wait.until(EC.element_to_be_clickable(self.continue_button)).click()
 
 
+@traced_actions
 class ShippingAddress(CheckoutPage):
     def __init__(self, driver, wait):
         super().__init__(driver, wait)
@@ -151,6 +189,23 @@ class ShippingAddress(CheckoutPage):
                 " new-address-next-step-button']"
             ),
         )
+        self.please_wait = (By.ID, "shipping-please-wait")
+
+        # Define the form fields that can be filled in bulk
+        self.fields = {
+            "first_name": self.first_name_input,
+            "last_name": self.last_name_input,
+            "email": self.email_input,
+            "company": self.company_input,
+            "country": self.country_select,
+            "state": self.state_select,
+            "city": self.city_input,
+            "address1": self.address1_input,
+            "address2": self.address2_input,
+            "zip_code": self.zip_input,
+            "phone_number": self.phone_input,
+            "fax_number": self.fax_input,
+        }
 
     def select_billing_address(self):
         shipping_address_select = self.wait.until(
@@ -243,6 +298,7 @@ class ShippingAddress(CheckoutPage):
         self.wait.until(EC.element_to_be_clickable(self.continue_button)).click()
 
 
+@traced_actions
 class ShippingMethod(CheckoutPage):
     def __init__(self, driver, wait):
         super().__init__(driver, wait)
@@ -255,6 +311,7 @@ class ShippingMethod(CheckoutPage):
             By.CSS_SELECTOR,
             ".shipping-method-next-step-button",
         )
+        self.please_wait = (By.ID, "shipping-method-please-wait")
 
     def select_ground_shipping_method(self):
         self.wait.until(
@@ -277,6 +334,7 @@ class ShippingMethod(CheckoutPage):
         ).click()
 
 
+@traced_actions
 class PaymentMethod(CheckoutPage):
     def __init__(self, driver, wait):
         super().__init__(driver, wait)
@@ -292,6 +350,8 @@ class PaymentMethod(CheckoutPage):
             By.CSS_SELECTOR,
             ".payment-info-next-step-button",
         )
+        self.payment_method_please_wait = (By.ID, "payment-method-please-wait")
+        self.payment_info_please_wait = (By.ID, "payment-info-please-wait")
         self.card_type = (By.ID, "CreditCardType")
         self.card_holder_name = (By.ID, "CardholderName")
         self.card_number = (By.ID, "CardNumber")
@@ -360,12 +420,14 @@ class PaymentMethod(CheckoutPage):
         ).click()
 
 
+@traced_actions
 class ConfirmOrder(CheckoutPage):
     def __init__(self, driver, wait):
         super().__init__(driver, wait)
 
         # Define web elements on the page
         self.confirm_order_button = (By.CSS_SELECTOR, ".confirm-order-next-step-button")
+        self.please_wait = (By.ID, "confirm-order-please-wait")
         self.success_message_text = (
             By.CSS_SELECTOR,
             ".section.order-completed .title strong",
@@ -0,0 +1,154 @@
+from typing import Dict, List, Tuple, Union
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.select import Select
+from structlog import get_logger
+
+from tests.helpers import conditions as EC
+from tests.helpers.tracing import traced_actions
+
+LOGGER = get_logger(module=__name__)
+
+Locator = Tuple[str, str]
+FieldValue = Union[str, bool]
+
+# Fills every field in one round trip, firing the events typing would fire, and
+# returns the indexes of the fields that did not accept the scripted value
+FILL_FORM_SCRIPT = """
+const fields = arguments[0];
+const rejected = [];
+
+function setNativeValue(element, value) {
+  const prototype = Object.getPrototypeOf(element);
+  const setter = Object.getOwnPropertyDescriptor(prototype, 'value').set;
+  setter.call(element, value);
+}
+
+function fire(element, type) {
+  element.dispatchEvent(new Event(type, { bubbles: true }));
+}
+
+fields.forEach(function (field, index) {
+  const [selector, value] = field;
+  const element = document.querySelector(selector);
+  if (!element || element.disabled || element.readOnly || !element.getClientRects().length) {
+    rejected.push(index);
+    return;
+  }
+
+  if (element.type === 'checkbox' || element.type === 'radio') {
+    if (element.checked !== value) {
+      element.click();
+    }
+    if (element.checked !== value) {
+      rejected.push(index);
+    }
+    return;
+  }
+
+  element.focus();
+  if (element.tagName === 'SELECT') {
+    const option = Array.from(element.options).find(function (option) {
+      return option.value === value || option.text.trim() === value;
+    });
+    if (!option) {
+      rejected.push(index);
+      return;
+    }
+    element.value = option.value;
+  } else {
+    setNativeValue(element, value);
+    fire(element, 'input');
+    if (element.value !== value) {
+      rejected.push(index);
+      return;
+    }
+  }
+  fire(element, 'change');
+  element.blur();
+});
+
+return rejected;
+"""
+
+
+def css_selector(locator: Locator) -> str:
+    """
+    Convert a locator to the equivalent CSS selector.
+
+    Args:
+        locator (Tuple[str, str]): The (By, value) locator.
+
+    Returns:
+        str: The CSS selector, or an empty string if the strategy has none.
+    """
+    by, value = locator
+    if by == By.ID:
+        return f'[id="{value}"]'
+    if by == By.NAME:
+        return f'[name="{value}"]'
+    if by == By.CSS_SELECTOR:
+        return value
+    return ""
+
+
+@traced_actions
+class FormPage:
+    """
+    Page with a form that can be filled in bulk.
+
+    Subclasses map field names to locators in self.fields, fill() then sets every
+    field in a single script and only types into the fields rejecting it.
+    """
+
+    def __init__(self, driver, wait):
+        self.driver = driver
+        self.wait = wait
+        self.fields: Dict[str, Locator] = {}
+
+    def fill(self, values: Dict[str, FieldValue]):
+        """
+        Fill in the form fields with the given values.
+
+        Args:
+            values (Dict[str, Union[str, bool]]): Field names mapped to the text to
+                enter, the option value or text to select, or the checked state.
+        """
+        names = list(values)
+        locators = [self.fields[name] for name in names]
+        selectors = [css_selector(locator) for locator in locators]
+
+        scripted = [index for index, selector in enumerate(selectors) if selector]
+        rejected = self.driver.execute_script(
+            FILL_FORM_SCRIPT,
+            [[selectors[index], values[names[index]]] for index in scripted],
+        )
+        fallback: List[int] = [scripted[index] for index in rejected]
+        fallback += [index for index, selector in enumerate(selectors) if not selector]
+
+        for index in sorted(fallback):
+            LOGGER.info("Field rejected scripted input, typing it", field=names[index])
+            self.type_into(locators[index], values[names[index]])
+
+    def type_into(self, locator: Locator, value: FieldValue):
+        element = self.wait.until(EC.element_to_be_clickable(locator))
+
+        if element.tag_name == "select":
+            # Options may still be loading, e.g. states after a country change
+            self.wait.until(
+                lambda driver: any(
+                    value in (option.get_attribute("value"), option.text.strip())
+                    for option in Select(element).options
+                )
+            )
+            select = Select(element)
+            if any(option.get_attribute("value") == value for option in select.options):
+                select.select_by_value(value)
+            else:
+                select.select_by_visible_text(value)
+        elif element.get_attribute("type") in ("checkbox", "radio"):
+            if element.is_selected() != value:
+                element.click()
+        else:
+            element.clear()
+            element.send_keys(value)
@@ -1,14 +1,20 @@
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as EC
 
+from tests.helpers import conditions as EC
+from tests.helpers.config import url_for
+from tests.helpers.page_metrics import register_page
+from tests.helpers.tracing import traced_actions
 
+
+@traced_actions
 class LoginPage:
     def __init__(self, driver, wait):
         self.driver = driver
         self.wait = wait
 
         # Define the page's URL
-        self.url = "https://demo.nopcommerce.com/login"
+        self.url = url_for("login")
+        register_page(self.url, type(self).__name__)
 
         # Define web elements on the page
         self.email_textbox = (By.ID, "Email")
@@ -1,12 +1,18 @@
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as EC
 
+from tests.helpers import conditions as EC
+from tests.helpers.config import url_for
+from tests.helpers.page_metrics import register_page
+from tests.helpers.tracing import traced_actions
 
+
+@traced_actions
 class ProductsCategoryPage:
     def __init__(self, driver, wait, url):
         self.driver = driver
         self.wait = wait
         self.url = url
+        register_page(self.url, type(self).__name__)
 
         self.driver.execute_script(
             "window.scrollTo(0, document.body.scrollHeight / 2);"
@@ -54,14 +60,30 @@ class ProductsCategoryPage:
 
 class DigitalDownloadsProductCategoryPage(ProductsCategoryPage):
     def __init__(self, driver, wait):
-        super().__init__(driver, wait, "https://demo.nopcommerce.com/digital-downloads")
+        super().__init__(driver, wait, url_for("digital-downloads"))
 
 
 class BooksProductCategoryPage(ProductsCategoryPage):
     def __init__(self, driver, wait):
-        super().__init__(driver, wait, "https://demo.nopcommerce.com/books")
+        super().__init__(driver, wait, url_for("books"))
 
 
 class CellPhonesProductCategoryPage(ProductsCategoryPage):
     def __init__(self, driver, wait):
-        super().__init__(driver, wait, "https://demo.nopcommerce.com/cell-phones")
+        super().__init__(driver, wait, url_for("cell-phones"))
+
+
+@traced_actions
+class ProductPage(ProductsCategoryPage):
+    def __init__(self, driver, wait, url):
+        super().__init__(driver, wait, url)
+
+        # Define web elements on the page
+        self.quantity_input = (By.CSS_SELECTOR, ".add-to-cart-panel .qty-input")
+
+    def enter_quantity(self, quantity: int):
+        quantity_textbox = self.wait.until(
+            EC.element_to_be_clickable(self.quantity_input)
+        )
+        quantity_textbox.clear()
+        quantity_textbox.send_keys(str(quantity))
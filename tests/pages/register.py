@@ -1,16 +1,22 @@
 from datetime import date
 
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as EC
 
+from tests.helpers import conditions as EC
+from tests.helpers.config import url_for
+from tests.helpers.page_metrics import register_page
+from tests.helpers.tracing import traced_actions
+from tests.pages.forms import FormPage
 
-class RegisterPage:
+
+@traced_actions
+class RegisterPage(FormPage):
     def __init__(self, driver, wait):
-        self.driver = driver
-        self.wait = wait
+        super().__init__(driver, wait)
 
         # Define the page's URL
-        self.url = "https://demo.nopcommerce.com/register"
+        self.url = url_for("register")
+        register_page(self.url, type(self).__name__)
 
         # Define web elements on the page
         self.register_page_button = (By.CSS_SELECTOR, ".ico-register")
@@ -32,6 +38,22 @@ class RegisterPage:
 
         self.field_validation_error = (By.CSS_SELECTOR, ".field-validation-error span")
 
+        # Define the form fields that can be filled in bulk
+        self.fields = {
+            "gender_male": self.male_gender_input,
+            "gender_female": self.female_gender_input,
+            "first_name": self.first_name_input,
+            "last_name": self.last_name_input,
+            "email": self.email_input,
+            "day_of_birth": self.day_of_birth_select,
+            "month_of_birth": self.month_of_birth_select,
+            "year_of_birth": self.year_of_birth_select,
+            "company_name": self.company_name_input,
+            "newsletter": self.newsletter_checkbox,
+            "password": self.password_input,
+            "confirm_password": self.confirm_password_input,
+        }
+
     def open(self):
         self.driver.get(self.url)
 
@@ -0,0 +1,108 @@
+"""
+Compare two benchmark runs and fail on a performance regression.
+
+Every scenario and helper step measured in both runs is compared on its median, with
+a bootstrap confidence interval of the change. The exit status is 1 when the cart or
+a checkout scenario, or one of their steps, is slower beyond the tolerance. A series
+needs 5 baseline and 3 compared samples, i.e. iterations, to be gated:
+
+    python -m tests.regression --baseline main --head -1 --tolerance 0.1
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from tests.benchmark import HISTORY_FILE
+from tests.helpers.benchmark import find_run, load_history
+from tests.helpers.regression import (
+    MIN_BASELINE_SAMPLES,
+    MIN_HEAD_SAMPLES,
+    compare,
+    format_table,
+    run_series,
+)
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--history",
+        type=Path,
+        default=HISTORY_FILE,
+        help=f"JSON history file of the benchmark runs (default: {HISTORY_FILE}).",
+    )
+    parser.add_argument(
+        "--baseline",
+        default="-2",
+        help="Baseline run by id, label or index (default: -2, the previous run).",
+    )
+    parser.add_argument(
+        "--head",
+        default="-1",
+        help="Compared run by id, label or index (default: -1, the latest run).",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.1,
+        help="Slowdown allowed over the baseline median (default: 0.1).",
+    )
+    parser.add_argument(
+        "--confidence",
+        type=float,
+        default=0.95,
+        help="Confidence level of the change intervals (default: 0.95).",
+    )
+    parser.add_argument(
+        "--rows",
+        type=int,
+        default=15,
+        help="Rows of the table, fastest growing first (default: 15).",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+
+    runs = load_history(args.history)
+    try:
+        base, head = find_run(runs, args.baseline), find_run(runs, args.head)
+    except KeyError as error:
+        print(error.args[0], file=sys.stderr)
+        return 2
+
+    deltas = compare(
+        run_series(base),
+        run_series(head),
+        args.tolerance,
+        args.confidence,
+        min_base=MIN_BASELINE_SAMPLES,
+        min_head=MIN_HEAD_SAMPLES,
+    )
+    print(f"{head['id']} against {base['id']}, tolerance {args.tolerance:.0%}")
+    for line in format_table(deltas, args.rows):
+        print(line)
+
+    insufficient = sum(delta.insufficient for delta in deltas)
+    if insufficient:
+        print(
+            (
+                f"\n{insufficient} series with fewer than"
+                f" {MIN_BASELINE_SAMPLES} baseline or {MIN_HEAD_SAMPLES} compared"
+                " samples, not gated"
+            ),
+            file=sys.stderr,
+        )
+
+    regressions = [delta for delta in deltas if delta.regressed and delta.gated]
+    if regressions:
+        print(f"\n{len(regressions)} gated regressions", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, List, Tuple
+
+
+@dataclass(frozen=True)
+class Product:
+    id: int
+    slug: str
+    name: str
+    category: str
+    sku: str
+    price: Decimal
+
+
+@dataclass(frozen=True)
+class Category:
+    slug: str
+    name: str
+
+
+CATEGORIES: List[Category] = [
+    Category("books", "Books"),
+    Category("digital-downloads", "Digital downloads"),
+    Category("cell-phones", "Cell phones"),
+]
+
+PRODUCTS: List[Product] = [
+    Product(
+        37,
+        "fahrenheit-451-by-ray-bradbury",
+        "Fahrenheit 451 by Ray Bradbury",
+        "books",
+        "FRB_FIC_451",
+        Decimal("27.00"),
+    ),
+    Product(
+        38,
+        "first-prize-pies",
+        "First Prize Pies",
+        "books",
+        "FIRST_PRP",
+        Decimal("51.00"),
+    ),
+    Product(
+        39,
+        "pride-and-prejudice",
+        "Pride and Prejudice",
+        "books",
+        "PRIDE_PRJ",
+        Decimal("24.00"),
+    ),
+    Product(
+        34,
+        "night-visions",
+        "Night Visions",
+        "digital-downloads",
+        "NIGHT_VSN",
+        Decimal("2.80"),
+    ),
+    Product(
+        35,
+        "if-you-wait-donation",
+        "If You Wait (donation)",
+        "digital-downloads",
+        "IF_YOU_WT",
+        Decimal("0.00"),
+    ),
+    Product(
+        36,
+        "science-faith",
+        "Science & Faith",
+        "digital-downloads",
+        "SCI_FAITH",
+        Decimal("3.00"),
+    ),
+    Product(
+        18,
+        "htc-one-m8-android-l-50-lollipop",
+        "HTC One M8 Android L 5.0 Lollipop",
+        "cell-phones",
+        "M8_HTC_5L",
+        Decimal("245.00"),
+    ),
+    Product(
+        19,
+        "htc-one-mini-blue",
+        "HTC One Mini Blue",
+        "cell-phones",
+        "OM2_HTC_BL",
+        Decimal("100.00"),
+    ),
+    Product(
+        20,
+        "nokia-lumia-1020",
+        "Nokia Lumia 1020",
+        "cell-phones",
+        "N_1020_LU",
+        Decimal("349.00"),
+    ),
+]
+
+PRODUCTS_BY_ID: Dict[int, Product] = {product.id: product for product in PRODUCTS}
+PRODUCTS_BY_SLUG: Dict[str, Product] = {product.slug: product for product in PRODUCTS}
+
+COUNTRIES: List[Tuple[int, str]] = [
+    (1, "United States"),
+    (2, "Canada"),
+    (7, "Angola"),
+    (11, "Armenia"),
+    (79, "Germany"),
+    (151, "Netherlands"),
+    (232, "United Kingdom"),
+]
+
+STATES: Dict[int, List[Tuple[int, str]]] = {
+    1: [(1, "Alabama"), (12, "California"), (40, "New York"), (51, "Texas")],
+    2: [(66, "Alberta"), (71, "Ontario"), (73, "Quebec")],
+}
+
+SHIPPING_METHODS: List[Tuple[str, str, Decimal]] = [
+    ("Ground", "Shipping.FixedByWeightByTotal", Decimal("0.00")),
+    ("Next Day Air", "Shipping.FixedByWeightByTotal", Decimal("0.00")),
+    ("2nd Day Air", "Shipping.FixedByWeightByTotal", Decimal("0.00")),
+]
+
+PAYMENT_METHODS: List[Tuple[str, str]] = [
+    ("Payments.CheckMoneyOrder", "Check / Money Order"),
+    ("Payments.Manual", "Credit Card"),
+]
+
+CARD_TYPES: List[Tuple[str, str]] = [
+    ("Visa", "Visa"),
+    ("MasterCard", "Master card"),
+    ("Discover", "Discover"),
+    ("Amex", "Amex"),
+]
@@ -0,0 +1,918 @@
+"""
+Local stand-in for the nopCommerce demo storefront.
+
+It serves the register, login, category, product, cart and one-page checkout flows
+with the element ids, CSS classes and endpoints the page objects rely on, so the
+suite can run hermetically against it with --local-store.
+
+Run it standalone with:
+
+    python -m tests.storefront.server --port 8080
+"""
+
+import argparse
+import json
+import re
+import threading
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import count
+from pathlib import Path
+from secrets import token_urlsafe
+from time import time
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from filelock import FileLock
+from structlog import get_logger
+
+from tests.storefront import templates
+from tests.storefront.data import (
+    CATEGORIES,
+    PAYMENT_METHODS,
+    PRODUCTS,
+    PRODUCTS_BY_ID,
+    PRODUCTS_BY_SLUG,
+    SHIPPING_METHODS,
+    STATES,
+)
+
+LOGGER = get_logger(module=__name__)
+
+STATIC_DIR = Path(__file__).parent / "static"
+
+CUSTOMER_COOKIE = ".Nop.Customer"
+AUTHENTICATION_COOKIE = ".Nop.Authentication"
+ANTIFORGERY_COOKIE = ".Nop.Antiforgery"
+
+# Lifetime of the authentication cookie, longer when "Remember me" is checked
+AUTHENTICATION_LIFETIME = 3600
+REMEMBER_ME_LIFETIME = 30 * 24 * 3600
+
+EMAIL_PATTERN = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+REQUIRED_ADDRESS_FIELDS = {
+    "FirstName": "First name is required.",
+    "LastName": "Last name is required.",
+    "Email": "Email is required.",
+    "City": "City is required.",
+    "Address1": "Street address is required.",
+    "ZipPostalCode": "Zip / postal code is required.",
+    "PhoneNumber": "Phone is required.",
+}
+
+
+@dataclass
+class CartItem:
+    id: int
+    product_id: int
+    quantity: int
+
+
+@dataclass
+class Customer:
+    id: str
+    email: Optional[str] = None
+    password: Optional[str] = None
+    first_name: str = ""
+    last_name: str = ""
+    addresses: List[Dict[str, str]] = field(default_factory=list)
+    cart: Dict[int, CartItem] = field(default_factory=dict)
+    checkout: Dict[str, object] = field(default_factory=dict)
+
+    @property
+    def registered(self) -> bool:
+        return self.email is not None
+
+
+class Store:
+    """
+    In-memory state of the storefront: customers, sessions, carts and orders.
+    """
+
+    def __init__(self, accounts_file: Optional[Path] = None):
+        self.lock = threading.RLock()
+        self.customers: Dict[str, Customer] = {}
+        self.customers_by_email: Dict[str, Customer] = {}
+        self.authentications: Dict[str, Tuple[str, float]] = {}
+        self.orders: List[dict] = []
+        self.cart_item_ids = count(1)
+        self.accounts_file = accounts_file
+        self.accounts_lock = (
+            FileLock(f"{accounts_file}.lock") if accounts_file else None
+        )
+        # Bytes of the accounts file already loaded
+        self.accounts_offset = 0
+        self._load_accounts()
+
+    def _load_accounts(self):
+        # One JSON document per line, appended by every server sharing the file
+        if not self.accounts_file or not self.accounts_file.is_file():
+            return
+        with self.lock:
+            with self.accounts_file.open("rb") as file:
+                file.seek(self.accounts_offset)
+                appended = file.read()
+            # A line without its newline is still being written by another server
+            complete = appended[: appended.rfind(b"\n") + 1]
+            self.accounts_offset += len(complete)
+
+            for line in complete.decode().splitlines():
+                if not line.strip():
+                    continue
+                account = json.loads(line)
+                if account["email"].lower() in self.customers_by_email:
+                    continue
+                customer = self.new_customer()
+                customer.email = account["email"]
+                customer.password = account["password"]
+                customer.first_name = account.get("first_name", "")
+                customer.last_name = account.get("last_name", "")
+                self.customers_by_email[customer.email.lower()] = customer
+
+    def _save_account(self, customer: Customer):
+        if not self.accounts_file:
+            return
+        account = {
+            "email": customer.email,
+            "password": customer.password,
+            "first_name": customer.first_name,
+            "last_name": customer.last_name,
+        }
+        with self.lock, self.accounts_lock, self.accounts_file.open("a") as file:
+            file.write(json.dumps(account) + "\n")
+
+    def new_customer(self) -> Customer:
+        customer = Customer(id=token_urlsafe(12))
+        self.customers[customer.id] = customer
+        return customer
+
+    def register(self, customer: Customer, email: str, password: str, **names):
+        customer.email = email
+        customer.password = password
+        customer.first_name = names.get("first_name", "")
+        customer.last_name = names.get("last_name", "")
+        self.customers_by_email[email.lower()] = customer
+        self._save_account(customer)
+
+    def find_customer(self, email: str) -> Optional[Customer]:
+        customer = self.customers_by_email.get(email.lower())
+        if customer is None and self.accounts_file:
+            # The account may have been registered by another server sharing the file
+            self._load_accounts()
+            customer = self.customers_by_email.get(email.lower())
+        return customer
+
+    def authenticate(self, email: str, password: str) -> Optional[Customer]:
+        customer = self.find_customer(email)
+        if customer and customer.password == password:
+            return customer
+        return None
+
+    def sign_in(self, customer: Customer, lifetime: int) -> str:
+        token = token_urlsafe(24)
+        self.authentications[token] = (customer.id, time() + lifetime)
+        return token
+
+    def add_to_cart(self, customer: Customer, product_id: int, quantity: int):
+        for item in customer.cart.values():
+            if item.product_id == product_id:
+                item.quantity += quantity
+                return
+        item_id = next(self.cart_item_ids)
+        customer.cart[item_id] = CartItem(item_id, product_id, quantity)
+
+    def merge_carts(self, guest: Customer, customer: Customer):
+        for item in guest.cart.values():
+            self.add_to_cart(customer, item.product_id, item.quantity)
+        guest.cart.clear()
+
+    @staticmethod
+    def cart_items(customer: Customer) -> List[dict]:
+        items = []
+        for item in customer.cart.values():
+            product = PRODUCTS_BY_ID[item.product_id]
+            items.append(
+                {
+                    "id": item.id,
+                    "name": product.name,
+                    "slug": product.slug,
+                    "sku": product.sku,
+                    "quantity": item.quantity,
+                    "unit_price": product.price,
+                    "subtotal": product.price * item.quantity,
+                }
+            )
+        return items
+
+    def place_order(self, customer: Customer) -> int:
+        order_id = len(self.orders) + 1
+        self.orders.append(
+            {
+                "id": order_id,
+                "customer": customer.email,
+                "items": self.cart_items(customer),
+                "checkout": dict(customer.checkout),
+            }
+        )
+        customer.cart.clear()
+        customer.checkout.clear()
+        return order_id
+
+
+@dataclass
+class Response:
+    status: int = HTTPStatus.OK
+    body: bytes = b""
+    content_type: str = "text/html; charset=utf-8"
+    headers: List[Tuple[str, str]] = field(default_factory=list)
+
+
+def redirect(location: str) -> Response:
+    return Response(status=HTTPStatus.FOUND, headers=[("Location", location)])
+
+
+def json_response(payload) -> Response:
+    return Response(
+        body=json.dumps(payload, default=str).encode(),
+        content_type="application/json; charset=utf-8",
+    )
+
+
+class StorefrontHandler(BaseHTTPRequestHandler):
+    server: "StorefrontServer"
+    protocol_version = "HTTP/1.1"
+
+    # Populated per request
+    customer: Customer
+    token: str
+    query: Dict[str, str]
+    form: Dict[str, List[str]]
+    cookies_to_set: List[str]
+
+    def log_message(self, format, *args):
+        LOGGER.debug(format % args)
+
+    # Request plumbing
+
+    def do_GET(self):
+        self.form = {}
+        self._dispatch(self.server.get_routes)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self.form = parse_qs(self.rfile.read(length).decode(), keep_blank_values=True)
+        self._dispatch(self.server.post_routes)
+
+    def _dispatch(self, routes: List[Tuple[re.Pattern, Callable]]):
+        url = urlsplit(self.path)
+        self.query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        self.cookies_to_set = []
+
+        with self.server.store.lock:
+            self._load_session()
+
+            for pattern, handler in routes:
+                match = pattern.fullmatch(url.path)
+                if match:
+                    if self.command == "POST" and not self._valid_token():
+                        response = Response(
+                            status=HTTPStatus.BAD_REQUEST,
+                            body=b"The anti-forgery token could not be validated.",
+                            content_type="text/plain",
+                        )
+                    else:
+                        response = handler(self, *match.groups())
+                    break
+            else:
+                response = self.page("Page not found", templates.not_found_page())
+                response.status = HTTPStatus.NOT_FOUND
+
+        self._send(response)
+
+    def _load_session(self):
+        cookies = SimpleCookie(self.headers.get("Cookie", ""))
+        store = self.server.store
+
+        customer = None
+        authentication = cookies.get(AUTHENTICATION_COOKIE)
+        if authentication:
+            customer_id, expires = store.authentications.get(
+                authentication.value, (None, 0)
+            )
+            if expires > time():
+                customer = store.customers.get(customer_id)
+
+        if customer is None:
+            guest = cookies.get(CUSTOMER_COOKIE)
+            customer = store.customers.get(guest.value) if guest else None
+            if customer is None or customer.registered:
+                customer = store.new_customer()
+                self.set_cookie(CUSTOMER_COOKIE, customer.id, 365 * 24 * 3600)
+        self.customer = customer
+
+        antiforgery = cookies.get(ANTIFORGERY_COOKIE)
+        if antiforgery:
+            self.token = antiforgery.value
+        else:
+            self.token = token_urlsafe(24)
+            self.set_cookie(ANTIFORGERY_COOKIE, self.token)
+
+    def _valid_token(self) -> bool:
+        return self.form_value("__RequestVerificationToken") == self.token
+
+    def _send(self, response: Response):
+        self.send_response(response.status)
+        self.send_header("Content-Type", response.content_type)
+        self.send_header("Content-Length", str(len(response.body)))
+        self.send_header("Cache-Control", "no-cache, no-store")
+        for name, value in response.headers:
+            self.send_header(name, value)
+        for cookie in self.cookies_to_set:
+            self.send_header("Set-Cookie", cookie)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(response.body)
+
+    # Helpers
+
+    def set_cookie(self, name: str, value: str, max_age: Optional[int] = None):
+        cookie = f"{name}={value}; Path=/; HttpOnly; SameSite=Lax"
+        if max_age is not None:
+            cookie += f"; Max-Age={max_age}"
+        self.cookies_to_set.append(cookie)
+
+    def form_value(self, name: str, default: str = "") -> str:
+        values = self.form.get(name)
+        return values[-1] if values else default
+
+    def page(self, title: str, body: str, page_class: str = "") -> Response:
+        cart_quantity = sum(item.quantity for item in self.customer.cart.values())
+        html = templates.layout(
+            title,
+            body,
+            self.token,
+            self.customer.registered,
+            cart_quantity,
+            page_class,
+        )
+        return Response(body=html.encode())
+
+    def cart_quantity_html(self) -> str:
+        return f"({sum(item.quantity for item in self.customer.cart.values())})"
+
+    # Pages
+
+    def home(self):
+        return self.page("Home page", templates.home_page(), "home-page")
+
+    def static(self, name: str):
+        path = STATIC_DIR / name
+        if not path.is_file():
+            return Response(status=HTTPStatus.NOT_FOUND)
+        return Response(
+            body=path.read_bytes(),
+            content_type="application/javascript; charset=utf-8",
+        )
+
+    def register_form(self):
+        return self.page(
+            "Register",
+            templates.register_page({}, {}, [], self.token),
+            "registration-page",
+        )
+
+    def register(self):
+        values = {name: values[-1] for name, values in self.form.items()}
+        errors: Dict[str, str] = {}
+        messages: List[str] = []
+
+        if not values.get("FirstName", "").strip():
+            errors["FirstName"] = "First name is required."
+        if not values.get("LastName", "").strip():
+            errors["LastName"] = "Last name is required."
+
+        email = values.get("Email", "").strip()
+        if not email:
+            errors["Email"] = "Email is required."
+        elif not EMAIL_PATTERN.match(email):
+            errors["Email"] = "Wrong email"
+
+        password = values.get("Password", "")
+        if not password:
+            errors["Password"] = "Password is required."
+        elif not 6 <= len(password) <= 64:
+            errors["Password"] = (
+                "Password must meet the following rules: <ul><li>must have at least 6"
+                " characters and not greater than 64 characters</li></ul>"
+            )
+
+        confirm_password = values.get("ConfirmPassword", "")
+        if not confirm_password:
+            errors["ConfirmPassword"] = "Password is required."
+        elif confirm_password != password:
+            errors["ConfirmPassword"] = (
+                "The password and confirmation password do not match."
+            )
+
+        if not errors and self.server.store.find_customer(email):
+            messages.append("The specified email already exists")
+
+        if errors or messages:
+            return self.page(
+                "Register",
+                templates.register_page(values, errors, messages, self.token),
+                "registration-page",
+            )
+
+        self.server.store.register(
+            self.customer,
+            email,
+            password,
+            first_name=values["FirstName"],
+            last_name=values["LastName"],
+        )
+        # Registration does not sign the customer in, start a new guest session
+        self.set_cookie(CUSTOMER_COOKIE, self.server.store.new_customer().id)
+        return redirect("/registerresult/1?returnUrl=/")
+
+    def register_result(self, _):
+        return self.page(
+            "Register", templates.register_result_page(), "registration-result-page"
+        )
+
+    def login_form(self):
+        return self.page(
+            "Login",
+            templates.login_page("", [], self.query.get("returnUrl", "/"), self.token),
+            "login-page",
+        )
+
+    def login(self):
+        email = self.form_value("Email").strip()
+        customer = self.server.store.authenticate(email, self.form_value("Password"))
+        return_url = self.query.get("returnUrl", "/")
+
+        if customer is None:
+            messages = [
+                "Login was unsuccessful. Please correct the errors and try again.",
+                "The credentials provided are incorrect",
+            ]
+            return self.page(
+                "Login",
+                templates.login_page(email, messages, return_url, self.token),
+                "login-page",
+            )
+
+        lifetime = (
+            REMEMBER_ME_LIFETIME
+            if self.form_value("RememberMe") == "true"
+            else AUTHENTICATION_LIFETIME
+        )
+        self.server.store.merge_carts(self.customer, customer)
+        self.set_cookie(
+            AUTHENTICATION_COOKIE,
+            self.server.store.sign_in(customer, lifetime),
+            lifetime,
+        )
+        return redirect(return_url if return_url.startswith("/") else "/")
+
+    def logout(self):
+        self.set_cookie(AUTHENTICATION_COOKIE, "", 0)
+        self.set_cookie(CUSTOMER_COOKIE, self.server.store.new_customer().id)
+        return redirect("/")
+
+    def category(self, slug: str):
+        category = next(item for item in CATEGORIES if item.slug == slug)
+        products = [product for product in PRODUCTS if product.category == slug]
+        return self.page(
+            category.name,
+            templates.category_page(category.name, products),
+            "category-page",
+        )
+
+    def product(self, slug: str):
+        product = PRODUCTS_BY_SLUG.get(slug)
+        if product is None:
+            response = self.page("Page not found", templates.not_found_page())
+            response.status = HTTPStatus.NOT_FOUND
+            return response
+        return self.page(
+            product.name,
+            templates.product_page(product, self.token),
+            "product-details-page",
+        )
+
+    def add_to_cart(self, product_id: str, quantity: Optional[str] = None):
+        product = PRODUCTS_BY_ID.get(int(product_id))
+        if product is None:
+            return json_response({"success": False, "message": "No product found"})
+
+        if quantity is None:
+            quantity = self.form_value(f"addtocart_{product.id}.EnteredQuantity", "1")
+        try:
+            quantity = int(quantity)
+        except ValueError:
+            quantity = 0
+        if quantity <= 0:
+            return json_response(
+                {"success": False, "message": ["Quantity should be positive"]}
+            )
+
+        self.server.store.add_to_cart(self.customer, product.id, quantity)
+        return json_response(
+            {
+                "success": True,
+                "message": (
+                    "The product has been added to your"
+                    ' <a href="/cart">shopping cart</a>'
+                ),
+                "updatetopcartsectionhtml": self.cart_quantity_html(),
+            }
+        )
+
+    def add_to_cart_details(self, product_id: str):
+        return self.add_to_cart(product_id)
+
+    def add_to_cart_catalog(self, product_id: str, quantity: str):
+        return self.add_to_cart(product_id, quantity)
+
+    def cart(self, messages: Optional[List[str]] = None):
+        items = self.server.store.cart_items(self.customer)
+        return self.page(
+            "Shopping Cart",
+            templates.cart_page(items, messages or [], self.token),
+            "shopping-cart-page",
+        )
+
+    def update_cart(self):
+        removals = {int(value) for value in self.form.get("removefromcart", [])}
+        for item_id in list(self.customer.cart):
+            quantity = self.form_value(f"itemquantity{item_id}")
+            if item_id in removals:
+                del self.customer.cart[item_id]
+            elif quantity:
+                try:
+                    quantity = int(quantity)
+                except ValueError:
+                    continue
+                if quantity <= 0:
+                    del self.customer.cart[item_id]
+                else:
+                    self.customer.cart[item_id].quantity = quantity
+
+        if "checkout" not in self.form:
+            return redirect("/cart")
+
+        if self.form_value("termsofservice") != "true":
+            return self.cart(
+                ["Please accept the terms of service before the next step."]
+            )
+        if not self.customer.registered:
+            return redirect("/login?returnUrl=%2Fcart")
+        if not self.customer.cart:
+            return redirect("/cart")
+        return redirect("/onepagecheckout")
+
+    def states(self):
+        try:
+            country_id = int(self.query.get("countryId", "0"))
+        except ValueError:
+            country_id = 0
+        states = STATES.get(country_id, [(0, "Other")])
+        return json_response([{"id": value, "name": name} for value, name in states])
+
+    # One page checkout
+
+    def one_page_checkout(self):
+        if not self.customer.registered:
+            return redirect("/login?returnUrl=%2Fonepagecheckout")
+        if not self.customer.cart:
+            return redirect("/cart")
+
+        self.customer.checkout.clear()
+        billing = templates.billing_section(
+            self.customer.addresses,
+            {
+                "FirstName": self.customer.first_name,
+                "LastName": self.customer.last_name,
+                "Email": self.customer.email,
+            },
+        )
+        return self.page(
+            "Checkout",
+            templates.one_page_checkout_page(billing, self.token),
+            "checkout-page",
+        )
+
+    def _address(self, prefix: str) -> Tuple[Dict[str, str], List[str]]:
+        address = {
+            name[len(prefix) + 1 :]: values[-1]
+            for name, values in self.form.items()
+            if name.startswith(f"{prefix}.")
+        }
+        errors = [
+            message
+            for name, message in REQUIRED_ADDRESS_FIELDS.items()
+            if not address.get(name, "").strip()
+        ]
+        if address.get("CountryId", "0") in ("", "0"):
+            errors.append("Country is required.")
+        return address, errors
+
+    def _save_address(self, address: Dict[str, str]):
+        if address not in self.customer.addresses:
+            self.customer.addresses.append(address)
+
+    def _checkout_error(self) -> Optional[Response]:
+        if not self.customer.registered or not self.customer.cart:
+            return json_response({"redirect": "/cart"})
+        return None
+
+    def save_billing(self):
+        error = self._checkout_error()
+        if error:
+            return error
+
+        address_id = self.form_value("billing_address_id")
+        if address_id:
+            try:
+                address = self.customer.addresses[int(address_id)]
+            except (ValueError, IndexError):
+                return json_response({"error": 1, "message": "Address can't be loaded"})
+        else:
+            address, errors = self._address("BillingNewAddress")
+            if errors:
+                return json_response({"error": 1, "message": errors})
+            self._save_address(address)
+
+        self.customer.checkout["billing_address"] = address
+
+        if self.form_value("ShipToSameAddress") == "true":
+            self.customer.checkout["shipping_address"] = address
+            return json_response(
+                {
+                    "update_section": {
+                        "name": "shipping-method",
+                        "html": templates.shipping_method_section(),
+                    },
+                    "goto_section": "shipping_method",
+                }
+            )
+
+        return json_response(
+            {
+                "update_section": {
+                    "name": "shipping",
+                    "html": templates.shipping_section(
+                        self.customer.addresses, self.customer.email
+                    ),
+                },
+                "goto_section": "shipping",
+            }
+        )
+
+    def save_shipping(self):
+        error = self._checkout_error()
+        if error:
+            return error
+
+        address_id = self.form_value("shipping_address_id")
+        if address_id:
+            try:
+                address = self.customer.addresses[int(address_id)]
+            except (ValueError, IndexError):
+                return json_response({"error": 1, "message": "Address can't be loaded"})
+        else:
+            address, errors = self._address("ShippingNewAddress")
+            if errors:
+                return json_response({"error": 1, "message": errors})
+            self._save_address(address)
+
+        self.customer.checkout["shipping_address"] = address
+        return json_response(
+            {
+                "update_section": {
+                    "name": "shipping-method",
+                    "html": templates.shipping_method_section(),
+                },
+                "goto_section": "shipping_method",
+            }
+        )
+
+    def save_shipping_method(self):
+        error = self._checkout_error()
+        if error:
+            return error
+
+        option = self.form_value("shippingoption")
+        names = {f"{name}___{system_name}" for name, system_name, _ in SHIPPING_METHODS}
+        if option not in names:
+            return json_response(
+                {"error": 1, "message": "Selected shipping method can't be parsed"}
+            )
+
+        self.customer.checkout["shipping_method"] = option.split("___")[0]
+        return json_response(
+            {
+                "update_section": {
+                    "name": "payment-method",
+                    "html": templates.payment_method_section(),
+                },
+                "goto_section": "payment_method",
+            }
+        )
+
+    def save_payment_method(self):
+        error = self._checkout_error()
+        if error:
+            return error
+
+        payment_method = self.form_value("paymentmethod")
+        if payment_method not in {system_name for system_name, _ in PAYMENT_METHODS}:
+            return json_response(
+                {"error": 1, "message": "Selected payment method can't be parsed"}
+            )
+
+        self.customer.checkout["payment_method"] = payment_method
+        return json_response(
+            {
+                "update_section": {
+                    "name": "payment-info",
+                    "html": templates.payment_info_section(payment_method),
+                },
+                "goto_section": "payment_info",
+            }
+        )
+
+    def save_payment_info(self):
+        error = self._checkout_error()
+        if error:
+            return error
+
+        if self.customer.checkout.get("payment_method") == "Payments.Manual":
+            errors = [
+                message
+                for name, message in (
+                    ("CardholderName", "Enter cardholder name"),
+                    ("CardNumber", "Wrong card number"),
+                    ("CardCode", "Wrong card code"),
+                )
+                if not self.form_value(name).strip()
+            ]
+            if errors:
+                return json_response({"error": 1, "message": errors})
+            self.customer.checkout["payment_info"] = {
+                "CreditCardType": self.form_value("CreditCardType"),
+                "CardholderName": self.form_value("CardholderName"),
+            }
+
+        return json_response(
+            {
+                "update_section": {
+                    "name": "confirm-order",
+                    "html": templates.confirm_order_section(
+                        self.server.store.cart_items(self.customer)
+                    ),
+                },
+                "goto_section": "confirm_order",
+            }
+        )
+
+    def confirm_order(self):
+        error = self._checkout_error()
+        if error:
+            return error
+
+        missing = [
+            step
+            for step in (
+                "billing_address",
+                "shipping_address",
+                "shipping_method",
+                "payment_method",
+            )
+            if step not in self.customer.checkout
+        ]
+        if missing:
+            return json_response(
+                {"error": 1, "message": f"Checkout is not complete: {missing}"}
+            )
+
+        order_id = self.server.store.place_order(self.customer)
+        self.customer.checkout["last_order_id"] = order_id
+        return json_response({"redirect": "/checkout/completed"})
+
+    def order_completed(self):
+        order_id = self.customer.checkout.get("last_order_id")
+        if order_id is None:
+            return redirect("/")
+        return self.page(
+            "Checkout", templates.order_completed_page(order_id), "order-completed-page"
+        )
+
+
+def _routes(table) -> List[Tuple[re.Pattern, Callable]]:
+    return [(re.compile(pattern, re.IGNORECASE), handler) for pattern, handler in table]
+
+
+CATEGORY_PATTERN = "/(" + "|".join(category.slug for category in CATEGORIES) + ")"
+
+GET_ROUTES = _routes(
+    [
+        ("/", StorefrontHandler.home),
+        ("/js/([a-z.]+)", StorefrontHandler.static),
+        ("/register", StorefrontHandler.register_form),
+        ("/registerresult/(\\d+)", StorefrontHandler.register_result),
+        ("/login", StorefrontHandler.login_form),
+        ("/logout", StorefrontHandler.logout),
+        ("/cart", StorefrontHandler.cart),
+        ("/onepagecheckout", StorefrontHandler.one_page_checkout),
+        ("/checkout/completed/?", StorefrontHandler.order_completed),
+        ("/country/getstatesbycountryid", StorefrontHandler.states),
+        (CATEGORY_PATTERN, StorefrontHandler.category),
+        ("/([a-z0-9-]+)", StorefrontHandler.product),
+    ]
+)
+
+POST_ROUTES = _routes(
+    [
+        ("/register", StorefrontHandler.register),
+        ("/login", StorefrontHandler.login),
+        ("/cart", StorefrontHandler.update_cart),
+        ("/addproducttocart/details/(\\d+)/1", StorefrontHandler.add_to_cart_details),
+        (
+            "/addproducttocart/catalog/(\\d+)/1/(\\d+)",
+            StorefrontHandler.add_to_cart_catalog,
+        ),
+        ("/checkout/OpcSaveBilling/?", StorefrontHandler.save_billing),
+        ("/checkout/OpcSaveShipping/?", StorefrontHandler.save_shipping),
+        ("/checkout/OpcSaveShippingMethod/?", StorefrontHandler.save_shipping_method),
+        ("/checkout/OpcSavePaymentMethod/?", StorefrontHandler.save_payment_method),
+        ("/checkout/OpcSavePaymentInfo/?", StorefrontHandler.save_payment_info),
+        ("/checkout/OpcConfirmOrder/?", StorefrontHandler.confirm_order),
+    ]
+)
+
+
+class StorefrontServer(ThreadingHTTPServer):
+    """
+    The stand-in storefront, served from a background thread.
+    """
+
+    daemon_threads = True
+    get_routes = GET_ROUTES
+    post_routes = POST_ROUTES
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        accounts_file: Optional[Path] = None,
+    ):
+        super().__init__((host, port), StorefrontHandler)
+        self.store = Store(accounts_file)
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StorefrontServer":
+        self.thread = threading.Thread(
+            target=self.serve_forever, name="storefront", daemon=True
+        )
+        self.thread.start()
+        LOGGER.info("Local storefront listening", url=self.base_url)
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self.thread:
+            self.thread.join()
+        LOGGER.info("Local storefront stopped")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--accounts-file", type=Path, default=None)
+    args = parser.parse_args()
+
+    server = StorefrontServer(args.host, args.port, args.accounts_file)
+    print(f"Serving the stand-in storefront on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+/*
+ * Client side behaviour of the stand-in storefront, mirroring the globals of the
+ * nopCommerce public scripts (setLocation, AjaxCart, Checkout, ...) used by the suite.
+ */
+
+function setLocation(url) {
+  window.location.href = url;
+}
+
+function getToken() {
+  var input = document.querySelector('input[name="__RequestVerificationToken"]');
+  return input ? input.value : '';
+}
+
+function postForm(url, data) {
+  var body = new URLSearchParams();
+  if (data) {
+    data.forEach(function (value, key) {
+      body.append(key, value);
+    });
+  }
+  body.set('__RequestVerificationToken', getToken());
+  return fetch(url, {
+    method: 'POST',
+    body: body,
+    credentials: 'same-origin',
+    headers: { 'X-Requested-With': 'XMLHttpRequest' },
+  }).then(function (response) {
+    return response.json();
+  });
+}
+
+function displayBarNotification(message, type) {
+  var container = document.getElementById('bar-notification');
+  container.innerHTML = '';
+
+  var bar = document.createElement('div');
+  bar.className = 'bar-notification ' + type;
+
+  var content = document.createElement('p');
+  content.className = 'content';
+  content.innerHTML = message;
+
+  var close = document.createElement('span');
+  close.className = 'close';
+  close.title = 'Close';
+  close.onclick = function () {
+    bar.style.display = 'none';
+  };
+
+  bar.appendChild(content);
+  bar.appendChild(close);
+  container.appendChild(bar);
+}
+
+var AjaxCart = {
+  addproducttocart_details: function (url, formSelector) {
+    var form = document.querySelector(formSelector);
+    return postForm(url, new FormData(form)).then(AjaxCart.success);
+  },
+
+  addproducttocart_catalog: function (url) {
+    return postForm(url, null).then(AjaxCart.success);
+  },
+
+  success: function (response) {
+    if (response.updatetopcartsectionhtml) {
+      document.querySelectorAll('.cart-qty').forEach(function (element) {
+        element.textContent = response.updatetopcartsectionhtml;
+      });
+    }
+    if (response.message) {
+      displayBarNotification(response.message, response.success ? 'success' : 'error');
+    }
+    if (response.redirect) {
+      setLocation(response.redirect);
+    }
+  },
+};
+
+function toggleShipToSameAddress(event, section) {
+  // Clicking anywhere on the section toggles the checkbox, like the label does
+  if (event.target.tagName === 'INPUT' || event.target.tagName === 'LABEL') {
+    return;
+  }
+  var checkbox = section.querySelector('input[type="checkbox"]');
+  checkbox.checked = !checkbox.checked;
+}
+
+function loadStates(countrySelect, stateSelectId) {
+  var stateSelect = document.getElementById(stateSelectId);
+  fetch('/country/getstatesbycountryid?countryId=' + countrySelect.value, {
+    credentials: 'same-origin',
+    headers: { 'X-Requested-With': 'XMLHttpRequest' },
+  })
+    .then(function (response) {
+      return response.json();
+    })
+    .then(function (states) {
+      stateSelect.innerHTML = '';
+      states.forEach(function (state) {
+        var option = document.createElement('option');
+        option.value = state.id;
+        option.textContent = state.name;
+        stateSelect.appendChild(option);
+      });
+    });
+}
+
+function toggleNewAddress(select, formId) {
+  var form = document.getElementById(formId);
+  form.style.display = select.value === '' ? 'block' : 'none';
+}
+
+var Checkout = {
+  steps: ['billing', 'shipping', 'shipping_method', 'payment_method', 'payment_info', 'confirm_order'],
+
+  gotoSection: function (section) {
+    Checkout.steps.forEach(function (step) {
+      var tab = document.getElementById('opc-' + step);
+      var content = document.getElementById('checkout-step-' + step);
+      var active = step === section;
+      tab.classList.toggle('active', active);
+      if (active) {
+        tab.classList.add('allow');
+      }
+      content.style.display = active ? 'block' : 'none';
+    });
+  },
+
+  setStepResponse: function (response) {
+    document.querySelectorAll('.checkout-data .message-error').forEach(function (element) {
+      element.remove();
+    });
+
+    if (response.error) {
+      var message = Array.isArray(response.message) ? response.message.join('\n') : response.message;
+      var error = document.createElement('div');
+      error.className = 'message-error';
+      error.textContent = message;
+      document.querySelector('.checkout-data').prepend(error);
+      return false;
+    }
+    if (response.update_section) {
+      document.getElementById('checkout-' + response.update_section.name + '-load').innerHTML =
+        response.update_section.html;
+    }
+    if (response.goto_section) {
+      Checkout.gotoSection(response.goto_section);
+      return true;
+    }
+    if (response.redirect) {
+      setLocation(response.redirect);
+      return true;
+    }
+    return false;
+  },
+
+  save: function (step, url, formId) {
+    var button = document.querySelector('#' + step + '-buttons-container button');
+    var pleaseWait = document.getElementById(step + '-please-wait');
+    var form = formId ? document.getElementById(formId) : null;
+
+    button.disabled = true;
+    pleaseWait.style.display = 'inline';
+
+    return postForm(url, form ? new FormData(form) : null)
+      .then(Checkout.setStepResponse)
+      .finally(function () {
+        button.disabled = false;
+        pleaseWait.style.display = 'none';
+      });
+  },
+};
+
+var Billing = {
+  save: function () {
+    return Checkout.save('billing', '/checkout/OpcSaveBilling/', 'co-billing-form');
+  },
+};
+
+var Shipping = {
+  save: function () {
+    return Checkout.save('shipping', '/checkout/OpcSaveShipping/', 'co-shipping-form');
+  },
+};
+
+var ShippingMethod = {
+  save: function () {
+    return Checkout.save('shipping-method', '/checkout/OpcSaveShippingMethod/', 'co-shipping-method-form');
+  },
+};
+
+var PaymentMethod = {
+  save: function () {
+    return Checkout.save('payment-method', '/checkout/OpcSavePaymentMethod/', 'co-payment-method-form');
+  },
+};
+
+var PaymentInfo = {
+  save: function () {
+    return Checkout.save('payment-info', '/checkout/OpcSavePaymentInfo/', 'co-payment-info-form');
+  },
+};
+
+var ConfirmOrder = {
+  save: function () {
+    return Checkout.save('confirm-order', '/checkout/OpcConfirmOrder/', null);
+  },
+};
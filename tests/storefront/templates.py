@@ -0,0 +1,580 @@
+from html import escape
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from tests.storefront.data import (
+    CARD_TYPES,
+    CATEGORIES,
+    COUNTRIES,
+    PAYMENT_METHODS,
+    SHIPPING_METHODS,
+    STATES,
+    Product,
+)
+
+STYLES = """
+body { font-family: Arial, sans-serif; margin: 0; }
+.header, .header-menu, .master-wrapper-content, .footer { width: 960px; margin: 0 auto; }
+.header-links ul, .top-menu { list-style: none; padding: 0; display: flex; gap: 16px; }
+.header-links a, .top-menu a { display: inline-block; padding: 4px 8px; }
+.bar-notification { position: fixed; top: 0; left: 0; right: 0; padding: 16px; }
+.bar-notification.success { background: #4bb07a; color: #fff; }
+.bar-notification.error { background: #e4444c; color: #fff; }
+.bar-notification .content { display: inline-block; margin: 0 32px 0 0; }
+.bar-notification .close { display: inline-block; width: 16px; height: 16px;
+  cursor: pointer; background: #fff; }
+.item-grid { display: flex; flex-wrap: wrap; gap: 16px; }
+.item-box { width: 220px; }
+.product-item { border: 1px solid #ddd; cursor: pointer; }
+.product-item .picture { height: 160px; background: #f2f2f2; }
+.product-item .picture a { display: block; height: 100%; }
+.product-item .details { padding: 8px; }
+.inputs { margin: 8px 0; }
+.inputs label { display: inline-block; width: 160px; }
+.field-validation-error { color: #e4444c; }
+.message-error { color: #e4444c; }
+.tab-section .step { padding: 8px 0; }
+.cart td, .cart th { padding: 4px 8px; }
+.remove-btn { width: 24px; height: 24px; }
+.section.ship-to-same-address { padding: 8px; }
+"""
+
+
+def token_input(token: str) -> str:
+    return (
+        '<input name="__RequestVerificationToken" type="hidden"'
+        f' value="{escape(token)}" />'
+    )
+
+
+def layout(
+    title: str,
+    body: str,
+    token: str,
+    registered: bool,
+    cart_quantity: int,
+    page_class: str = "",
+) -> str:
+    if registered:
+        header_links = (
+            '<li><a href="/customer/info" class="ico-account">My account</a></li>'
+            '<li><a href="/logout" class="ico-logout">Log out</a></li>'
+        )
+    else:
+        header_links = (
+            '<li><a href="/register?returnUrl=%2F"'
+            ' class="ico-register">Register</a></li><li><a href="/login?returnUrl=%2F"'
+            ' class="ico-login">Log in</a></li>'
+        )
+
+    menu = "".join(
+        f'<li><a href="/{category.slug}">{escape(category.name)}</a></li>'
+        for category in CATEGORIES
+    )
+
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8" />
+<title>nopCommerce demo store. {escape(title)}</title>
+<style>{STYLES}</style>
+<script src="/js/public.js"></script>
+</head>
+<body>
+<div id="bar-notification" class="bar-notification-container"></div>
+<div class="master-wrapper-page">
+<div class="header">
+<div class="header-links-wrapper"><div class="header-links"><ul>
+{header_links}
+<li id="topcartlink"><a href="/cart" class="ico-cart">
+<span class="cart-label">Shopping cart</span>
+<span class="cart-qty">({cart_quantity})</span></a></li>
+</ul></div></div>
+<div class="header-logo"><a href="/">nopCommerce demo store</a></div>
+</div>
+<div class="header-menu"><ul class="top-menu notmobile">{menu}</ul></div>
+<div class="master-wrapper-content">
+<div class="page {page_class}">
+{body}
+</div>
+</div>
+<div class="footer"><form id="footer-form">{token_input(token)}</form></div>
+</div>
+</body>
+</html>"""
+
+
+def home_page() -> str:
+    return """<div class="page-body">
+<div class="topic-block"><div class="topic-block-title"><h2>Welcome to our store</h2></div></div>
+</div>"""
+
+
+def field_error(errors: Dict[str, str], field: str) -> str:
+    if field not in errors:
+        return ""
+    return (
+        f'<span class="field-validation-error" data-valmsg-for="{field}">'
+        f'<span id="{field}-error">{errors[field]}</span></span>'
+    )
+
+
+def summary_errors(messages: Iterable[str]) -> str:
+    items = "".join(f"<li>{escape(message)}</li>" for message in messages)
+    if not items:
+        return ""
+    return (
+        f'<div class="message-error validation-summary-errors"><ul>{items}</ul></div>'
+    )
+
+
+def text_input(
+    field: str,
+    label: str,
+    values: Dict[str, str],
+    errors: Dict[str, str],
+    input_type: str = "text",
+    input_id: Optional[str] = None,
+) -> str:
+    input_id = input_id or field.replace(".", "_")
+    value = "" if input_type == "password" else escape(values.get(field, ""))
+    return (
+        f'<div class="inputs"><label for="{input_id}">{label}:</label>'
+        f'<input type="{input_type}" id="{input_id}" name="{field}" value="{value}" />'
+        f"{field_error(errors, field)}</div>"
+    )
+
+
+def options(choices: Iterable[Tuple[object, str]], selected: Optional[str]) -> str:
+    return "".join(
+        f'<option value="{value}"'
+        f'{" selected" if str(value) == str(selected) else ""}>{escape(text)}</option>'
+        for value, text in choices
+    )
+
+
+def register_page(
+    values: Dict[str, str], errors: Dict[str, str], messages: List[str], token: str
+) -> str:
+    months = [
+        "January", "February", "March", "April", "May", "June",
+        "July", "August", "September", "October", "November", "December",
+    ]  # fmt: skip
+    day_options = options(
+        [(0, "Day")] + [(day, str(day)) for day in range(1, 32)],
+        values.get("DateOfBirthDay"),
+    )
+    month_options = options(
+        [(0, "Month")] + [(index + 1, month) for index, month in enumerate(months)],
+        values.get("DateOfBirthMonth"),
+    )
+    year_options = options(
+        [(0, "Year")] + [(year, str(year)) for year in range(1914, 2025)],
+        values.get("DateOfBirthYear"),
+    )
+    newsletter = " checked" if values.get("Newsletter") else ""
+
+    return f"""<div class="page-title"><h1>Register</h1></div>
+<div class="page-body">
+<form method="post" action="/register?returnUrl=%2F" id="register-form">
+{summary_errors(messages)}
+<div class="fieldset"><div class="title"><strong>Your Personal Details</strong></div>
+<div class="form-fields">
+<div class="inputs"><label>Gender:</label><div id="gender" class="gender">
+<span class="male"><input type="radio" value="M" id="gender-male" name="Gender" />
+<label class="forcheckbox" for="gender-male">Male</label></span>
+<span class="female"><input type="radio" value="F" id="gender-female" name="Gender" />
+<label class="forcheckbox" for="gender-female">Female</label></span>
+</div></div>
+{text_input("FirstName", "First name", values, errors)}
+{text_input("LastName", "Last name", values, errors)}
+<div class="inputs date-of-birth"><label>Date of birth:</label>
+<div class="date-picker-wrapper">
+<select name="DateOfBirthDay">{day_options}</select>
+<select name="DateOfBirthMonth">{month_options}</select>
+<select name="DateOfBirthYear">{year_options}</select>
+</div></div>
+{text_input("Email", "Email", values, errors, input_type="email")}
+</div></div>
+<div class="fieldset"><div class="title"><strong>Company Details</strong></div>
+<div class="form-fields">{text_input("Company", "Company name", values, errors)}</div></div>
+<div class="fieldset"><div class="title"><strong>Options</strong></div>
+<div class="form-fields"><div class="inputs"><label for="Newsletter">Newsletter:</label>
+<input type="checkbox" id="Newsletter" name="Newsletter" value="true"{newsletter} />
+</div></div></div>
+<div class="fieldset"><div class="title"><strong>Your Password</strong></div>
+<div class="form-fields">
+{text_input("Password", "Password", values, errors, input_type="password")}
+{text_input("ConfirmPassword", "Confirm password", values, errors, input_type="password")}
+</div></div>
+<div class="buttons"><button type="submit" id="register-button"
+ class="button-1 register-next-step-button" name="register-button">Register</button></div>
+{token_input(token)}
+</form>
+</div>"""
+
+
+def register_result_page() -> str:
+    return """<div class="page-title"><h1>Register</h1></div>
+<div class="page-body">
+<div class="result">Your registration completed</div>
+<div class="buttons"><a href="/" class="button-1 register-continue-button">Continue</a></div>
+</div>"""
+
+
+def login_page(email: str, messages: List[str], return_url: str, token: str) -> str:
+    return f"""<div class="page-title"><h1>Welcome, Please Sign In!</h1></div>
+<div class="page-body">
+<div class="returning-wrapper fieldset">
+<form method="post" action="/login?returnUrl={escape(return_url)}" id="login-form">
+{summary_errors(messages)}
+<div class="title"><strong>Returning Customer</strong></div>
+<div class="form-fields">
+<div class="inputs"><label for="Email">Email:</label>
+<input class="email" type="email" id="Email" name="Email" value="{escape(email)}" /></div>
+<div class="inputs"><label for="Password">Password:</label>
+<input class="password" type="password" id="Password" name="Password" /></div>
+<div class="inputs reversed"><input type="checkbox" id="RememberMe" name="RememberMe"
+ value="true" /><label for="RememberMe">Remember me?</label></div>
+</div>
+<div class="buttons"><button type="submit" class="button-1 login-button">Log in</button></div>
+{token_input(token)}
+</form>
+</div>
+</div>"""
+
+
+def price(amount) -> str:
+    return f"${amount:,.2f}"
+
+
+def category_page(name: str, products: List[Product]) -> str:
+    items = "".join(
+        f"""<div class="item-box">
+<div class="product-item" data-productid="{product.id}"
+ onclick="if (event.target.tagName !== 'BUTTON') setLocation('/{product.slug}')">
+<div class="picture"><a href="/{product.slug}" title="Show details for {escape(product.name)}"></a></div>
+<div class="details">
+<h2 class="product-title"><a href="/{product.slug}">{escape(product.name)}</a></h2>
+<div class="prices"><span class="price actual-price">{price(product.price)}</span></div>
+<div class="buttons"><button type="button" class="button-2 product-box-add-to-cart-button"
+ onclick="AjaxCart.addproducttocart_catalog('/addproducttocart/catalog/{product.id}/1/1');return false;">Add to cart</button></div>
+</div>
+</div>
+</div>"""
+        for product in products
+    )
+    return f"""<div class="page-title"><h1>{escape(name)}</h1></div>
+<div class="page-body">
+<div class="products-container"><div class="products-wrapper"><div class="product-grid">
+<div class="item-grid">{items}</div>
+</div></div></div>
+</div>"""
+
+
+def product_page(product: Product, token: str) -> str:
+    return f"""<div class="page-body">
+<form method="post" id="product-details-form">
+<div data-productid="{product.id}">
+<div class="product-essential">
+<div class="overview">
+<div class="product-name"><h1>{escape(product.name)}</h1></div>
+<div class="additional-details"><div class="sku"><span class="label">SKU:</span>
+<span class="value" id="sku-{product.id}">{product.sku}</span></div></div>
+<div class="prices"><div class="product-price">
+<span id="price-value-{product.id}" class="price-value-{product.id}">{price(product.price)}</span>
+</div></div>
+<div class="add-to-cart"><div class="add-to-cart-panel">
+<input id="product_enteredQuantity_{product.id}" class="qty-input" type="text"
+ name="addtocart_{product.id}.EnteredQuantity" value="1" />
+<button type="button" id="add-to-cart-button-{product.id}" class="button-1 add-to-cart-button"
+ data-productid="{product.id}"
+ onclick="AjaxCart.addproducttocart_details('/addproducttocart/details/{product.id}/1', '#product-details-form');return false;">Add to cart</button>
+</div></div>
+</div>
+</div>
+</div>
+{token_input(token)}
+</form>
+</div>"""
+
+
+def cart_page(items: List[dict], messages: List[str], token: str) -> str:
+    if not items:
+        return """<div class="page-title"><h1>Shopping cart</h1></div>
+<div class="page-body"><div class="order-summary-content">
+<div class="no-data">Your Shopping Cart is empty!</div>
+</div></div>"""
+
+    rows = "".join(
+        f"""<tr>
+<td class="sku"><label class="td-title">SKU:</label><span class="sku-number">{item["sku"]}</span></td>
+<td class="product-picture"><a href="/{item["slug"]}"></a></td>
+<td class="product"><a href="/{item["slug"]}" class="product-name">{escape(item["name"])}</a></td>
+<td class="unit-price"><label class="td-title">Price:</label><span class="product-unit-price">{price(item["unit_price"])}</span></td>
+<td class="quantity"><label class="td-title" for="itemquantity{item["id"]}">Qty.:</label>
+<input id="itemquantity{item["id"]}" name="itemquantity{item["id"]}" type="number" value="{item["quantity"]}" class="qty-input" aria-label="Qty." /></td>
+<td class="subtotal"><label class="td-title">Total:</label><span class="product-subtotal">{price(item["subtotal"])}</span></td>
+<td class="remove-from-cart">
+<input type="checkbox" name="removefromcart" id="removefromcart{item["id"]}" value="{item["id"]}" aria-label="Remove" style="display: none" />
+<button type="button" name="updatecart" class="remove-btn"
+ onclick="document.getElementById('removefromcart{item["id"]}').checked = true;"></button>
+</td>
+</tr>"""
+        for item in items
+    )
+    total = sum(item["subtotal"] for item in items)
+
+    return f"""<div class="page-title"><h1>Shopping cart</h1></div>
+<div class="page-body"><div class="order-summary-content">
+<form method="post" action="/cart" id="shopping-cart-form">
+{summary_errors(messages)}
+<div class="table-wrapper"><table class="cart">
+<thead><tr>
+<th class="sku">SKU</th><th class="product-picture">Image</th><th class="product">Product(s)</th>
+<th class="unit-price">Price</th><th class="quantity">Qty.</th><th class="subtotal">Total</th>
+<th class="remove-from-cart">Remove</th>
+</tr></thead>
+<tbody>{rows}</tbody>
+</table></div>
+<div class="cart-options"><div class="common-buttons">
+<button type="submit" name="updatecart" class="button-2 update-cart-button">Update shopping cart</button>
+<button type="submit" name="continueshopping" class="button-2 continue-shopping-button">Continue shopping</button>
+</div></div>
+<div class="cart-footer"><div class="totals">
+<div class="total-info"><span class="value-summary"><strong>{price(total)}</strong></span></div>
+<div id="terms-of-service-warning-box" style="display: none">Please accept the terms of service before the next step.</div>
+<div class="terms-of-service"><input id="termsofservice" type="checkbox" name="termsofservice" value="true" />
+<label for="termsofservice">I agree with the terms of service and I adhere to them unconditionally</label></div>
+<div class="checkout-buttons"><button type="submit" id="checkout" name="checkout" value="checkout"
+ class="button-1 checkout-button"
+ onclick="if (!document.getElementById('termsofservice').checked) {{ document.getElementById('terms-of-service-warning-box').style.display = 'block'; return false; }}">Checkout</button></div>
+</div></div>
+{token_input(token)}
+</form>
+</div></div>"""
+
+
+def address_fields(prefix: str, address: Dict[str, str]) -> str:
+    country_id = address.get("CountryId", "0")
+    country_choices = [(0, "Select country")] + COUNTRIES
+    state_choices = STATES.get(int(country_id or 0), [(0, "Other")])
+
+    def field(name: str, label: str) -> str:
+        return (
+            f'<div class="inputs"><label for="{prefix}_{name}">{label}:</label>'
+            f'<input type="text" id="{prefix}_{name}" name="{prefix}.{name}"'
+            f' value="{escape(address.get(name, ""))}" /></div>'
+        )
+
+    return f"""<div class="edit-address">
+{field("FirstName", "First name")}
+{field("LastName", "Last name")}
+{field("Email", "Email")}
+{field("Company", "Company")}
+<div class="inputs"><label for="{prefix}_CountryId">Country:</label>
+<select id="{prefix}_CountryId" name="{prefix}.CountryId"
+ onchange="loadStates(this, '{prefix}_StateProvinceId')">{options(country_choices, country_id)}</select></div>
+<div class="inputs"><label for="{prefix}_StateProvinceId">State / province:</label>
+<select id="{prefix}_StateProvinceId" name="{prefix}.StateProvinceId">{options(state_choices, address.get("StateProvinceId"))}</select></div>
+{field("City", "City")}
+{field("Address1", "Address 1")}
+{field("Address2", "Address 2")}
+{field("ZipPostalCode", "Zip / postal code")}
+{field("PhoneNumber", "Phone number")}
+{field("FaxNumber", "Fax number")}
+</div>"""
+
+
+def billing_section(addresses: List[Dict[str, str]], address: Dict[str, str]) -> str:
+    # Like nopCommerce, a customer with saved addresses picks one of them and only
+    # sees the new address form after selecting "New Address"
+    select = ""
+    new_address_display = "block"
+    if addresses:
+        existing = [
+            (index, describe_address(saved)) for index, saved in enumerate(addresses)
+        ]
+        select = f"""<div class="section select-billing-address"><label for="billing-address-select">Select a billing address from your address book or enter a new address.</label>
+<div><select name="billing_address_id" id="billing-address-select" class="address-select"
+ onchange="toggleNewAddress(this, 'billing-new-address-form')">{options(existing + [("", "New Address")], 0)}</select></div></div>"""
+        new_address_display = "none"
+
+    return f"""<form id="co-billing-form" action="">
+<div class="checkout-data">
+<div class="section ship-to-same-address" onclick="toggleShipToSameAddress(event, this)">
+<p class="selector"><input type="checkbox" id="ShipToSameAddress" name="ShipToSameAddress" value="true" checked />
+<label for="ShipToSameAddress">Ship to the same address</label></p>
+</div>
+{select}
+<div class="section new-billing-address" id="billing-new-address-form" style="display: {new_address_display}"><div class="title"><strong>New Address</strong></div>
+{address_fields("BillingNewAddress", address)}
+</div>
+</div>
+</form>
+<div class="buttons" id="billing-buttons-container">
+<button type="button" name="save" class="button-1 new-address-next-step-button" onclick="Billing.save()">Continue</button>
+<span class="please-wait" id="billing-please-wait" style="display: none">Submitting...</span>
+</div>"""
+
+
+def describe_address(address: Dict[str, str]) -> str:
+    return ", ".join(
+        value
+        for value in (
+            f'{address.get("FirstName", "")} {address.get("LastName", "")}'.strip(),
+            address.get("Address1", ""),
+            address.get("City", ""),
+            address.get("ZipPostalCode", ""),
+        )
+        if value
+    )
+
+
+def shipping_section(addresses: List[Dict[str, str]], email: str) -> str:
+    existing = [
+        (index, describe_address(address)) for index, address in enumerate(addresses)
+    ]
+    select_options = options(existing + [("", "New Address")], 0 if existing else "")
+    new_address_display = "none" if existing else "block"
+
+    return f"""<form id="co-shipping-form" action="">
+<div class="checkout-data">
+<div class="section select-shipping-address"><label for="shipping-address-select">Select a shipping address from your address book or enter a new address.</label>
+<div><select name="shipping_address_id" id="shipping-address-select" class="address-select"
+ onchange="toggleNewAddress(this, 'shipping-new-address-form')">{select_options}</select></div></div>
+<div class="section new-shipping-address" id="shipping-new-address-form" style="display: {new_address_display}">
+{address_fields("ShippingNewAddress", {"Email": email})}
+</div>
+</div>
+</form>
+<div class="buttons" id="shipping-buttons-container">
+<button type="button" class="button-1 new-address-next-step-button" onclick="Shipping.save()">Continue</button><span class="please-wait" id="shipping-please-wait" style="display: none">Loading next step...</span>
+</div>"""
+
+
+def shipping_method_section() -> str:
+    methods = "".join(
+        f"""<li><div class="method-name">
+<input id="shippingoption_{index}" type="radio" name="shippingoption" value="{escape(name)}___{system_name}"{" checked" if index == 1 else ""} />
+<label for="shippingoption_{index}">{escape(name)} ({price(rate)})</label></div></li>"""
+        for index, (name, system_name, rate) in enumerate(SHIPPING_METHODS, start=1)
+    )
+    return f"""<form id="co-shipping-method-form" action="">
+<div class="checkout-data"><div class="section shipping-method"><ul class="method-list">{methods}</ul></div></div>
+</form>
+<div class="buttons" id="shipping-method-buttons-container">
+<button type="button" class="button-1 shipping-method-next-step-button" onclick="ShippingMethod.save()">Continue</button>
+<span class="please-wait" id="shipping-method-please-wait" style="display: none">Loading next step...</span>
+</div>"""
+
+
+def payment_method_section() -> str:
+    methods = "".join(
+        f"""<li><div class="method-name">
+<input id="paymentmethod_{index}" type="radio" name="paymentmethod" value="{system_name}"{" checked" if index == 0 else ""} />
+<label for="paymentmethod_{index}">{escape(name)}</label></div></li>"""
+        for index, (system_name, name) in enumerate(PAYMENT_METHODS)
+    )
+    return f"""<form id="co-payment-method-form" action="">
+<div class="checkout-data"><div class="section payment-method"><ul class="method-list">{methods}</ul></div></div>
+</form>
+<div class="buttons" id="payment-method-buttons-container">
+<button type="button" name="save" class="button-1 payment-method-next-step-button" onclick="PaymentMethod.save()">Continue</button>
+<span class="please-wait" id="payment-method-please-wait" style="display: none">Loading next step...</span>
+</div>"""
+
+
+def payment_info_section(payment_method: str) -> str:
+    if payment_method == "Payments.Manual":
+        months = options([(month, f"{month:02d}") for month in range(1, 13)], None)
+        years = options([(year, str(year)) for year in range(2024, 2040)], None)
+        info = f"""<table><tbody>
+<tr><td><label for="CreditCardType">Select credit card:</label></td>
+<td><select id="CreditCardType" name="CreditCardType">{options(CARD_TYPES, None)}</select></td></tr>
+<tr><td><label for="CardholderName">Cardholder name:</label></td>
+<td><input type="text" id="CardholderName" name="CardholderName" /></td></tr>
+<tr><td><label for="CardNumber">Card number:</label></td>
+<td><input type="text" id="CardNumber" name="CardNumber" maxlength="22" /></td></tr>
+<tr><td><label for="ExpireMonth">Expiration date:</label></td>
+<td><select id="ExpireMonth" name="ExpireMonth">{months}</select>
+<select id="ExpireYear" name="ExpireYear">{years}</select></td></tr>
+<tr><td><label for="CardCode">Card code:</label></td>
+<td><input type="text" id="CardCode" name="CardCode" maxlength="4" /></td></tr>
+</tbody></table>"""
+    else:
+        info = (
+            "<p>Mail Personal or Business Check, Cashier's Check or money order to the"
+            " store owner.</p>"
+        )
+
+    return f"""<form id="co-payment-info-form" action="">
+<div class="checkout-data"><div class="section payment-info"><div class="info">{info}</div></div></div>
+</form>
+<div class="buttons" id="payment-info-buttons-container">
+<button type="button" class="button-1 payment-info-next-step-button" onclick="PaymentInfo.save()">Continue</button>
+<span class="please-wait" id="payment-info-please-wait" style="display: none">Loading next step...</span>
+</div>"""
+
+
+def confirm_order_section(items: List[dict]) -> str:
+    lines = "".join(
+        f'<tr><td class="product">{escape(item["name"])}</td>'
+        f'<td class="quantity">{item["quantity"]}</td>'
+        f'<td class="subtotal">{price(item["subtotal"])}</td></tr>'
+        for item in items
+    )
+    total = sum(item["subtotal"] for item in items)
+    return f"""<div class="checkout-data"><div class="section order-summary">
+<table class="cart"><tbody>{lines}</tbody></table>
+<div class="order-total"><strong>{price(total)}</strong></div>
+</div></div>
+<div class="buttons" id="confirm-order-buttons-container">
+<button type="button" class="button-1 confirm-order-next-step-button" onclick="ConfirmOrder.save()">Confirm</button>
+<span class="please-wait" id="confirm-order-please-wait" style="display: none">Submitting order information...</span>
+</div>"""
+
+
+# Step name, as in the opc-* and checkout-step-* ids and goto_section, the section
+# name, as in the checkout-*-load ids and update_section, and the step title
+CHECKOUT_STEPS = [
+    ("billing", "billing", "Billing address"),
+    ("shipping", "shipping", "Shipping address"),
+    ("shipping_method", "shipping-method", "Shipping method"),
+    ("payment_method", "payment-method", "Payment method"),
+    ("payment_info", "payment-info", "Payment information"),
+    ("confirm_order", "confirm-order", "Confirm order"),
+]
+
+
+def one_page_checkout_page(billing_html: str, token: str) -> str:
+    steps = "".join(
+        f"""<li id="opc-{name}" class="tab-section{" allow active" if name == "billing" else ""}">
+<div class="step-title"><span class="number">{number}</span><h2 class="title">{title}</h2></div>
+<div id="checkout-step-{name}" class="step a-item" style="display: {"block" if name == "billing" else "none"}">
+<div id="checkout-{section}-load">{billing_html if name == "billing" else ""}</div>
+</div>
+</li>"""
+        for number, (name, section, title) in enumerate(CHECKOUT_STEPS, start=1)
+    )
+    return f"""<div class="page-title"><h1>Checkout</h1></div>
+<div class="page-body checkout-data">
+<ol class="opc" id="checkout-steps">{steps}</ol>
+<form id="opc-token-form">{token_input(token)}</form>
+</div>"""
+
+
+def order_completed_page(order_id: int) -> str:
+    return f"""<div class="page-title"><h1>Thank you</h1></div>
+<div class="page-body checkout-data">
+<div class="section order-completed">
+<div class="title"><strong>Your order has been successfully processed!</strong></div>
+<div class="details"><div class="order-number"><strong>Order number: {order_id}</strong></div></div>
+<div class="buttons"><button type="button" class="button-1 order-completed-continue-button"
+ onclick="setLocation('/')">Continue</button></div>
+</div>
+</div>"""
+
+
+def not_found_page() -> str:
+    return """<div class="page-title"><h1>Page not found</h1></div>
+<div class="page-body">The page you requested was not found.</div>"""
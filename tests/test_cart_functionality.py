@@ -6,13 +6,11 @@ from selenium import webdriver
 from selenium.webdriver.support.wait import WebDriverWait
 
 from tests.helpers.utils import (
-    add_book_to_cart,
-    add_cellphone_item_to_cart,
-    add_digital_download_item_to_cart,
     get_product_quantity,
     list_products_in_cart,
     login_user,
     remove_product_from_cart,
+    seed_cart,
     update_product_quantity_in_cart,
 )
 
@@ -36,14 +34,12 @@ def test_cart_functionality(
     login_user(driver=driver, wait=wait, email=email, password=password)
 
     # 2. Add multiple products to the shopping cart
-    digital_downloads_product_name = add_digital_download_item_to_cart(
-        driver=driver, wait=wait, return_product_name=True
-    )
-    cellphone_product_name = add_cellphone_item_to_cart(
-        driver=driver, wait=wait, return_product_name=True
-    )
-    book_product_name = add_book_to_cart(
-        driver=driver, wait=wait, return_product_name=True
+    digital_downloads_product_name, cellphone_product_name, book_product_name = (
+        seed_cart(
+            driver=driver,
+            wait=wait,
+            items=[("digital-downloads", 1), ("cell-phones", 1), ("books", 1)],
+        )
     )
 
     # 3. Open the cart and verify the items are added
@@ -71,7 +67,7 @@ def test_cart_functionality(
     actual_book_product_quantity = get_product_quantity(
         driver=driver, wait=wait, product_name=book_product_name
     )
-    assert actual_book_product_quantity == str(book_product_quantity), (
+    assert actual_book_product_quantity == book_product_quantity, (
         f"Expected book product quantity: {book_product_quantity}\n"
         f"Actual book product quantity: {actual_book_product_quantity}"
     )
@@ -0,0 +1,64 @@
+from typing import Tuple
+
+from faker import Faker
+from selenium import webdriver
+from selenium.webdriver.support.wait import WebDriverWait
+
+from tests.helpers.checkout import fast_forward_checkout
+from tests.helpers.utils import (
+    confirm_order,
+    login_user,
+    seed_cart,
+    select_payment_method,
+)
+
+
+def test_checkout_from_payment_method(
+    driver: webdriver, wait: WebDriverWait, fake: Faker, auth: Tuple[str, str]
+):
+    """
+    Test checkout starting at the payment method step
+
+    :param driver: WebDriver instance
+    :param wait: WebDriverWait instance
+    :param fake: Faker instance
+    :param auth: Tuple of email and password of an existing user
+
+    :return: None
+    """
+    email, password = auth
+
+    # 1. Login with a registered user
+    login_user(driver=driver, wait=wait, email=email, password=password)
+
+    # 2. Add a product to the shopping cart
+    seed_cart(driver=driver, wait=wait, items=[("books", 1)])
+
+    # 3. Complete the billing address and shipping method steps without the UI
+    fast_forward_checkout(
+        driver=driver,
+        wait=wait,
+        to="payment_method",
+        billing_address={
+            "first_name": fake.first_name(),
+            "last_name": fake.last_name(),
+            "email": email,
+            "company": fake.company(),
+            "country": "Angola",
+            "city": fake.city(),
+            "address1": fake.street_address(),
+            "zip_code": fake.postcode(),
+            "phone_number": fake.phone_number(),
+        },
+        shipping_method="2nd day",
+    )
+
+    # 4. Select payment method
+    select_payment_method(
+        driver=driver,
+        wait=wait,
+        payment_method="cheque",
+    )
+
+    # 5. Confirm order
+    confirm_order(driver=driver, wait=wait)
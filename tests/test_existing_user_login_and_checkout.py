@@ -1,11 +1,12 @@
 from typing import Tuple
 
+import pytest
 from faker import Faker
 from selenium import webdriver
 from selenium.webdriver.support.wait import WebDriverWait
 
 from tests.helpers.utils import (
-    add_book_to_cart,
+    add_item_to_cart,
     checkout_from_cart,
     confirm_order,
     enter_billing_address,
@@ -15,6 +16,7 @@ from tests.helpers.utils import (
 )
 
 
+@pytest.mark.budgets
 def test_existing_user_login_and_checkout(
     driver: webdriver, wait: WebDriverWait, fake: Faker, auth: Tuple[str, str]
 ):
@@ -31,10 +33,10 @@ def test_existing_user_login_and_checkout(
     email, password = auth
 
     # 2. Login with the registered user
-    login_user(driver=driver, wait=wait, email=email, password=password)
+    login_user(driver=driver, wait=wait, email=email, password=password, via_ui=True)
 
     # 3. Add a product to the shopping cart
-    add_book_to_cart(driver=driver, wait=wait)
+    add_item_to_cart(driver=driver, wait=wait, category="books")
 
     # 4. Checkout
     checkout_from_cart(driver=driver, wait=wait)
@@ -107,7 +107,7 @@ def test_invalid_signup(
     :return: None
     """
     # 1. Register a new user with invalid data
-    LOGGER.info(f"Registering a new user with invalid data where - {description}")
+    LOGGER.info("Registering a new user with invalid data", description=description)
     register_user(
         driver=driver,
         wait=wait,
@@ -1,12 +1,15 @@
 from random import choice
 
+import pytest
 from faker import Faker
 from selenium import webdriver
 from selenium.webdriver.support.wait import WebDriverWait
 from structlog import get_logger
 
+from tests.helpers.config import url_for
+from tests.helpers.parallel import namespaced_email
 from tests.helpers.utils import (
-    add_book_to_cart,
+    add_item_to_cart,
     checkout_from_cart,
     confirm_order,
     enter_billing_address,
@@ -20,21 +23,25 @@ from tests.helpers.utils import (
 LOGGER = get_logger(module=__name__)
 
 
-def test_user_signup_and_checkout(driver: webdriver, wait: WebDriverWait, fake: Faker):
+@pytest.mark.budgets
+def test_user_signup_and_checkout(
+    driver: webdriver, wait: WebDriverWait, fake: Faker, namespace: str
+):
     """
     Test user signup and checkout
 
     :param driver: WebDriver instance
     :param wait: WebDriverWait instance
     :param fake: Faker instance
+    :param namespace: Data namespace of the worker
 
     :return: None
     """
     # Define the homepage url
-    homepage_url = "https://demo.nopcommerce.com/"
+    homepage_url = url_for()
 
     # Generate random email and password
-    email = fake.email()
+    email = namespaced_email(fake, namespace)
     password = fake.password()
 
     # 1. Register a new user
@@ -59,10 +66,10 @@ def test_user_signup_and_checkout(driver: webdriver, wait: WebDriverWait, fake:
     ), f"User is not redirected to the home page! Current URL: {driver.current_url}"
 
     # 2. Validate the user is successfully registered by logging in
-    login_user(driver=driver, wait=wait, email=email, password=password)
+    login_user(driver=driver, wait=wait, email=email, password=password, via_ui=True)
 
     # 3. Add a product to the shopping cart
-    add_book_to_cart(driver=driver, wait=wait)
+    add_item_to_cart(driver=driver, wait=wait, category="books")
 
     # 4. Checkout
     checkout_from_cart(driver=driver, wait=wait)
@@ -0,0 +1,133 @@
+from time import time
+from typing import Dict
+
+import pytest
+from requests import ConnectionError
+
+from tests.helpers import accounts
+from tests.helpers.accounts import LEASE_TIMEOUT, REFILL_BATCH, AccountPool
+from tests.helpers.http_client import AuthCookie, AuthCookieCache
+
+
+class FakeStorefront:
+    """
+    Storefront client keeping the registered accounts in memory.
+    """
+
+    def __init__(self):
+        self.passwords: Dict[str, str] = {}
+        self.carts_emptied = 0
+        self.down = False
+
+    def register(self, email: str, password: str, **names):
+        self.passwords[email] = password
+
+    def login(self, email: str, password: str, remember_me: bool = False):
+        if self.down:
+            raise ConnectionError("Storefront unreachable")
+        assert self.passwords.get(email) == password, "Login was unsuccessful"
+        return AuthCookie(".Nop.Authentication", email, "/", True, None)
+
+    def empty_cart(self, cookie: AuthCookie) -> int:
+        self.carts_emptied += 1
+        return 0
+
+
+@pytest.fixture
+def storefront(monkeypatch) -> FakeStorefront:
+    storefront = FakeStorefront()
+    monkeypatch.setattr(accounts, "AUTH_COOKIES", AuthCookieCache(storefront))
+    return storefront
+
+
+@pytest.fixture
+def pool(tmp_path, storefront, monkeypatch) -> AccountPool:
+    # Not topped up unless a test asks for it, so the pool only holds the accounts
+    # leased by the test
+    monkeypatch.setattr(accounts, "LOW_WATER_MARK", 0)
+    pool = AccountPool(tmp_path, "demo", "ns", client=storefront)
+    yield pool
+    pool.close()
+
+
+def leases(pool: AccountPool) -> Dict[str, dict]:
+    return pool._read()["demo"]["accounts"]
+
+
+def test_lease_registers_an_account_when_the_pool_is_empty(pool, storefront):
+    account = pool.lease()
+
+    assert account.email in storefront.passwords
+    assert leases(pool) == {
+        account.email: {
+            "password": account.password,
+            "leased_by": pool.owner,
+            "leased_at": pytest.approx(time(), abs=5),
+        }
+    }
+
+
+def test_lease_tops_up_the_pool_when_running_low(pool, monkeypatch):
+    monkeypatch.setattr(accounts, "LOW_WATER_MARK", 2)
+
+    account = pool.lease()
+    pool.close()
+
+    assert len(leases(pool)) == 1 + REFILL_BATCH
+    assert [email for email, lease in leases(pool).items() if lease["leased_by"]] == [
+        account.email
+    ]
+
+
+def test_release_returns_the_account_to_the_pool(pool, storefront):
+    account = pool.lease()
+
+    pool.release(account)
+
+    assert leases(pool)[account.email]["leased_by"] is None
+    assert storefront.carts_emptied == 1
+
+
+def test_lease_reuses_a_released_account(pool):
+    account = pool.lease()
+    pool.release(account)
+
+    assert pool.lease() == account
+    assert pool.registered == 1
+
+
+def test_lease_reclaims_an_expired_lease(tmp_path, pool, storefront):
+    account = pool.lease()
+    ledger = pool._read()
+    ledger["demo"]["accounts"][account.email].update(
+        leased_by="gw1:1", leased_at=time() - LEASE_TIMEOUT - 1
+    )
+    pool._write(ledger)
+
+    reclaimed = AccountPool(tmp_path, "demo", "ns", client=storefront).lease()
+
+    assert reclaimed == account
+    # The previous holder did not return it, its cart is emptied first
+    assert storefront.carts_emptied == 1
+
+
+def test_lease_retires_an_account_unknown_to_the_storefront(pool, storefront):
+    account = pool.lease()
+    pool.release(account)
+    del storefront.passwords[account.email]
+    accounts.AUTH_COOKIES.invalidate(account.email)
+
+    assert pool.lease() != account
+    assert account.email not in leases(pool)
+
+
+def test_lease_returns_the_account_when_the_storefront_is_down(pool, storefront):
+    account = pool.lease()
+    pool.release(account)
+    accounts.AUTH_COOKIES.invalidate(account.email)
+    storefront.down = True
+
+    with pytest.raises(ConnectionError):
+        pool.lease()
+
+    assert leases(pool)[account.email]["leased_by"] is None
@@ -0,0 +1,34 @@
+import pytest
+
+from tests.helpers.benchmark import percentile, summarise
+
+
+def test_percentile_interpolates_between_samples():
+    assert percentile([4.0, 1.0, 3.0, 2.0], 50) == 2.5
+    assert percentile([1.0, 2.0, 3.0, 4.0, 5.0], 95) == pytest.approx(4.8)
+
+
+def test_percentile_bounds():
+    samples = [3.0, 1.0, 2.0]
+
+    assert percentile(samples, 0) == 1.0
+    assert percentile(samples, 100) == 3.0
+
+
+def test_percentile_of_a_single_sample():
+    assert percentile([2.0], 99) == 2.0
+
+
+def test_summarise():
+    summary = summarise([1.0, 2.0, 3.0, 4.0, 5.0])
+
+    assert summary["runs"] == 5
+    assert summary["mean"] == 3.0
+    assert summary["median"] == 3.0
+    assert summary["p95"] == pytest.approx(4.8)
+    assert summary["p99"] == pytest.approx(4.96)
+    assert summary["stdev"] == pytest.approx(1.5811, abs=1e-4)
+
+
+def test_summarise_a_single_sample_has_no_deviation():
+    assert summarise([2.0])["stdev"] == 0.0
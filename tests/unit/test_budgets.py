@@ -0,0 +1,68 @@
+from typing import Optional
+
+from tests.helpers.budgets import Budget, evaluate_budgets
+from tests.helpers.network import StepTiming
+from tests.helpers.page_metrics import PageVisit
+
+CART_LOADED = Budget("pages", "ShoppingCartPage", "dom_content_loaded", 800)
+PAYMENT_SERVER_TIME = Budget(
+    "checkout_steps", "payment method", "server_time", 300, statistic="median"
+)
+
+
+def visit(page: str, dom_content_loaded: Optional[float]) -> PageVisit:
+    return PageVisit(
+        url="https://demo.nopcommerce.com/cart",
+        page=page,
+        test="test_checkout",
+        started=0.0,
+        ttfb=100.0,
+        dom_content_loaded=dom_content_loaded,
+        load=None,
+        transfer_size=None,
+        first_contentful_paint=None,
+        largest_contentful_paint=None,
+        cumulative_layout_shift=0.0,
+        resources=0,
+        resource_bytes=0,
+        resources_end=0.0,
+    )
+
+
+def test_evaluate_budgets_of_a_page():
+    (result,) = evaluate_budgets(
+        [CART_LOADED],
+        [
+            visit("ShoppingCartPage", 640.0),
+            visit("ShoppingCartPage", 812.0),
+            visit("ShoppingCartPage", None),
+            visit("HomePage", 2000.0),
+        ],
+        [],
+    )
+
+    assert result.samples == [640.0, 812.0]
+    assert result.value == 812.0
+    assert result.exceeded
+
+
+def test_evaluate_budgets_of_a_checkout_step_in_milliseconds():
+    (result,) = evaluate_budgets(
+        [PAYMENT_SERVER_TIME],
+        [],
+        [
+            StepTiming("payment method", 0.2, 0.25, 0.4),
+            StepTiming("payment method", 0.5, 0.55, 0.7),
+            StepTiming("payment method", 0.1, 0.15, 0.3),
+            StepTiming("payment method", None, None, 0.3),
+            StepTiming("shipping method", 2.0, 2.1, 2.2),
+        ],
+    )
+
+    assert result.samples == [200.0, 500.0, 100.0]
+    assert result.value == 200.0
+    assert not result.exceeded
+
+
+def test_evaluate_budgets_skips_budgets_not_measured():
+    assert evaluate_budgets([CART_LOADED, PAYMENT_SERVER_TIME], [], []) == []
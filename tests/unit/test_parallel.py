@@ -0,0 +1,37 @@
+from types import SimpleNamespace
+
+from tests.helpers.parallel import order_by_duration
+
+
+def items(*nodeids: str) -> list:
+    return [SimpleNamespace(nodeid=nodeid) for nodeid in nodeids]
+
+
+def nodeids(ordered: list) -> list:
+    return [item.nodeid for item in ordered]
+
+
+def test_order_by_duration_longest_first():
+    collected = items("test_login", "test_checkout", "test_cart")
+
+    order_by_duration(
+        collected, {"test_login": 2.0, "test_checkout": 30.0, "test_cart": 10.0}
+    )
+
+    assert nodeids(collected) == ["test_checkout", "test_cart", "test_login"]
+
+
+def test_order_by_duration_puts_new_tests_first():
+    collected = items("test_login", "test_signup", "test_checkout")
+
+    order_by_duration(collected, {"test_login": 2.0, "test_checkout": 30.0})
+
+    assert nodeids(collected) == ["test_signup", "test_checkout", "test_login"]
+
+
+def test_order_by_duration_keeps_the_collection_order_without_durations():
+    collected = items("test_login", "test_signup", "test_checkout")
+
+    order_by_duration(collected, {})
+
+    assert nodeids(collected) == ["test_login", "test_signup", "test_checkout"]
@@ -0,0 +1,51 @@
+from tests.helpers import profiler
+from tests.helpers.profiler import CommandRecord, regression
+
+
+def record(command: str, waiting: bool = False, phase: str = "call") -> CommandRecord:
+    return CommandRecord(
+        command=command,
+        locator=None,
+        duration=0.01,
+        caller="test_checkout",
+        stack=("test_checkout",),
+        waiting=waiting,
+        phase=phase,
+    )
+
+
+def profile(*records: CommandRecord) -> profiler.TestProfile:
+    # Imported through the module, pytest would collect the class as a test otherwise
+    return profiler.TestProfile(nodeid="test_checkout", records=list(records))
+
+
+def test_regression_within_tolerance():
+    commands = profile(*[record("findElement") for _ in range(11)])
+
+    assert regression(commands, {"test_checkout": 10}, 0.1) is None
+
+
+def test_regression_above_tolerance():
+    commands = profile(*[record("findElement") for _ in range(12)])
+
+    message = regression(commands, {"test_checkout": 10}, 0.1)
+
+    assert message is not None
+    assert "sent 12 counted WebDriver commands" in message
+
+
+def test_regression_without_baseline():
+    assert regression(profile(record("findElement")), {}, 0.1) is None
+
+
+def test_regression_counts_only_the_commands_of_the_call():
+    commands = profile(
+        record("get", phase="setup"),
+        record("findElement"),
+        record("findElement", waiting=True),
+        record("getLog"),
+        record("deleteAllCookies", phase="teardown"),
+    )
+
+    assert regression(commands, {"test_checkout": 0}, 0) is not None
+    assert regression(commands, {"test_checkout": 1}, 0) is None
@@ -0,0 +1,75 @@
+from tests.helpers.regression import bootstrap_change, compare
+
+BASE = [1.0, 1.02, 0.98, 1.01, 0.99, 1.0, 1.03, 0.97]
+
+
+def test_bootstrap_change_brackets_the_change_of_the_median():
+    change, low, high = bootstrap_change(BASE, [sample * 1.5 for sample in BASE])
+
+    assert round(change, 6) == 0.5
+    assert low <= change <= high
+
+
+def test_bootstrap_change_is_deterministic():
+    head = [1.1, 1.3, 0.9, 1.2, 1.0]
+
+    assert bootstrap_change(BASE, head) == bootstrap_change(BASE, head)
+
+
+def test_compare_regressed_above_tolerance():
+    (delta,) = compare(
+        {("test_checkout", None): BASE},
+        {("test_checkout", None): [sample * 1.5 for sample in BASE]},
+        0.1,
+    )
+
+    assert delta.regressed
+    assert not delta.insufficient
+    assert delta.gated
+
+
+def test_compare_within_tolerance():
+    (delta,) = compare(
+        {("test_checkout", None): BASE},
+        {("test_checkout", None): [sample * 1.05 for sample in BASE]},
+        0.1,
+    )
+
+    assert not delta.regressed
+
+
+def test_compare_does_not_gate_insufficient_samples():
+    (delta,) = compare(
+        {("test_checkout", None): BASE[:2]},
+        {("test_checkout", None): [sample * 2 for sample in BASE]},
+        0.1,
+    )
+
+    assert delta.insufficient
+    assert not delta.regressed
+
+
+def test_compare_skips_series_missing_from_the_baseline():
+    assert compare({}, {("test_checkout", None): BASE}, 0.1) == []
+
+
+def test_compare_orders_regressions_first():
+    deltas = compare(
+        {
+            ("test_login", None): BASE,
+            ("test_checkout", None): BASE,
+            ("test_checkout", "confirm_order"): BASE[:2],
+        },
+        {
+            ("test_login", None): [sample * 1.05 for sample in BASE],
+            ("test_checkout", None): [sample * 1.5 for sample in BASE],
+            ("test_checkout", "confirm_order"): [sample * 3 for sample in BASE],
+        },
+        0.1,
+    )
+
+    assert [(delta.test, delta.step) for delta in deltas] == [
+        ("test_checkout", None),
+        ("test_login", None),
+        ("test_checkout", "confirm_order"),
+    ]